@@ -49,11 +49,76 @@ CLI_MAPPING = [
 
         - the number of fixed violations;
         - the number of violations that have to be changed manually.
+
+        With many configured files, use `--jobs` to check or fix several files at the same time in threads; the violations are still displayed in the same order.
+        The threads only overlap I/O (e.g. reading files on a network drive): parsing YAML, TOML and INI files is pure Python code, which doesn't run in parallel in threads, so `--jobs` doesn't speed up the check of local files.
+        """,
+    ),
+    (
+        "check",
+        "Don't modify, just print the differences",
+        """
+        With `--incremental`, the violations of each file are stored in the cache dir, with hashes of the merged style, the expected config of the file and the file contents.
+        On the next incremental check, the files whose hashes didn't change reuse their previous violations instead of being checked again.
+
+        With `--watch`, Nitpick keeps running and checks the project again after each change (using inotify on Linux, and polling the files on other systems).
+        The styles are merged again only when the configuration, the lock file or a local style changes, and only the files affected by the change are checked again. With both options, the first check reuses the violations of the previous incremental check, and the violations of each check are stored for the next one.
         """,
     ),
-    ("check", "Don't modify, just print the differences", ""),
     ("ls", "List configures files", ""),
+    (
+        "batch",
+        "Check many projects in a single run",
+        """
+        Use it to check many repositories (e.g. in a nightly job), instead of starting a Nitpick process for each one.
+        Each project has its own violations and return code; the return code of the command is the highest one.
+        With `--processes`, the projects are checked by a pool of processes, and the output keeps the order of the projects.
+
+        The cache of remote and parsed styles is shared by all projects: it's in the dir of the `--cache-dir` option or, by default, in the dir set by the `NITPICK_CACHE_DIR` environment variable or in the user cache dir. The environment of the projects is not changed, so other Nitpick runs keep their own cache. See [Shared cache](configuration.md#shared-cache).
+        """,
+    ),
     ("init", "Initialise a configuration file", ""),
+    (
+        "lock",
+        "Pin remote styles in a lock file",
+        """
+        Commit the `nitpick.lock` file, so all developers and CI runs use the same styles.
+        See [Lock file](configuration.md#lock-file).
+        """,
+    ),
+    ("cache", "Manage the cache of remote styles", "See [Cache](configuration.md#cache)."),
+    ("cache warm", "Download all styles into the cache", ""),
+    ("cache stats", "Show the usage of the cache", ""),
+    ("cache prune", "Evict cached styles by age or by size", ""),
+    (
+        "cache export",
+        "Export the cache to a tarball",
+        """
+        Use it with `cache import` to bake a warm cache into Docker images or CI caches.
+        Combine it with a [lock file](configuration.md#lock-file) or with `cache = "forever"`,
+        so the styles in the imported cache don't expire.
+        """,
+    ),
+    ("cache import", "Import the cache from a tarball", ""),
+    (
+        "daemon",
+        "Keep a warm process for the thin client",
+        """
+        Each `nitpick check` imports all modules, reads the plugins and merges the styles again.
+        A daemon keeps all of this in memory for a project root, so the `nitpick-client` command can check the project in a fraction of the time (e.g. in a pre-commit hook):
+
+        1. Start the daemon with `nitpick daemon start`; it stops by itself after some time without commands.
+        2. Run `nitpick-client` with the same arguments as `nitpick` (e.g. `nitpick-client check`). The `check`, `fix` and `ls` commands are sent over a Unix socket to the daemon, which streams back their output. The client can run in any subdir of the project.
+        3. When the daemon is not running (or was started by another version of Nitpick), and for other commands, `nitpick-client` runs the command in its own process, like `nitpick`.
+
+        The logs of the commands sent to the daemon are in the daemon log file (see `nitpick daemon status`); start the daemon with `-v` to see them.
+        The `NITPICK_*` environment variables of the client (e.g. `NITPICK_OFFLINE`) are sent to the daemon, and used while it runs the command. A client with another shared style cache (`NITPICK_CACHE_DIR` or `NITPICK_CACHE_MAX_SIZE`) than the daemon runs the command in its own process.
+        """,
+    ),
+    ("daemon start", "Start the daemon in the background", ""),
+    ("daemon run", "Run the daemon in the foreground", ""),
+    ("daemon stop", "Stop the daemon", ""),
+    ("daemon status", "Show the status of the daemon", ""),
 ]
 
 
@@ -216,7 +281,7 @@ def write_plugins() -> int:
 
     # Sort order: classes with fixed file names first, then alphabetically by class name
     for plugin_class in sorted(
-        nit.project.plugin_manager.hook.plugin_class(),  # pylint: disable=no-member
+        nit.project.plugin_registry.plugin_classes(),
         key=lambda c: "0" if c.filename else "1" + c.__name__,
     ):
         header = plugin_class.filename
@@ -250,13 +315,10 @@ def write_cli() -> int:
     blocks = []
 
     for command, short, long in CLI_MAPPING:
-        anchor = f"_{command}" if command else ""
+        anchor = f"_{command.replace(' ', '_')}" if command else ""
         header = f"`{command}`: {short}" if command else short
         blocks.append("")
-        parts = ["nitpick"]
-        if command:
-            parts.append(command)
-        parts.append("--help")
+        parts = ["nitpick", *command.split(), "--help"]
         print(" ".join(parts))
         output = check_output(parts).decode().strip()  # noqa: S603
         blocks.append(clean_template.format(anchor=anchor, header=header, long=dedent(long).strip(), help=output))
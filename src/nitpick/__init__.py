@@ -1,11 +1,21 @@
 """Main module."""
 
-from loguru import logger
+from __future__ import annotations
 
-from nitpick.constants import PROJECT_NAME
-from nitpick.core import Nitpick
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from nitpick.core import Nitpick
 
 __all__ = ("Nitpick",)
 __version__ = "0.38.1"
 
-logger.disable(PROJECT_NAME)
+
+def __getattr__(name: str):
+    """Import the API only when it's used, so the thin client of the daemon doesn't import it."""
+    if name == "Nitpick":
+        from nitpick.core import Nitpick  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+        return Nitpick
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
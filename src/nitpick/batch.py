@@ -0,0 +1,158 @@
+"""Check many projects in one process, or in a pool of processes.
+
+Each project has its own Nitpick instance, results and exit code.
+The plugins are loaded once per process, and the cache of remote and parsed styles is shared by all projects;
+the shared cache dir is passed explicitly to each project (and worker process).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from nitpick.core import Nitpick
+from nitpick.exceptions import QuitComplainingError
+from nitpick.plugins.registry import PluginRegistry
+from nitpick.violations import format_counts
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from nitpick.typedefs import PathOrStr
+    from nitpick.violations import Fuss
+
+#: Lines of a manifest file starting with this character are ignored.
+MANIFEST_COMMENT = "#"
+
+
+@dataclass
+class ProjectResult:
+    """Violations of one project."""
+
+    root: Path
+    violations: list[Fuss] = field(default_factory=list)
+    #: Unexpected error that stopped the check of the project.
+    error: str = ""
+    #: The check was stopped by its violations (e.g. the project root was not found).
+    stopped: bool = False
+
+    @property
+    def fixed(self) -> int:
+        """Number of fixed violations."""
+        return sum(1 for fuss in self.violations if fuss.fixed)
+
+    @property
+    def manual(self) -> int:
+        """Number of violations to fix manually."""
+        return sum(1 for fuss in self.violations if not fuss.fixed)
+
+    @property
+    def counts(self) -> str:
+        """String representation with the violation counts."""
+        return format_counts(self.fixed, self.manual)
+
+    @property
+    def exit_code(self) -> int:
+        """Exit code of the project, the same as ``nitpick check`` or ``nitpick fix``; 2 for an unexpected error."""
+        if self.error or self.stopped:
+            return 2
+        return 1 if self.violations else 0
+
+
+class BatchChecker:
+    """Check projects one after the other, with the same plugin registry.
+
+    :param partial_names: Names of the files to enforce configs for.
+    :param autofix: Flag to modify files, if the plugin supports it.
+    :param offline: Offline mode: no style will be downloaded.
+    :param cache_dir: Style cache dir shared by all projects; by default, each project uses its own cache
+        (or the shared cache configured with an environment variable).
+    """
+
+    def __init__(
+        self, partial_names: Iterable[str] = (), *, autofix=False, offline=False, cache_dir: Path | None = None
+    ) -> None:
+        self.partial_names = tuple(partial_names)
+        self.autofix = autofix
+        self.offline = offline
+        self.cache_dir = cache_dir
+        self.plugin_registry = PluginRegistry()
+
+    def check(self, root: PathOrStr) -> ProjectResult:
+        """Check a project; an unexpected error is reported on its result, so the other projects are still checked."""
+        nit = Nitpick.create(root, self.offline, self.plugin_registry, self.cache_dir)
+        try:
+            # Like "nitpick check", a project without a root dir stops with its violation
+            nit.project.root  # noqa: B018 # pylint: disable=pointless-statement
+            violations = list(nit.run(*self.partial_names, autofix=self.autofix))
+        except QuitComplainingError as err:
+            return ProjectResult(Path(root), list(err.violations), stopped=True)
+        except Exception as err:  # pylint: disable=broad-exception-caught # noqa: BLE001
+            logger.exception(f"{root}: Unexpected error")
+            return ProjectResult(Path(root), error=f"{err.__class__.__name__}: {err}")
+        return ProjectResult(Path(root), violations)
+
+
+@lru_cache
+def _process_checker(
+    partial_names: tuple[str, ...], autofix: bool, offline: bool, cache_dir: Path | None
+) -> BatchChecker:
+    """Checker of a worker process, created for its first project and reused for the next ones."""
+    return BatchChecker(partial_names, autofix=autofix, offline=offline, cache_dir=cache_dir)
+
+
+def _check_in_process(
+    root: Path, partial_names: tuple[str, ...], autofix: bool, offline: bool, cache_dir: Path | None
+) -> ProjectResult:
+    return _process_checker(partial_names, autofix, offline, cache_dir).check(root)
+
+
+def check_projects(  # pylint: disable=too-many-arguments # noqa: PLR0913
+    roots: Iterable[PathOrStr],
+    partial_names: Iterable[str] = (),
+    *,
+    autofix=False,
+    offline=False,
+    processes: int = 1,
+    cache_dir: Path | None = None,
+) -> Iterator[ProjectResult]:
+    """Check many projects, and yield their results in the same order.
+
+    :param roots: Root dirs of the projects.
+    :param partial_names: Names of the files to enforce configs for.
+    :param autofix: Flag to modify files, if the plugin supports it.
+    :param offline: Offline mode: no style will be downloaded.
+    :param processes: Number of worker processes; with 1, all projects are checked in the current process.
+    :param cache_dir: Style cache dir shared by all projects; None for the cache dir of each project.
+        The ``batch`` command uses the [user cache dir][nitpick.cache.user_cache_dir] by default.
+    """
+    project_roots = [Path(root).resolve() for root in roots]
+    names = tuple(partial_names)
+    logger.info(f"Checking {len(project_roots)} projects with {processes} processes, cache: {cache_dir}")
+    if processes == 1 or len(project_roots) == 1:
+        checker = BatchChecker(names, autofix=autofix, offline=offline, cache_dir=cache_dir)
+        for root in project_roots:
+            yield checker.check(root)
+        return
+
+    check = partial(_check_in_process, partial_names=names, autofix=autofix, offline=offline, cache_dir=cache_dir)
+    with ProcessPoolExecutor(max_workers=min(processes, len(project_roots))) as executor:
+        yield from executor.map(check, project_roots)
+
+
+def read_manifest(path: Path) -> list[Path]:
+    """Read the project roots of a manifest file, one per line; relative roots are relative to the manifest dir.
+
+    Blank lines and lines starting with ``#`` are ignored.
+    """
+    roots = []
+    for line in path.read_text(encoding="UTF-8").splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith(MANIFEST_COMMENT):
+            roots.append(path.parent / stripped)
+    return roots
@@ -11,23 +11,26 @@ import abc
 import json
 import re
 import shlex
-from functools import partial
+from collections.abc import Mapping
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
+from sys import intern
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 import dictdiffer
 import jmespath
 import toml
 import tomlkit
-from attr import define  # type: ignore[attr-defined]
+from attr import define, field  # type: ignore[attr-defined]
 from autorepr import autorepr
-from flatten_dict import flatten, unflatten
+from flatten_dict import flatten
 from ruamel.yaml import YAML, RoundTripRepresenter, StringIO
 from sortedcontainers import SortedDict
 from tomlkit import items
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from jmespath.parser import ParsedResult
 
@@ -52,6 +55,21 @@ SEPARATOR_FLATTEN = "$#@"
 #: Special unique separator for [quoted_split()][nitpick.blender.quoted_split].
 SEPARATOR_QUOTED_SPLIT = "#$@"
 
+#: Characters of a flat key that are handled by [shlex.split()][shlex.split]: quotes, escapes and blanks.
+REGEX_SHLEX_CHARS = re.compile(r"[\s\"'\\]")
+#: Flat key whose parts are plain or wrapped in double quotes, without other characters handled by shlex.
+REGEX_DOUBLE_QUOTED_FLAT_KEY = re.compile(r'(?:"[^"\s\'\\]*"|[^."\s\'\\]+)(?:\.(?:"[^"\s\'\\]*"|[^."\s\'\\]+))*')
+#: A part of a flat key: the contents of double quotes, or plain text up to the next dot.
+REGEX_FLAT_KEY_PART = re.compile(r'"([^"]*)"|([^."]+)')
+
+#: Unquoted identifier in a JMESPath expression.
+REGEX_JMES_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+#: Characters that change the value of a raw string literal in a JMESPath expression.
+REGEX_JMES_LITERAL_ESCAPES = re.compile(r"['\\]")
+
+#: Maximum number of compiled JMESPath expressions kept by [compile_jmespath()][nitpick.blender.compile_jmespath].
+JMESPATH_CACHE_SIZE = 512
+
 
 def compare_lists_with_dictdiffer(
     actual: list | dict, expected: list | dict, *, return_list: bool = True
@@ -71,6 +89,66 @@ def compare_lists_with_dictdiffer(
     return changed_dict
 
 
+def structural_hash(data: Any, memo: dict[int, tuple[Any, int]] | None = None) -> int:
+    """Hash of a JSON-like object; dicts with the same items have the same hash, regardless of the order of their keys.
+
+    Values are hashed with their JSON type, so ``1``, ``1.0``, ``True`` and ``"1"`` are told apart.
+    Like any hash, it can collide (e.g. ``hash(-1) == hash(-2)``):
+    equal hashes must be confirmed by comparing the data.
+    Dicts and lists are hashed once per memo: shared sub-objects (e.g. YAML anchors) are not hashed again.
+
+    >>> structural_hash({"a": [1, {"b": None}], "c": "d"}) == structural_hash({"c": "d", "a": [1, {"b": None}]})
+    True
+    >>> structural_hash([1, 2]) == structural_hash([2, 1]), structural_hash([1]) == structural_hash([True])
+    (False, False)
+    """
+    if isinstance(data, (Mapping, list, tuple)):
+        if memo is None:
+            memo = {}
+        cached = memo.get(id(data))
+        if cached is not None:
+            return cached[1]
+        if isinstance(data, Mapping):
+            # Like JSON, keys are strings
+            digest = hash(
+                (
+                    Mapping,
+                    frozenset(
+                        (key if isinstance(key, str) else json.dumps(key), structural_hash(value, memo))
+                        for key, value in data.items()
+                    ),
+                )
+            )
+        else:
+            digest = hash((list, tuple(structural_hash(value, memo) for value in data)))
+        # Keep a reference to the object, so its id is not reused while the memo exists
+        memo[id(data)] = (data, digest)
+        return digest
+
+    for json_type in (bool, int, float, str):
+        if isinstance(data, json_type):
+            return hash((json_type, data))
+    try:
+        return hash((type(data), data))
+    except TypeError:
+        return hash((type(data), repr(data)))
+
+
+@lru_cache(maxsize=JMESPATH_CACHE_SIZE)
+def compile_jmespath(expression: str) -> ParsedResult:
+    """Compile a JMESPath expression once; the least recently used expressions are discarded when the cache is full.
+
+    >>> compile_jmespath('files."pyproject.toml"') is compile_jmespath('files."pyproject.toml"')
+    True
+    """
+    return jmespath.compile(expression)
+
+
+def _compact_json(data: ElementData) -> str:
+    """Canonical JSON of a list element: compact, with sorted keys."""
+    return json.dumps(data, sort_keys=True, separators=(SEPARATOR_COMMA, SEPARATOR_COLON))
+
+
 def search_json(json_data: ElementData, jmespath_expression: ParsedResult | str, default: Any | None = None) -> Any:
     """Search a dictionary or list using a JMESPath expression.
 
@@ -95,7 +173,8 @@ def search_json(json_data: ElementData, jmespath_expression: ParsedResult | str,
 
     >>> search_json(data, None)
 
-    :param jmespath_expression: A compiled JMESPath expression or a string with an expression.
+    :param jmespath_expression: A compiled JMESPath expression or a string with an expression,
+        compiled by [compile_jmespath()][nitpick.blender.compile_jmespath].
     :param json_data: The dictionary to be searched.
     :param default: Default value in case nothing is found.
     :return: The object that was found or the default value.
@@ -103,12 +182,42 @@ def search_json(json_data: ElementData, jmespath_expression: ParsedResult | str,
     if not jmespath_expression:
         return default
     if isinstance(jmespath_expression, str):
-        rv = jmespath.search(jmespath_expression, json_data)
-    else:
-        rv = jmespath_expression.search(json_data)
+        jmespath_expression = compile_jmespath(jmespath_expression)
+    rv = jmespath_expression.search(json_data)
     return rv or default
 
 
+def filter_json(
+    json_data: ElementData, list_expression: str, child_expression: str, value: str, default: Any | None = None
+) -> Any:
+    """Search the elements of a list whose child is equal to a value, like the filter ``list[?child=='value']``.
+
+    The expressions are compiled once, no matter the value; a new filter expression is not compiled for each value.
+
+    >>> data = {"hooks": [{"id": "black"}, {"id": "isort", "args": ["-q"]}, "text", {"id": "it's"}]}
+    >>> filter_json(data, "hooks", "id", "isort")
+    [{'id': 'isort', 'args': ['-q']}]
+    >>> filter_json(data, "hooks", "id", "it's")
+    [{'id': "it's"}]
+    >>> filter_json(data, "hooks", "id", "missing", [{}])
+    [{}]
+    >>> filter_json(data, "missing", "id", "black", [])
+    []
+
+    :param json_data: The dictionary to be searched.
+    :param list_expression: JMESPath expression of the list.
+    :param child_expression: JMESPath expression of the child of each element.
+    :param value: Value of the child.
+    :param default: Default value in case nothing is found.
+    :return: The elements that were found or the default value.
+    """
+    elements = search_json(json_data, list_expression)
+    if not isinstance(elements, list):
+        return default
+    child = compile_jmespath(child_expression)
+    return [element for element in elements if child.search(element) == value] or default
+
+
 @define
 class ElementDetail:  # pylint: disable=too-few-public-methods
     """Detailed information about an element of a list."""
@@ -117,26 +226,76 @@ class ElementDetail:  # pylint: disable=too-few-public-methods
     key: str | list[str]
     index: int
     scalar: bool
-    compact: str
+    #: [Structural hash][nitpick.blender.structural_hash] of the data, to tell different elements apart quickly.
+    #: Hashes can collide: equal digests must be confirmed by comparing the data.
+    digest: int
+    #: Children of the element by the value of their child key, for each parent key.
+    _children: dict[tuple[str, str], dict[str, list[JsonDict]]] = field(factory=dict, init=False, repr=False, eq=False)
 
     @property
     def cast_to_dict(self) -> JsonDict:
         """Data cast to dict, for mypy."""
         return cast("JsonDict", self.data)
 
+    @property
+    def compact(self) -> str:
+        """Compact JSON string of the data, with sorted keys."""
+        if self.scalar:
+            return str(self.data)
+        return _compact_json(self.data)
+
+    def same_data(self, other: ElementDetail) -> bool:
+        """Check if the data is equal to the data of another element; the digests are compared first."""
+        return self.digest == other.digest and self.data == other.data
+
+    def find_children(self, parent_key: str, child_key: str, value: Any) -> list[JsonDict] | None:
+        """Children in the parent list whose child key has a value, the same as the ``parent[?child=='value']`` filter.
+
+        The children are indexed by the value of their child key, once per parent key.
+        Return None if the filter can't be replaced by the index; then a JMESPath expression should be used.
+        """
+        if (
+            not isinstance(value, str)
+            or not isinstance(self.data, dict)
+            or not REGEX_JMES_IDENTIFIER.fullmatch(parent_key)
+            or not REGEX_JMES_IDENTIFIER.fullmatch(child_key)
+            or REGEX_JMES_LITERAL_ESCAPES.search(value)
+        ):
+            return None
+
+        index = self._children.get((parent_key, child_key))
+        if index is None:
+            index = self._children[(parent_key, child_key)] = {}
+            children = self.data.get(parent_key)
+            for child in children if isinstance(children, list) else ():
+                # JMESPath only compares strings with strings
+                if isinstance(child, dict) and isinstance(child.get(child_key), str):
+                    index.setdefault(child[child_key], []).append(child)
+        return index.get(value, [])
+
+    def forget_children(self) -> None:
+        """Forget the indexed children, after they were changed."""
+        self._children.clear()
+
     @classmethod
-    def from_data(cls, index: int, data: ElementData, jmes_key: str) -> ElementDetail:
-        """Create an element detail from dict data."""
+    def from_data(
+        cls, index: int, data: ElementData, jmes_key: ParsedResult | str, memo: dict[int, tuple[Any, int]] | None = None
+    ) -> ElementDetail:
+        """Create an element detail from dict data.
+
+        :param memo: Memo of [structural hashes][nitpick.blender.structural_hash] shared by the elements.
+        """
+        digest = structural_hash(data, memo)
         if isinstance(data, (list, dict)):
             scalar = False
-            compact = json.dumps(data, sort_keys=True, separators=(SEPARATOR_COMMA, SEPARATOR_COLON))
             key = search_json(data, jmes_key)
             if not key:
-                key = compact
+                # Unlike a hash, the canonical JSON of the element can't collide with another element
+                key = _compact_json(data)
         else:
             scalar = True
-            key = compact = str(data)
-        return ElementDetail(data=data, key=key, index=index, scalar=scalar, compact=compact)
+            key = str(data)
+        return ElementDetail(data=data, key=key, index=index, scalar=scalar, digest=digest)
 
 
 @define
@@ -145,23 +304,71 @@ class ListDetail:  # pylint: disable=too-few-public-methods
 
     data: ListOrCommentedSeq
     elements: list[ElementDetail]
+    #: The first element with each hashable key.
+    _by_key: dict[Any, ElementDetail] | None = field(default=None, init=False, repr=False, eq=False)
+    #: Indexes of the elements whose key contains each value, and of the elements whose key can't be indexed.
+    _by_member: dict[Any, set[int]] | None = field(default=None, init=False, repr=False, eq=False)
+    _not_indexed: list[int] = field(factory=list, init=False, repr=False, eq=False)
 
     @classmethod
-    def from_data(cls, data: ListOrCommentedSeq, jmes_key: str) -> ListDetail:
+    def from_data(
+        cls, data: ListOrCommentedSeq, jmes_key: ParsedResult | str, memo: dict[int, tuple[Any, int]] | None = None
+    ) -> ListDetail:
         """Create a list detail from list data."""
+        if memo is None:
+            memo = {}
         return ListDetail(
-            data=data, elements=[ElementDetail.from_data(index, data, jmes_key) for index, data in enumerate(data)]
+            data=data,
+            elements=[ElementDetail.from_data(index, data, jmes_key, memo) for index, data in enumerate(data)],
         )
 
     def find_by_key(self, desired: ElementDetail) -> ElementDetail | None:
-        """Find an element by key."""
-        for actual in self.elements:
-            if isinstance(desired.key, list):
-                if set(desired.key).issubset(set(actual.key)):
-                    return actual
-            elif desired.key == actual.key:
-                return actual
-        return None
+        """Find the first element with the same key; if the desired key is a list, the first one that contains it.
+
+        The elements are indexed by key on the first call, so matching all elements of two lists is linear.
+        """
+        if isinstance(desired.key, list):
+            return self._find_by_members(desired.key)
+        try:
+            return self._key_index().get(desired.key)
+        except TypeError:
+            # An unhashable key (e.g. a dict) is not in the index
+            return next((actual for actual in self.elements if desired.key == actual.key), None)
+
+    def _key_index(self) -> dict[Any, ElementDetail]:
+        if self._by_key is None:
+            self._by_key = {}
+            for actual in self.elements:
+                # An unhashable key (a list or a dict) is never equal to a hashable one
+                with suppress(TypeError):
+                    self._by_key.setdefault(actual.key, actual)
+        return self._by_key
+
+    def _find_by_members(self, desired_keys: list[str]) -> ElementDetail | None:
+        members = set(desired_keys)
+        if self._by_member is None:
+            self._by_member = {}
+            for actual in self.elements:
+                try:
+                    actual_members = set(actual.key)
+                except TypeError:
+                    self._not_indexed.append(actual.index)
+                    continue
+                for member in actual_members:
+                    self._by_member.setdefault(member, set()).add(actual.index)
+
+        found: set[int] | None = None
+        for member in members:
+            found = self._by_member.get(member, set()) if found is None else found & self._by_member.get(member, set())
+        first = min(found) if found else None
+
+        # Elements with keys that can't be indexed are checked one by one, like before there was an index
+        for index in self._not_indexed:
+            if first is not None and index > first:
+                break
+            if members.issubset(set(self.elements[index].key)):
+                return self.elements[index]
+        return None if first is None else self.elements[first]
 
 
 def set_key_if_not_empty(dict_: JsonDict, key: str, value: Any) -> None:
@@ -278,30 +485,165 @@ def custom_splitter(separator: str) -> Callable:
 #     return tuple(grouped)
 
 
+def _strip_end_quotes(key: str) -> str:
+    """Remove the quotes of a flat key if they are only in the beginning and end."""
+    if DOUBLE_QUOTE not in key:
+        return key
+    key_with_stripped_ends = key.strip(DOUBLE_QUOTE)
+    if key_with_stripped_ends.count(DOUBLE_QUOTE):
+        # Key has quotes in the middle; keep all quotes
+        return key
+    return key_with_stripped_ends
+
+
 def flatten_quotes(dict_: JsonDict, separator=SEPARATOR_DOT) -> JsonDict:
-    """Flatten a dict keeping quotes in keys."""
-    dict_with_quoted_keys = flatten(dict_, reducer=quote_reducer(separator))
-    clean_dict = {}
-    for key, value in dict_with_quoted_keys.items():  # type: str, Any
-        key_with_stripped_ends = key.strip(DOUBLE_QUOTE)
-        if key_with_stripped_ends.count(DOUBLE_QUOTE):
-            # Key has quotes in the middle; keep all quotes
-            clean_dict[key] = value
+    """Flatten a dict keeping quotes in keys.
+
+    Nested dicts are visited with a stack instead of recursion; empty dicts have no flat keys.
+    Flat keys are interned: the same keys are looked up many times while comparing documents.
+
+    >>> flatten_quotes({"tool": {"black": {"line-length": 100}, "empty": {}}, "scripts.test": "jest", "a.b": {"c": 1}})
+    {'tool.black.line-length': 100, 'scripts.test': 'jest', '"a.b".c': 1}
+    """
+    clean_dict: JsonDict = {}
+    stack: list[tuple[str, Iterator[tuple[Any, Any]]]] = [("", iter(dict_.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            # The same as quote_if_dotted() and _strip_end_quotes(), inlined because they run for every key
+            if isinstance(key, str) and SEPARATOR_DOT in key and DOUBLE_QUOTE not in key:
+                flat_key = f"{prefix}{DOUBLE_QUOTE}{key}{DOUBLE_QUOTE}"
+            else:
+                flat_key = f"{prefix}{key}" if prefix else key
+            if value.__class__ is dict or isinstance(value, Mapping):
+                if value:
+                    stack.append((f"{flat_key}{separator}", iter(value.items())))
+                    break
+                continue
+            if DOUBLE_QUOTE in flat_key:
+                key_with_stripped_ends = flat_key.strip(DOUBLE_QUOTE)
+                if DOUBLE_QUOTE not in key_with_stripped_ends:
+                    flat_key = key_with_stripped_ends
+            clean_dict[intern(flat_key)] = value
         else:
-            # Key only has quotes in the beginning and end; remove quotes
-            clean_dict[key_with_stripped_ends] = value
+            stack.pop()
     return clean_dict
 
 
-unflatten_quotes = partial(unflatten, splitter=quotes_splitter)
+@lru_cache(maxsize=4096)
+def split_flat_key(flat_key: str) -> tuple[str, ...]:
+    """Split a flat key keeping quoted strings together, like [quotes_splitter()][nitpick.blender.quotes_splitter].
+
+    Keys without escapes, blanks, single quotes or empty parts are split without shlex.
+
+    >>> split_flat_key("tool.black.line-length")
+    ('tool', 'black', 'line-length')
+    >>> split_flat_key('jobs."build.linux".steps')
+    ('jobs', 'build.linux', 'steps')
+    """
+    if DOUBLE_QUOTE not in flat_key:
+        keys = tuple(flat_key.split(SEPARATOR_DOT))
+        if all(keys) and not REGEX_SHLEX_CHARS.search(flat_key):
+            return keys
+    elif REGEX_DOUBLE_QUOTED_FLAT_KEY.fullmatch(flat_key):
+        return tuple(quoted or plain for quoted, plain in REGEX_FLAT_KEY_PART.findall(flat_key))
+    return quotes_splitter(flat_key)
+
+
+def unflatten_quotes(dict_: JsonDict) -> JsonDict:
+    """Unflatten a dict created by [flatten_quotes()][nitpick.blender.flatten_quotes].
+
+    >>> unflatten_quotes({"tool.black.line-length": 100, "tool.black.skip-string-normalization": True, '"a.b".c': 1})
+    {'tool': {'black': {'line-length': 100, 'skip-string-normalization': True}}, 'a.b': {'c': 1}}
+    """
+    unflattened: JsonDict = {}
+    for flat_key, value in dict_.items():
+        *parents, last = split_flat_key(flat_key)
+        node = unflattened
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        if last in node:
+            msg = f"duplicated key '{last}'"
+            raise ValueError(msg)
+        node[last] = value
+    return unflattened
+
+
+def clean_flat_key(path: tuple[Any, ...], separator=SEPARATOR_DOT) -> str:
+    """Flat key of a path of nested keys, like the keys of [flatten_quotes()][nitpick.blender.flatten_quotes].
+
+    >>> clean_flat_key(("tool", "black", "line-length"))
+    'tool.black.line-length'
+    >>> clean_flat_key(("scripts.test",))
+    'scripts.test'
+    >>> clean_flat_key(("jobs", "build.linux", "steps"))
+    'jobs."build.linux".steps'
+    """
+    reducer = quote_reducer(separator)
+    key = reducer(None, path[0])
+    for child in path[1:]:
+        key = reducer(key, child)
+    return _strip_end_quotes(key)
+
+
+def _find_leaves(node: Any, path: tuple[Any, ...], separator: str) -> Iterator[tuple[tuple[Any, ...], Any]]:
+    """Find the values at a path of keys; consecutive keys might also be a single flat key in the data.
+
+    E.g.: the object of a [JsonDoc][nitpick.blender.JsonDoc] is already flat.
+    """
+    if not path:
+        yield (), node
+        return
+    if not isinstance(node, Mapping):
+        return
+    for size in range(len(path), 0, -1):
+        key = path[0] if size == 1 else clean_flat_key(path[:size], separator)
+        if key in node:
+            for rest, value in _find_leaves(node[key], path[size:], separator):
+                yield (key, *rest), value
+
+
+def project_quotes(dict_: JsonDict, expected: JsonDict, separator=SEPARATOR_DOT) -> JsonDict:
+    """Flatten only the values of a dict that are at the flat keys of the expected dict.
+
+    The result is the same as ``flatten_quotes(dict_)`` restricted to the keys of ``flatten_quotes(expected)``,
+    but only the expected paths are visited: the cost depends on the size of the expected dict, not on ``dict_``.
+
+    >>> actual = {"tool": {"black": {"line-length": 100}, "isort": {"profile": "black"}}}
+    >>> project_quotes(actual, {"tool": {"black": {"line-length": 120, "target-version": ["py39"]}}})
+    {'tool.black.line-length': 100}
+    >>> project_quotes({"scripts.test": "jest", 'scripts."test.ci"': "jest --ci"}, {"scripts": {"test.ci": "mocha"}})
+    {'scripts."test.ci"': 'jest --ci'}
+    """
+    projection = {}
+    for path in flatten(expected):
+        flat_key = clean_flat_key(path, separator)
+        for actual_path, value in _find_leaves(dict_, path, separator):
+            # Dicts are not leaves: a non-empty dict has other flat keys, and an empty dict has none
+            if not isinstance(value, Mapping) and clean_flat_key(actual_path, separator) == flat_key:
+                projection[flat_key] = value
+                break
+    return projection
 
 
 class Comparison:
-    """A comparison between two dictionaries, computing missing items and differences."""
+    """A comparison between two dictionaries, computing missing items and differences.
 
-    def __init__(self, actual: BaseDocT, expected: JsonDict, special_config: SpecialConfig) -> None:
-        self.flat_actual = flatten_quotes(actual.as_object)
-        self.flat_expected = flatten_quotes(expected)
+    Only the paths of the expected dict are visited in the actual document.
+
+    :param flat_expected: The expected dict, already flattened (e.g. the flat expected config of a plugin).
+    """
+
+    def __init__(
+        self,
+        actual: BaseDocT,
+        expected: JsonDict,
+        special_config: SpecialConfig,
+        *,
+        flat_expected: JsonDict | None = None,
+    ) -> None:
+        self.flat_actual = project_quotes(actual.as_object, expected)
+        self.flat_expected = flatten_quotes(expected) if flat_expected is None else flat_expected
 
         self.doc_class = actual.__class__
 
@@ -310,6 +652,8 @@ class Comparison:
         self.replace_dict: JsonDict = {}
 
         self.special_config = special_config
+        #: Memo of structural hashes of the list elements, shared by all lists of both documents.
+        self._hashes: dict[int, tuple[Any, int]] = {}
 
     @property
     def missing(self) -> BaseDocT | None:
@@ -350,21 +694,13 @@ class Comparison:
 
             actual = self.flat_actual[key]
             if isinstance(expected_value, list):
-                list_keys = self.special_config.list_keys.value.get(key, "")
-                if SEPARATOR_DOT in list_keys:
-                    parent_key, child_key = list_keys.rsplit(SEPARATOR_DOT, 1)
-                    jmes_key = f"{parent_key}[].{child_key}"
-                else:
-                    parent_key = ""
-                    child_key = list_keys
-                    jmes_key = child_key
-
+                list_key = self.special_config.list_key(key)
                 self._compare_list_elements(
                     key=key,
-                    parent_key=parent_key,
-                    child_key=child_key,
-                    actual_detail=ListDetail.from_data(actual, jmes_key),
-                    expected_detail=ListDetail.from_data(expected_value, jmes_key),
+                    parent_key=list_key.parent_key,
+                    child_key=list_key.child_key,
+                    actual_detail=ListDetail.from_data(actual, list_key.expression, self._hashes),
+                    expected_detail=ListDetail.from_data(expected_value, list_key.expression, self._hashes),
                 )
             elif expected_value != actual:
                 set_key_if_not_empty(self.diff_dict, key, expected_value)
@@ -383,6 +719,9 @@ class Comparison:
                 display.append(expected_element.data)
                 replace.append(expected_element.data)
                 continue
+            if actual_element.same_data(expected_element):
+                # Same data, nothing to compare
+                continue
 
             if parent_key:
                 new_block: JsonDict = self._compare_children(parent_key, child_key, actual_element, expected_element)
@@ -414,9 +753,14 @@ class Comparison:
         not with all the hooks of the parent repo.
         """
         new_nested_block: JsonDict = {}
-        jmes_nested = f"{parent_key}[?{child_key}=='{expected_element.key[0]}']"
-        actual_nested = search_json(actual_element.data, jmes_nested, [])
-        expected_nested = search_json(expected_element.data, jmes_nested, [{}])
+        key = expected_element.key[0]
+        actual_nested = actual_element.find_children(parent_key, child_key, key)
+        expected_nested = expected_element.find_children(parent_key, child_key, key)
+        if actual_nested is None or expected_nested is None:
+            actual_nested = filter_json(actual_element.data, parent_key, child_key, str(key), [])
+            expected_nested = filter_json(expected_element.data, parent_key, child_key, str(key), [{}])
+        elif not expected_nested:
+            expected_nested = [{}]
         diff_nested = compare_lists_with_dictdiffer(actual_nested, expected_nested, return_list=True)
         if diff_nested:
             actual_data = cast("JsonDict", actual_element.data)
@@ -428,6 +772,8 @@ class Comparison:
             for nested_index, obj in enumerate(actual_data[parent_key]):
                 if obj == actual_nested[0]:
                     new_nested_block[parent_key][nested_index] = diff_nested[0]
+                    # The list of children is shared with the actual data, and its index is outdated
+                    actual_element.forget_children()
                     break
         return new_nested_block
 
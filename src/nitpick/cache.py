@@ -0,0 +1,707 @@
+"""Caches used to avoid downloading, parsing and validating styles on every run."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tarfile
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from nitpick.constants import (
+    PROJECT_NAME,
+    REGEX_CACHE_UNIT,
+    SHARED_CACHE_MAX_SIZE_DEFAULT,
+    CacheBackendEnum,
+    CacheEnvVarEnum,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from requests_cache import BaseCache
+
+    from nitpick.typedefs import JsonDict
+
+PARSED_STYLES_DIR_NAME = "parsed"
+STYLES_CACHE_NAME = "styles"
+STYLES_FILES_DIR_NAME = "styles-files"
+CACHE_INDEX_NAME = "styles-index.sqlite"
+GITHUB_DEFAULT_BRANCHES_NAME = "github-default-branches.json"
+CONTENT_STORE_DIR_NAME = "cas"
+MERGED_STYLE_FINGERPRINT_PREFIX = "# nitpick-fingerprint: "
+RESULTS_STATE_NAME = "results.json"
+SQLITE_SUFFIX = ".sqlite"
+SQLITE_JOURNAL_SUFFIXES = ("-journal", "-wal", "-shm")
+#: How long a process waits for another one writing to the same SQLite database.
+SQLITE_BUSY_TIMEOUT = timedelta(seconds=30)
+
+#: Bump this when the format of the cached files changes, to invalidate old entries.
+PARSED_STYLES_FORMAT = 1
+
+#: Bump this when the format of the merged style fingerprint changes.
+MERGED_STYLE_FORMAT = 1
+
+#: Bump this when the format of the results of incremental checks changes.
+RESULTS_FORMAT = 1
+
+REGEX_SIZE = re.compile(r"^\s*(?P<number>\d+)\s*(?P<unit>[KMG]?)B?\s*$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def hash_text(*parts: str) -> str:
+    """Return a SHA-256 hex digest of the parts, separated by a null char.
+
+    >>> hash_text("a", "b") == hash_text("a", "b")
+    True
+    >>> hash_text("ab") == hash_text("a", "b")
+    False
+    """
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def hash_contents(contents: str) -> str:
+    """Return the SHA-256 hex digest of the UTF-8 contents of a file.
+
+    >>> hash_contents("")
+    'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+    """
+    return hashlib.sha256(contents.encode()).hexdigest()
+
+
+def hash_json(data: JsonDict) -> str:
+    """Return a SHA-256 hex digest of a JSON dict, regardless of the order of its keys.
+
+    >>> hash_json({"a": 1, "b": [2]}) == hash_json({"b": [2], "a": 1})
+    True
+    """
+    return hash_contents(json.dumps(data, sort_keys=True, default=str))
+
+
+def hash_bytes(contents: bytes | None) -> str:
+    """Return the SHA-256 hex digest of the bytes of a file, or an empty string if it couldn't be read.
+
+    >>> hash_bytes(None)
+    ''
+    """
+    if contents is None:
+        return ""
+    return hashlib.sha256(contents).hexdigest()
+
+
+def write_atomically(path: Path, contents: str) -> None:
+    """Write a text file atomically, so readers on other processes never see a partially written file.
+
+    The contents are written to a temporary file in the same directory, and then it's renamed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="UTF-8") as temp_file:
+            temp_file.write(contents)
+        Path(temp_name).replace(path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def stat_validator(path: Path) -> str | None:
+    """Modification time and size of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def existing_paths(paths: Iterable[str], exists: Callable[[str], bool]) -> list[str]:
+    """Return the sorted paths that exist.
+
+    :param exists: Check if a path exists; e.g. relative to the project root,
+        the same way [FileInfo][nitpick.plugins.info.FileInfo] checks it.
+    """
+    return sorted(path for path in paths if exists(path))
+
+
+def parse_size(size: str) -> int | None:
+    """Parse a size in bytes, with an optional unit (multiples of 1024); return None if it's invalid.
+
+    >>> parse_size("500")
+    500
+    >>> parse_size("2 KB")
+    2048
+    >>> parse_size("100mb")
+    104857600
+    >>> parse_size("1G")
+    1073741824
+    >>> parse_size("a lot") is None
+    True
+    """
+    match = REGEX_SIZE.match(size)
+    if not match:
+        return None
+    return int(match.group("number")) * SIZE_UNITS[match.group("unit").upper()]
+
+
+def parse_duration(duration: str) -> timedelta | None:
+    """Parse a duration with a time unit, the same way as the ``cache`` key; return None if it's invalid.
+
+    >>> parse_duration("15 minutes")
+    datetime.timedelta(seconds=900)
+    >>> parse_duration("1 week")
+    datetime.timedelta(days=7)
+    >>> parse_duration("forever") is None
+    True
+    """
+    match = REGEX_CACHE_UNIT.fullmatch(duration.strip().rstrip("sS"))
+    if not match:
+        return None
+    return timedelta(**{f"{match.group('unit').lower()}s": int(match.group("number"))})
+
+
+def format_size(size: int) -> str:
+    """Format a size in bytes with a unit (multiples of 1024).
+
+    >>> format_size(500)
+    '500 B'
+    >>> format_size(2048)
+    '2.0 KB'
+    >>> format_size(5 * 1024**3)
+    '5.0 GB'
+    """
+    if size < SIZE_UNITS["K"]:
+        return f"{size} B"
+    for unit in ("K", "M"):
+        if size < SIZE_UNITS[unit] * 1024:
+            return f"{size / SIZE_UNITS[unit]:.1f} {unit}B"
+    return f"{size / SIZE_UNITS['G']:.1f} GB"
+
+
+def format_age(seconds: float) -> str:
+    """Format an age in seconds with the largest time unit.
+
+    >>> format_age(1)
+    '1 second'
+    >>> format_age(7300)
+    '2 hours'
+    >>> format_age(86400 * 3 + 100)
+    '3 days'
+    """
+    unit, count = "second", int(seconds)
+    for unit_name, unit_seconds in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= unit_seconds:
+            unit, count = unit_name, int(seconds // unit_seconds)
+            break
+    return f"{count} {unit}{'' if count == 1 else 's'}"
+
+
+def shared_cache_dir() -> Path | None:
+    """Directory of the remote style cache shared by all projects, if configured with an environment variable."""
+    configured = CacheEnvVarEnum.CACHE_DIR.get_environ()
+    return Path(configured).expanduser() if configured else None
+
+
+def styles_cache_dir(project_cache_dir: Path, shared_dir: Path | None = None) -> Path:
+    """Directory of the remote style cache: the shared cache dir, if configured, or the cache dir of the project.
+
+    :param shared_dir: Shared cache dir chosen by the caller (e.g. the batch runner);
+        by default, the one configured with an environment variable.
+    """
+    shared_dir = shared_dir or shared_cache_dir()
+    if not shared_dir:
+        return project_cache_dir
+    shared_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Using the shared style cache: {shared_dir}")
+    return shared_dir
+
+
+def user_cache_dir() -> Path:
+    """Directory for data cached for all projects of the current user.
+
+    The shared cache dir, if configured; otherwise, the XDG cache dir (``~/.cache/nitpick`` by default).
+    """
+    shared_dir = shared_cache_dir()
+    if shared_dir:
+        return shared_dir
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache") / PROJECT_NAME
+
+
+def shared_cache_max_size() -> int:
+    """Maximum size of the shared remote style cache, configured with an environment variable."""
+    configured = CacheEnvVarEnum.CACHE_MAX_SIZE.get_environ()
+    if not configured:
+        return SHARED_CACHE_MAX_SIZE_DEFAULT
+    max_size = parse_size(configured)
+    if max_size is None:
+        logger.warning(
+            f"Invalid {CacheEnvVarEnum.CACHE_MAX_SIZE.as_envvar()}: {configured}."
+            f" Defaulting to {SHARED_CACHE_MAX_SIZE_DEFAULT} bytes"
+        )
+        return SHARED_CACHE_MAX_SIZE_DEFAULT
+    return max_size
+
+
+def create_cache_backend(backend: CacheBackendEnum, cache_dir: Path) -> BaseCache:
+    """Create the storage of the remote style cache.
+
+    SQLite uses write-ahead logging and a busy timeout: many processes (e.g. ``flake8 -j`` or parallel pre-commit
+    hooks) can read while another one writes, and writers wait for each other instead of failing.
+    The filesystem backend stores each response in a separate file, so processes never wait for each other.
+    The memory backend is not persisted; styles are downloaded again on each run.
+    """
+    # Imported here, so commands that don't fetch styles don't import requests_cache
+    # pylint: disable=import-outside-toplevel
+    from requests_cache import BaseCache, FileCache, SQLiteCache  # noqa: PLC0415
+
+    if backend is CacheBackendEnum.FILESYSTEM:
+        return FileCache(cache_dir / STYLES_FILES_DIR_NAME)
+    if backend is CacheBackendEnum.MEMORY:
+        return BaseCache()
+    return SQLiteCache(
+        cache_dir / STYLES_CACHE_NAME, wal=True, busy_timeout=int(SQLITE_BUSY_TIMEOUT.total_seconds() * 1000)
+    )
+
+
+def prune_files(directory: Path, older_than: timedelta) -> int:
+    """Remove the files in a cache directory modified before a time; return the number of removed files."""
+    oldest = time.time() - older_than.total_seconds()
+    removed = 0
+    for path in directory.rglob("*"):
+        with suppress(OSError):
+            if path.is_file() and path.stat().st_mtime < oldest:
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def _is_temporary(relative_path: Path) -> bool:
+    """Files being written (and partial Git clones) start with a dot; SQLite journals are copied with the backup."""
+    return any(part.startswith(".") for part in relative_path.parts) or relative_path.name.endswith(
+        SQLITE_JOURNAL_SUFFIXES
+    )
+
+
+def export_cache(cache_dir: Path, tarball: Path) -> int:
+    """Export the cache dir to a gzipped tarball; return the number of exported files.
+
+    SQLite databases are copied with the backup API, so the copy is consistent even while other processes use them.
+    """
+    exported = 0
+    with tempfile.TemporaryDirectory() as temp_dir, tarfile.open(tarball, "w:gz") as tar:
+        for path in sorted(cache_dir.rglob("*")):
+            relative_path = path.relative_to(cache_dir)
+            if not path.is_file() or _is_temporary(relative_path) or path.resolve() == tarball.resolve():
+                continue
+            if path.suffix == SQLITE_SUFFIX:
+                backup = Path(temp_dir) / path.name
+                source, target = sqlite3.connect(path), sqlite3.connect(backup)
+                try:
+                    source.backup(target)
+                finally:
+                    source.close()
+                    target.close()
+                tar.add(backup, arcname=relative_path.as_posix())
+            else:
+                tar.add(path, arcname=relative_path.as_posix())
+            exported += 1
+    return exported
+
+
+def import_cache(tarball: Path, cache_dir: Path) -> int:
+    """Import a tarball created by ``export_cache()`` into the cache dir; return the number of imported files.
+
+    :raises ValueError: If the tarball has links, absolute paths or paths outside the cache dir.
+    """
+    with tarfile.open(tarball) as tar:
+        members = tar.getmembers()
+        for member in members:
+            path = Path(member.name)
+            if not (member.isfile() or member.isdir()) or path.is_absolute() or ".." in path.parts:
+                msg = f"Unexpected member in the cache tarball: {member.name}"
+                raise ValueError(msg)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for member in members:
+            if member.name.endswith(SQLITE_SUFFIX):
+                # Journals of the replaced databases would corrupt the imported ones
+                for suffix in SQLITE_JOURNAL_SUFFIXES:
+                    (cache_dir / f"{member.name}{suffix}").unlink(missing_ok=True)
+        # The members were checked above; the "data" filter is not available on all supported Python versions
+        extract_filter = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        tar.extractall(cache_dir, members=members, **extract_filter)  # noqa: S202
+    return sum(1 for member in members if member.isfile())
+
+
+@dataclass(frozen=True)
+class CachedResponseStats:
+    """Usage of a cached response, as shown by ``nitpick cache stats``."""
+
+    url: str
+    hits: int
+    misses: int
+    size: int
+    #: When the response was downloaded (seconds since the epoch).
+    created: float
+    last_access: float
+
+
+@dataclass()
+class StyleCacheIndex:
+    """Index of the responses in a remote style cache, possibly shared by many processes.
+
+    The index is a separate SQLite database with the URL, the size, the hit and miss counts,
+    the download time and the last access time of each cached response.
+    Writes happen in ``BEGIN IMMEDIATE`` transactions, so only one process at a time updates the index
+    or evicts responses.
+
+    :param path: Path of the SQLite database.
+    :param max_size: Maximum sum of the sizes of the cached responses, in bytes; the least recently used responses
+        are evicted when a new one is stored. None means no limit.
+    """
+
+    path: Path
+    max_size: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # A new connection on every call, because styles are fetched on many threads
+        connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT.total_seconds(), isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT NOT NULL,"
+            " last_access REAL NOT NULL, created REAL NOT NULL, size INTEGER NOT NULL,"
+            " hits INTEGER NOT NULL, misses INTEGER NOT NULL)"
+        )
+        return connection
+
+    def touch(self, key: str, url: str, size: int, cache: BaseCache | None = None) -> None:
+        """Record an access to a cached response.
+
+        Pass the cache when the response was just downloaded (a miss): then old responses are evicted if needed.
+        """
+        try:
+            connection = self._connect()
+        except sqlite3.Error as err:
+            logger.warning(f"Style cache index not updated: {err}")
+            return
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = connection.execute("SELECT created, hits, misses FROM responses WHERE key = ?", (key,)).fetchone()
+            created, hits, misses = row or (now, 0, 0)
+            if cache is None:
+                hits += 1
+            else:
+                created, misses = now, misses + 1
+            # REPLACE also gives the row a new rowid, which breaks ties on the access time
+            connection.execute(
+                "REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)", (key, url, now, created, size, hits, misses)
+            )
+            if cache is not None and self.max_size is not None:
+                self._evict(connection, cache, self.max_size)
+            connection.execute("COMMIT")
+        except sqlite3.Error as err:
+            logger.warning(f"Style cache index not updated: {err}")
+        finally:
+            connection.close()
+
+    def stats(self) -> list[CachedResponseStats]:
+        """Usage of the cached responses, the most recently used first."""
+        if not self.path.exists():
+            return []
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT url, hits, misses, size, created, last_access FROM responses ORDER BY last_access DESC"
+            ).fetchall()
+        finally:
+            connection.close()
+        return [CachedResponseStats(*row) for row in rows]
+
+    def prune(self, cache: BaseCache, *, older_than: timedelta | None = None, max_size: int | None = None) -> int:
+        """Evict responses downloaded before a time, and then the least recently used ones above a size.
+
+        Return the number of evicted responses.
+        """
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            evicted = 0
+            if older_than is not None:
+                keys = [
+                    key
+                    for (key,) in connection.execute(
+                        "SELECT key FROM responses WHERE created < ?", (time.time() - older_than.total_seconds(),)
+                    )
+                ]
+                self._delete(connection, cache, keys)
+                evicted += len(keys)
+            if max_size is not None:
+                evicted += self._evict(connection, cache, max_size)
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        return evicted
+
+    def _evict(self, connection: sqlite3.Connection, cache: BaseCache, max_size: int) -> int:
+        (total_size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total_size <= max_size:
+            return 0
+
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY last_access, rowid"):
+            if total_size <= max_size:
+                break
+            evicted.append(key)
+            total_size -= size
+        logger.info(f"Evicting {len(evicted)} least recently used styles from the cache")
+        self._delete(connection, cache, evicted)
+        return len(evicted)
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, cache: BaseCache, keys: list[str]) -> None:
+        cache.delete(*keys)
+        connection.executemany("DELETE FROM responses WHERE key = ?", ((key,) for key in keys))
+
+
+@dataclass()
+class ContentStore:
+    """Content-addressed store of styles: each file is stored under the SHA-256 hash of its contents.
+
+    :param store_dir: Directory of the store.
+    """
+
+    store_dir: Path
+
+    def _path(self, digest: str) -> Path:
+        return self.store_dir / digest[:2] / digest
+
+    def get(self, digest: str) -> str | None:
+        """Return the contents with this hash, or None if they are not stored (or the stored file is corrupted)."""
+        try:
+            contents = self._path(digest).read_text(encoding="UTF-8")
+        except (OSError, ValueError):
+            return None
+        return contents if hash_contents(contents) == digest else None
+
+    def put(self, contents: str) -> str:
+        """Store the contents and return their hash."""
+        digest = hash_contents(contents)
+        path = self._path(digest)
+        if not path.exists():
+            try:
+                write_atomically(path, contents)
+            except OSError as err:
+                logger.warning(f"Style {digest} not stored: {err}")
+        return digest
+
+
+@dataclass()
+class GitHubDefaultBranchCache:
+    """Default branches of GitHub repositories, stored in a JSON file shared by all processes and projects.
+
+    The file is rewritten atomically with the entries read just before, so a concurrent update might be lost;
+    it will only cause another API request.
+
+    :param path: Path of the JSON file.
+    :param ttl: How long a default branch is valid after it was returned by the GitHub API.
+    """
+
+    path: Path
+    ttl: timedelta
+
+    def _read(self) -> dict[str, dict]:
+        try:
+            entries = json.loads(self.path.read_text(encoding="UTF-8"))
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, api_url: str) -> str | None:
+        """Return the default branch of a repository, or None if it's unknown or expired."""
+        entry = self._read().get(api_url)
+        if not isinstance(entry, dict):
+            return None
+        try:
+            expired = time.time() - float(entry["checked_at"]) > self.ttl.total_seconds()
+        except (KeyError, TypeError, ValueError):
+            return None
+        if expired:
+            return None
+        return entry.get("branch") or None
+
+    def put(self, api_url: str, branch: str) -> None:
+        """Store the default branch of a repository."""
+        entries = self._read()
+        entries[api_url] = {"branch": branch, "checked_at": time.time()}
+        try:
+            write_atomically(self.path, json.dumps(entries, indent=2))
+        except OSError as err:
+            logger.warning(f"GitHub default branch not cached: {err}")
+
+
+@dataclass()
+class ParsedStyle:
+    """A style that was already parsed, validated and flattened."""
+
+    #: The style as a flat dict, ready to be merged.
+    flat: JsonDict
+    #: Normalized URLs of the styles included by this style.
+    includes: list[str] = field(default_factory=list)
+    #: Validation errors, already formatted.
+    errors: str = ""
+    #: Messages of the deprecation warnings emitted during validation.
+    deprecations: list[str] = field(default_factory=list)
+    #: File names configured on the style.
+    files: list[str] = field(default_factory=list)
+    #: Files that existed when the style was validated.
+    #: Identify tags are better for existing files, so the validation might change if a file is created or removed.
+    existing: list[str] = field(default_factory=list)
+
+
+@dataclass()
+class ParsedStyleCache:
+    """On-disk cache of parsed and validated styles, keyed by the hash of their contents.
+
+    :param cache_dir: Directory where each style is stored in a JSON file.
+    :param salt: Anything else that changes the result of the validation (e.g. nitpick version, loaded plugins).
+    """
+
+    cache_dir: Path
+    salt: str
+
+    def key(self, style_url: str, contents: str) -> str:
+        """Key for a style; the URL is needed because relative includes are resolved against it."""
+        return hash_text(str(PARSED_STYLES_FORMAT), self.salt, style_url, contents)
+
+    def get(self, key: str, exists: Callable[[str], bool]) -> ParsedStyle | None:
+        """Return a parsed style, or None if it's not cached or if the files it validated have changed.
+
+        :param exists: Check if a file exists in the project being checked.
+        """
+        path = self.cache_dir / f"{key}.json"
+        try:
+            parsed = ParsedStyle(**json.loads(path.read_text(encoding="UTF-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if parsed.existing != existing_paths(parsed.files, exists):
+            logger.debug(f"Parsed style {key}: files were created or removed since it was cached")
+            return None
+        return parsed
+
+    def put(self, key: str, parsed: ParsedStyle) -> None:
+        """Store a parsed style; styles that can't be serialized to JSON (e.g. with TOML dates) are not cached."""
+        try:
+            contents = json.dumps(asdict(parsed))
+        except (TypeError, ValueError) as err:
+            logger.debug(f"Parsed style {key} not cached: {err}")
+            return
+        try:
+            write_atomically(self.cache_dir / f"{key}.json", contents)
+        except OSError as err:
+            logger.warning(f"Parsed style {key} not cached: {err}")
+
+
+@dataclass()
+class MergedStyleSnapshot:
+    """Fingerprint of the merged style, stored as a comment on the first line of the merged style file.
+
+    The merged style can be reused only while the fingerprint still matches.
+    """
+
+    #: Hash of everything that changes the merged style and that can be known before fetching any style.
+    key: str
+    #: Validator of each included style (e.g. file modification time, HTTP ETag), by normalized URL.
+    sources: dict[str, str] = field(default_factory=dict)
+    #: File names configured on the styles.
+    files: list[str] = field(default_factory=list)
+    #: Files that existed when the styles were validated.
+    existing: list[str] = field(default_factory=list)
+    #: Messages of the deprecation warnings emitted while the styles were validated.
+    deprecations: list[str] = field(default_factory=list)
+    #: Flat keys of the merged style in their original order; TOML tables are not written in the same order.
+    order: list[str] = field(default_factory=list)
+
+    @classmethod
+    def read(cls, path: Path) -> tuple[MergedStyleSnapshot, str] | None:
+        """Read the fingerprint and the TOML contents of a merged style file, or None if there is no fingerprint."""
+        try:
+            first_line, _, toml_string = path.read_text(encoding="UTF-8").partition("\n")
+            if not first_line.startswith(MERGED_STYLE_FINGERPRINT_PREFIX):
+                return None
+            snapshot = cls(**json.loads(first_line[len(MERGED_STYLE_FINGERPRINT_PREFIX) :]))
+        except (OSError, ValueError, TypeError):
+            return None
+        return snapshot, toml_string
+
+    def write(self, path: Path, toml_string: str) -> None:
+        """Write the fingerprint and the TOML contents of a merged style file."""
+        write_atomically(path, f"{MERGED_STYLE_FINGERPRINT_PREFIX}{json.dumps(asdict(self))}\n{toml_string}")
+
+
+@dataclass()
+class FileResult:
+    """Violations of a configured file, with the hashes of everything that produced them."""
+
+    #: Hash of the expected config of the file, taken from the merged style.
+    expected: str
+    #: Hash of the contents of the file; empty if the file doesn't exist.
+    content: str
+    #: Hash of the fingerprints of the plugins that enforce the file.
+    plugins: str
+    #: Violations of the file, as Fuss dicts.
+    violations: list[JsonDict] = field(default_factory=list)
+
+    def same_hashes(self, other: FileResult) -> bool:
+        """Return True if the file, its expected config and its plugins didn't change."""
+        return (self.expected, self.content, self.plugins) == (other.expected, other.content, other.plugins)
+
+
+@dataclass()
+class ResultsState:
+    """Results of the previous incremental check (``nitpick check --incremental``), by file name in the style.
+
+    :param key: Hash of the merged style, the Nitpick version and the loaded plugins;
+        when it changes, all files are enforced again.
+    """
+
+    key: str
+    files: dict[str, FileResult] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, path: Path, key: str) -> ResultsState:
+        """Read the results of the previous run; an empty state if there are none, or if they don't match the key."""
+        try:
+            data = json.loads(path.read_text(encoding="UTF-8"))
+            if data["format"] == RESULTS_FORMAT and data["key"] == key:
+                files = {name: FileResult(**result) for name, result in data["files"].items()}
+                return cls(key, files)
+        except (OSError, ValueError, TypeError, KeyError) as err:
+            logger.debug(f"Previous results not used: {err!r}")
+        return cls(key)
+
+    def write(self, path: Path) -> None:
+        """Write the results atomically; other processes might be checking the same project."""
+        files = {name: asdict(result) for name, result in self.files.items()}
+        contents = json.dumps({"format": RESULTS_FORMAT, "key": self.key, "files": files})
+        try:
+            write_atomically(path, contents)
+        except OSError as err:
+            logger.warning(f"Results not written: {err}")
+
+    def reusable(self, name: str, current: FileResult) -> list[JsonDict] | None:
+        """Violations of the previous run, if the hashes of the file are still the same."""
+        previous = self.files.get(name)
+        if previous and previous.same_hashes(current):
+            return previous.violations
+        return None
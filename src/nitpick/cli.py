@@ -15,33 +15,64 @@ Also see (1) from https://click.palletsprojects.com/en/5.x/setuptools/#setuptool
 
 from __future__ import annotations
 
+import contextlib
 import logging
+import os
 import sys
+import tarfile
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
-import tomlkit
 from click.exceptions import Exit
 from loguru import logger
 
-from nitpick import tomlkit_ext
+from nitpick import __version__
+from nitpick.cache import (
+    export_cache,
+    format_age,
+    format_size,
+    import_cache,
+    parse_duration,
+    parse_size,
+    user_cache_dir,
+)
+from nitpick.client import ping
 from nitpick.constants import (
     CONFIG_KEY_IGNORE_STYLES,
     CONFIG_KEY_STYLE,
     CONFIG_TOOL_NITPICK_KEY,
+    DOT,
+    NITPICK_LOCK,
     PROJECT_NAME,
     EmojiEnum,
     Flake8OptionEnum,
 )
-from nitpick.core import Nitpick
+from nitpick.daemon import DaemonServer, log_path, start_daemon, stop_daemon
 from nitpick.exceptions import QuitComplainingError
 from nitpick.generic import relative_to_current_dir
 from nitpick.violations import Reporter
+from nitpick.watch import WatchSession, create_watcher
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import timedelta
+
+    from nitpick.core import Nitpick
 
 verbose_option = click.option(
     "--verbose", "-v", count=True, default=False, help="Increase logging verbosity (-v = INFO, -vv = DEBUG)"
 )
 files_argument = click.argument("files", nargs=-1)
+jobs_option = click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of threads checking or fixing files at the same time; they only overlap I/O, not parsing",
+)
 
 
 @click.group()
@@ -57,37 +88,62 @@ files_argument = click.argument("files", nargs=-1)
     default=False,
     help=Flake8OptionEnum.OFFLINE.value,
 )
-@click.version_option()
+@click.version_option(__version__)
 def nitpick_cli(project: Path | None = None, offline=False):  # pylint: disable=unused-argument
     """Enforce the same settings across multiple language-independent projects."""
 
 
 def get_nitpick(context: click.Context) -> Nitpick:
-    """Create a Nitpick instance from the click context parameters."""
+    """Create a Nitpick instance from the click context parameters.
+
+    On the daemon, its warm instance is reused.
+    """
+    from nitpick.core import Nitpick  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
     project = None
     offline = False
     if context.parent:
-        project = context.parent.params["project"]
-        offline = context.parent.params["offline"]
+        root_params = context.find_root().params
+        project = root_params["project"]
+        offline = root_params["offline"]
+    if isinstance(context.obj, Nitpick):
+        context.obj.offline = offline
+        return context.obj
     project_root: Path | None = Path(project) if project else None
     return Nitpick.singleton().init(project_root, offline)
 
 
-def common_fix_or_check(context, verbose: int, files, check_only: bool) -> None:
-    """Common CLI code for both "fix" and "check" commands."""
-    if verbose:
-        level = logging.INFO if verbose == 1 else logging.DEBUG
+def set_verbosity(verbose: int) -> None:
+    """Show the logs of Nitpick on stderr, if requested.
 
-        # https://loguru.readthedocs.io/en/stable/resources/recipes.html#changing-the-level-of-an-existing-handler
-        # https://github.com/Delgan/loguru/issues/138#issuecomment-525594566
-        logger.remove()
-        logger.add(sys.stderr, level=logging.getLevelName(level))
+    Commands that run on the daemon log in the daemon log file instead, with the verbosity of the daemon.
+    """
+    if not verbose:
+        return
+    from nitpick.core import Nitpick  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
 
-        logger.enable(PROJECT_NAME)
+    context = click.get_current_context(silent=True)
+    if context and isinstance(context.obj, Nitpick):
+        return
+    level = logging.INFO if verbose == 1 else logging.DEBUG
 
+    # https://loguru.readthedocs.io/en/stable/resources/recipes.html#changing-the-level-of-an-existing-handler
+    # https://github.com/Delgan/loguru/issues/138#issuecomment-525594566
+    logger.remove()
+    logger.add(sys.stderr, level=logging.getLevelName(level))
+
+    logger.enable(PROJECT_NAME)
+
+
+def common_fix_or_check(context, verbose: int, files, check_only: bool, **run_options) -> None:
+    """Common CLI code for both "fix" and "check" commands.
+
+    :param run_options: Other options of [Nitpick.run][nitpick.core.Nitpick.run] (e.g. ``jobs``).
+    """
+    set_verbosity(verbose)
     nit = get_nitpick(context)
     try:
-        for fuss in nit.run(*files, autofix=not check_only):
+        for fuss in nit.run(*files, autofix=not check_only, **run_options):
             nit.echo(fuss.pretty)
     except QuitComplainingError as err:
         for fuss in err.violations:
@@ -102,26 +158,155 @@ def common_fix_or_check(context, verbose: int, files, check_only: bool) -> None:
 @nitpick_cli.command()
 @click.pass_context
 @verbose_option
+@jobs_option
 @files_argument
-def fix(context, verbose, files):
+def fix(context, verbose, jobs, files):
     """Fix files, modifying them directly.
 
     You can use partial and multiple file names in the FILES argument.
     """
-    common_fix_or_check(context, verbose, files, False)
+    common_fix_or_check(context, verbose, files, False, jobs=jobs)
 
 
 @nitpick_cli.command()
 @click.pass_context
 @verbose_option
+@jobs_option
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Reuse the violations of the previous incremental check for files that didn't change",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running, and check again the files affected by each change of the files or styles",
+)
 @files_argument
-def check(context, verbose, files):
+def check(context, verbose, jobs, incremental, watch, files):  # pylint: disable=too-many-arguments # noqa: PLR0913
     """Don't modify files, just print the differences.
 
     Return code 0 means nothing would change. Return code 1 means some files would be modified.
     You can use partial and multiple file names in the FILES argument.
     """
-    common_fix_or_check(context, verbose, files, True)
+    if watch:
+        set_verbosity(verbose)
+        watch_project(get_nitpick(context), files, jobs, incremental)
+        return
+    common_fix_or_check(context, verbose, files, True, jobs=jobs, incremental=incremental)
+
+
+def watch_project(nit: Nitpick, files: tuple[str, ...], jobs: int, incremental: bool) -> None:
+    """Check the project again after each change, until interrupted with Ctrl+C."""
+    session = WatchSession(nit, files, jobs=jobs, incremental=incremental)
+    watcher = create_watcher()
+    changed = None
+    try:
+        while True:
+            for fuss in session.run(changed):
+                nit.echo(fuss.pretty)
+            click.secho(Reporter.get_counts())
+            paths = session.paths
+            click.secho(f"Watching {len(paths)} files for changes. Press Ctrl+C to stop.", dim=True)
+            watcher.watch(paths)
+            changed = watcher.wait()
+            click.echo()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    if Reporter.manual:
+        raise Exit(1)
+
+
+@nitpick_cli.command()
+@click.pass_context
+@verbose_option
+@click.option(
+    "--fix",
+    "-f",
+    is_flag=True,
+    default=False,
+    help="Fix the files of the projects; otherwise, just print the differences",
+)
+@click.option(
+    "--manifest",
+    "-m",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="File with one project root per line, relative to the file (blank lines and # comments are ignored)",
+)
+@click.option(
+    "--processes",
+    "-P",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes checking projects at the same time",
+)
+@click.option(
+    "--file",
+    "files",
+    multiple=True,
+    help="Partial name of a file to check on each project; can be used multiple times",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Style cache dir shared by all projects (default: $NITPICK_CACHE_DIR or the user cache dir)",
+)
+@click.argument("roots", nargs=-1, type=click.Path(exists=True, dir_okay=True, file_okay=False, path_type=Path))
+def batch(  # pylint: disable=too-many-arguments # noqa: PLR0913
+    context,
+    verbose: int,
+    fix: bool,  # pylint: disable=redefined-outer-name
+    manifest: Path | None,
+    processes: int,
+    files: tuple[str, ...],
+    cache_dir: Path | None,
+    roots: tuple[Path, ...],
+) -> None:
+    """Check or fix many projects in a single run.
+
+    Pass the project roots as arguments, and/or in a manifest file.
+    The plugins are loaded once per process, and the cache of remote and parsed styles is shared by all projects
+    (in the dir of the --cache-dir option).
+    Return code 0 means no project has violations; otherwise, the highest return code of the projects.
+    """
+    from nitpick.batch import check_projects, read_manifest  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+
+    set_verbosity(verbose)
+    all_roots = [*roots, *(read_manifest(manifest) if manifest else [])]
+    if not all_roots:
+        click.secho("Nothing to do. Pass project roots or a manifest file.", fg="yellow")
+        return
+
+    offline = context.find_root().params["offline"]
+    results = []
+    shared_dir = cache_dir or user_cache_dir()
+    for result in check_projects(
+        all_roots, files, autofix=fix, offline=offline, processes=processes, cache_dir=shared_dir
+    ):
+        relative = relative_to_current_dir(result.root)
+        for fuss in result.violations:
+            click.echo(f"{relative}{os.path.sep if relative else ''}{fuss.pretty}")
+        name = relative or DOT
+        if result.error:
+            click.secho(f"{name}: {result.error}", fg="red")
+        else:
+            click.echo(f"{name}: {result.counts}")
+        results.append(result)
+
+    with_violations = sum(1 for result in results if result.violations)
+    with_errors = sum(1 for result in results if result.error)
+    summary = f"{len(results)} project{'' if len(results) == 1 else 's'} checked"
+    summary += f", {with_violations} with violations" if with_violations else ""
+    summary += f", {with_errors} with errors" if with_errors else ""
+    click.echo(f"{summary}.")
+    exit_code = max(result.exit_code for result in results)
+    if exit_code:
+        raise Exit(exit_code)
 
 
 @nitpick_cli.command()
@@ -150,6 +335,231 @@ def ls(context, files):  # pylint: disable=invalid-name
         click.secho(relative_to_current_dir(file), fg="green" if file.exists() else "red")
 
 
+@nitpick_cli.command()
+@click.pass_context
+def lock(context):
+    """Pin the remote styles (and the styles they include) in a lock file.
+
+    GitHub and Git styles are pinned to the commit of their Git reference, and all remote styles are recorded
+    with a hash of their contents. The next runs fetch the locked styles only by these immutable addresses.
+    Run this command again to update the lock file.
+    """
+    nit = get_nitpick(context)
+    if nit.offline:
+        click.secho("Styles can't be locked in offline mode.", fg="red")
+        raise Exit(2)
+    try:
+        style_lock = nit.project.lock_styles()
+    except QuitComplainingError as err:
+        for fuss in err.violations:
+            click.echo(fuss.pretty)
+        raise Exit(2) from err
+
+    count = len(style_lock.styles)
+    click.echo(f"{count} style{'' if count == 1 else 's'} locked in {NITPICK_LOCK}. {EmojiEnum.STAR_CAKE.value}")
+
+
+@nitpick_cli.group()
+def cache():
+    """Manage the cache of remote styles.
+
+    The cache is in the project cache dir, or in the dir set by the NITPICK_CACHE_DIR environment variable.
+    """
+
+
+@cache.command()
+@click.pass_context
+def warm(context):
+    """Download all configured styles (and the styles they include) into the cache."""
+    nit = get_nitpick(context)
+    try:
+        violations = list(nit.project.merge_styles(offline=False))
+    except QuitComplainingError as err:
+        violations = err.violations
+    if violations:
+        for fuss in violations:
+            click.echo(fuss.pretty)
+        raise Exit(2)
+
+    click.echo(f"Styles cached in {nit.project.styles_cache_dir}. {EmojiEnum.STAR_CAKE.value}")
+
+
+@cache.command()
+@click.pass_context
+def stats(context):
+    """Show the hits, misses, size and age of each cached style."""
+    nit = get_nitpick(context)
+    all_stats = nit.project.style_manager(nit.offline).cache_stats()
+    if not all_stats:
+        click.echo("No cached styles.")
+        return
+
+    now = time.time()
+    rows = [("URL", "Hits", "Misses", "Size", "Age")]
+    rows.extend(
+        (row.url, str(row.hits), str(row.misses), format_size(row.size), format_age(now - row.created))
+        for row in all_stats
+    )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        click.echo("  ".join(value.ljust(width) for value, width in zip(row, widths, strict=True)).rstrip())
+    hits = sum(row.hits for row in all_stats)
+    misses = sum(row.misses for row in all_stats)
+    click.echo(
+        f"Total: {len(all_stats)} style{'' if len(all_stats) == 1 else 's'},"
+        f" {format_size(sum(row.size for row in all_stats))},"
+        f" {hits} hit{'' if hits == 1 else 's'}, {misses} miss{'' if misses == 1 else 'es'}"
+    )
+
+
+def _parse_option(
+    parser: Callable[[str], Any], description: str
+) -> Callable[[click.Context, click.Parameter, Any], Any]:
+    def _callback(context: click.Context, param: click.Parameter, value: str | None):  # noqa: ARG001
+        if value is None:
+            return None
+        parsed = parser(value)
+        if parsed is None:
+            msg = f"{value!r} is not {description}"
+            raise click.BadParameter(msg)
+        return parsed
+
+    return _callback
+
+
+@cache.command()
+@click.pass_context
+@click.option(
+    "--older-than",
+    callback=_parse_option(parse_duration, "a duration like '30 minutes', '12 hours', '7 days' or '2 weeks'"),
+    help="Evict styles downloaded before this duration (e.g. '7 days')",
+)
+@click.option(
+    "--max-size",
+    callback=_parse_option(parse_size, "a size like '500KB', '50MB' or '1GB'"),
+    help="Evict the least recently used styles until the cache is smaller than this size (e.g. '50MB')",
+)
+def prune(context, older_than: timedelta | None, max_size: int | None):
+    """Evict cached styles by age or by size."""
+    if older_than is None and max_size is None:
+        click.secho("Nothing to do. Use --older-than and/or --max-size.", fg="yellow")
+        return
+    nit = get_nitpick(context)
+    evicted = nit.project.style_manager(nit.offline).prune_cache(older_than=older_than, max_size=max_size)
+    click.echo(f"{evicted} cached file{'' if evicted == 1 else 's'} evicted.")
+
+
+@cache.command()
+@click.pass_context
+@click.argument("tarball", type=click.Path(dir_okay=False, writable=True, path_type=Path))
+def export(context, tarball: Path):
+    """Export the cache to a gzipped tarball, to bake it into Docker images or CI caches."""
+    nit = get_nitpick(context)
+    count = export_cache(nit.project.styles_cache_dir, tarball)
+    click.echo(f"{count} cached file{'' if count == 1 else 's'} exported to {tarball}.")
+
+
+@cache.command("import")
+@click.pass_context
+@click.argument("tarball", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def import_(context, tarball: Path):
+    """Import a tarball created by "nitpick cache export" into the cache."""
+    nit = get_nitpick(context)
+    try:
+        count = import_cache(tarball, nit.project.styles_cache_dir)
+    except (ValueError, tarfile.TarError) as err:
+        click.secho(f"The cache could not be imported: {err}", fg="red")
+        raise Exit(2) from err
+    click.echo(f"{count} cached file{'' if count == 1 else 's'} imported from {tarball}.")
+
+
+@nitpick_cli.group()
+def daemon():
+    """Keep a warm Nitpick process for the project, so the thin client runs commands quickly.
+
+    Run "nitpick-client" with the same arguments as "nitpick": the check, fix and ls commands run on the daemon
+    of the project, if it's running; other commands run in the client process.
+    """
+
+
+idle_timeout_option = click.option(
+    "--idle-timeout",
+    default="1 hour",
+    show_default=True,
+    callback=_parse_option(parse_duration, "a duration like '30 minutes', '12 hours', '7 days' or '2 weeks'"),
+    help="Stop the daemon after this time without commands",
+)
+
+
+@daemon.command("start")
+@click.pass_context
+@verbose_option
+@idle_timeout_option
+def daemon_start(context, verbose: int, idle_timeout: timedelta):
+    """Start the daemon of the project in the background."""
+    nit = get_nitpick(context)
+    root = nit.project.root
+    status = ping(root)
+    if status:
+        click.echo(f"The daemon is already running (PID {status['pid']}).")
+        return
+
+    status = start_daemon(root, nit.offline, idle_timeout, verbose)
+    if not status:
+        click.secho(f"The daemon failed to start. See the log file {log_path(root)}", fg="red")
+        raise Exit(2)
+    click.echo(f"Daemon started (PID {status['pid']}). {EmojiEnum.STAR_CAKE.value}")
+
+
+@daemon.command("run")
+@click.pass_context
+@verbose_option
+@idle_timeout_option
+def daemon_run(context, verbose: int, idle_timeout: timedelta):
+    """Run the daemon of the project in the foreground."""
+    set_verbosity(verbose)
+    nit = get_nitpick(context)
+    try:
+        server = DaemonServer(nit, idle_timeout)
+    except RuntimeError as err:
+        click.secho(str(err), fg="red")
+        raise Exit(2) from err
+
+    # Load the plugins and merge the styles now, so the first command is fast too
+    with contextlib.suppress(QuitComplainingError):
+        list(nit.project.merge_styles(nit.offline))
+    click.echo(f"Daemon running for {nit.project.root}. Press Ctrl+C to stop.")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve()
+
+
+@daemon.command("stop")
+@click.pass_context
+def daemon_stop(context):
+    """Stop the daemon of the project."""
+    root = get_nitpick(context).project.root
+    if stop_daemon(root):
+        click.echo("Daemon stopped.")
+    else:
+        click.echo(f"No daemon running for {root}.")
+
+
+@daemon.command("status")
+@click.pass_context
+def daemon_status(context):
+    """Show if the daemon of the project is running."""
+    root = get_nitpick(context).project.root
+    status = ping(root)
+    if not status:
+        click.echo(f"No daemon running for {root}.")
+        raise Exit(1)
+    click.echo(
+        f"Daemon running for {status['root']} (PID {status['pid']}, version {status['version']},"
+        f" started {format_age(time.time() - status['started'])} ago)."
+    )
+    click.echo(f"Log file: {log_path(root)}")
+
+
 @nitpick_cli.command()
 @click.pass_context
 @click.option(
@@ -194,14 +604,17 @@ def init(
         )
         return
 
+    # pylint: disable=import-outside-toplevel
+    import tomlkit  # noqa: PLC0415
+
+    from nitpick import tomlkit_ext  # noqa: PLC0415
+
     nit = get_nitpick(context)
     config = nit.project.read_configuration()
 
     # Convert tuple to list, so we can add styles to it
     style_urls = list(style_urls)
     if suggest:
-        from nitpick import __version__  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
-
         # Create the ignored styles array only when suggesting styles
         if CONFIG_KEY_IGNORE_STYLES not in config.table:
             config.table.add(CONFIG_KEY_IGNORE_STYLES, config.dont_suggest)
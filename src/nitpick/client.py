@@ -0,0 +1,156 @@
+"""Thin client of the Nitpick daemon.
+
+It forwards the ``check``, ``fix`` and ``ls`` commands to the daemon of the project over a Unix socket,
+and streams back their output.
+When no daemon is running (or for other commands), the regular command line app runs in this process.
+
+Only the standard library is imported here, so the client starts quickly; keep it that way.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from nitpick import __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+#: Commands that can be forwarded to the daemon.
+FORWARDED_COMMANDS = ("check", "fix", "ls")
+#: Seconds to wait for the daemon to accept a connection.
+CONNECT_TIMEOUT = 1.0
+#: Prefix of the environment variables read by Nitpick (e.g. ``NITPICK_OFFLINE``); they are sent to the daemon.
+ENV_VAR_PREFIX = "NITPICK_"
+
+
+def nitpick_environ() -> dict[str, str]:
+    """Environment variables read by Nitpick in the current process."""
+    return {key: value for key, value in os.environ.items() if key.startswith(ENV_VAR_PREFIX)}
+
+
+def socket_path(root: Path) -> Path:
+    """Path of the Unix socket of the daemon of a project root, in a directory only the current user can access.
+
+    The directory is in ``$XDG_RUNTIME_DIR``, or in the temporary dir of the system.
+    The name of the socket is a hash of the project root, to stay under the length limit of socket paths.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    directory = Path(runtime_dir) / "nitpick" if runtime_dir else Path(tempfile.gettempdir()) / f"nitpick-{os.getuid()}"
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if directory.stat().st_uid != os.getuid():
+        msg = f"The daemon directory belongs to another user: {directory}"
+        raise PermissionError(msg)
+    digest = hashlib.sha256(os.fsencode(Path(root).resolve())).hexdigest()[:16]
+    return directory / f"{digest}.sock"
+
+
+def daemon_root(start: Path) -> Path | None:
+    """Root of the project of a dir, if a daemon serves it; the client can run in any subdir of the project.
+
+    Climbing up from the start dir, the root is the first dir with a daemon socket;
+    a dir with one of the root files of [confirm_project_root()][nitpick.core.confirm_project_root]
+    is the root of a project without a daemon.
+    """
+    try:
+        for dir_ in (start, *start.parents):
+            if socket_path(dir_).exists():
+                return dir_
+            # Only a client outside the root of a served project pays for these imports
+            # pylint: disable=import-outside-toplevel
+            from nitpick.constants import ROOT_FILES_DIRS  # noqa: PLC0415
+
+            if any(next(dir_.glob(pattern), None) for pattern in ROOT_FILES_DIRS):
+                return None
+    except OSError:
+        return None
+    return None
+
+
+def send(root: Path, request: dict[str, Any], timeout: float | None = CONNECT_TIMEOUT) -> Iterator[dict[str, Any]]:
+    """Send a request to the daemon of a project root, and yield the messages of its response.
+
+    :raises OSError: If the daemon is not running (e.g. ``FileNotFoundError`` or ``ConnectionRefusedError``).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(os.fspath(socket_path(root)))
+        # The daemon might take a while to check a big project
+        sock.settimeout(None)
+        sock.sendall(json.dumps({"version": __version__, **request}).encode() + b"\n")
+        with sock.makefile("r", encoding="utf-8") as response:
+            for line in response:
+                yield json.loads(line)
+
+
+def ping(root: Path) -> dict[str, Any] | None:
+    """Status of the daemon of a project root (e.g. its PID and version); None if it's not running."""
+    try:
+        return next(send(root, {"ping": True}), None)
+    except OSError:
+        return None
+
+
+def forward(root: Path, command: str, args: Sequence[str], offline: bool = False) -> int | None:
+    """Run a command on the daemon, writing its output on stdout and stderr.
+
+    :return: The exit code of the command; None if the daemon is not running or can't run it
+        (e.g. it was started by another version of Nitpick, or with another shared cache).
+    """
+    request = {
+        "command": command,
+        "args": list(args),
+        "offline": offline,
+        "cwd": str(Path.cwd()),
+        "env": nitpick_environ(),
+        "color": sys.stdout.isatty(),
+    }
+    streams = {"out": sys.stdout, "err": sys.stderr}
+    received = False
+    try:
+        for message in send(root, request):
+            if "exit" in message:
+                return message["exit"]
+            for key, stream in streams.items():
+                if key in message:
+                    stream.write(message[key])
+                    stream.flush()
+                    received = True
+    except OSError:
+        # Run the command in this process only if the daemon didn't output anything yet
+        if not received:
+            return None
+    sys.stderr.write("The connection to the Nitpick daemon was lost.\n")
+    return 2
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point of the ``nitpick-client`` script; it accepts the same arguments as ``nitpick``."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--project", "-p")
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    options, unknown = parser.parse_known_args(argv)
+
+    exit_code = None
+    if hasattr(socket, "AF_UNIX") and not unknown and options.command in FORWARDED_COMMANDS:
+        root = daemon_root(Path(options.project or Path.cwd()).resolve())
+        if root:
+            exit_code = forward(root, options.command, options.args, options.offline)
+    if exit_code is None:
+        # pylint: disable=import-outside-toplevel
+        from nitpick.cli import nitpick_cli  # noqa: PLC0415
+        from nitpick.constants import PROJECT_NAME  # noqa: PLC0415
+
+        nitpick_cli(args=argv, prog_name=PROJECT_NAME, auto_envvar_prefix=PROJECT_NAME)
+    sys.exit(exit_code)
@@ -1,8 +1,17 @@
 """Special configurations."""
 
-from attr import Factory, define  # type: ignore[attr-defined]
+from __future__ import annotations
 
-from nitpick.typedefs import JsonDict
+from typing import TYPE_CHECKING
+
+from attr import Factory, define, field  # type: ignore[attr-defined]
+
+from nitpick.blender import SEPARATOR_DOT, compile_jmespath
+
+if TYPE_CHECKING:
+    from jmespath.parser import ParsedResult
+
+    from nitpick.typedefs import JsonDict
 
 
 @define
@@ -14,8 +23,44 @@ class OverridableConfig:  # pylint: disable=too-few-public-methods
     value: JsonDict = Factory(dict)
 
 
+@define(frozen=True)
+class ListKey:
+    """Key of the elements of a list (e.g. ``name``), or parent and child keys of their children (e.g. ``hooks.id``)."""
+
+    parent_key: str
+    child_key: str
+    #: Compiled JMESPath expression of the key of an element; None if the list has no key.
+    expression: ParsedResult | None
+
+    @classmethod
+    def from_string(cls, list_keys: str) -> ListKey:
+        """Split the parent and child keys, and compile the expression of the key of an element.
+
+        >>> ListKey.from_string("hooks.id").expression.expression
+        'hooks[].id'
+        >>> ListKey.from_string("name").parent_key, ListKey.from_string("").expression
+        ('', None)
+        """
+        if SEPARATOR_DOT in list_keys:
+            parent_key, child_key = list_keys.rsplit(SEPARATOR_DOT, 1)
+            jmes_key = f"{parent_key}[].{child_key}"
+        else:
+            parent_key = ""
+            child_key = jmes_key = list_keys
+        return cls(parent_key, child_key, compile_jmespath(jmes_key) if jmes_key else None)
+
+
 @define
 class SpecialConfig:  # pylint: disable=too-few-public-methods
     """Special configurations for plugins."""
 
     list_keys: OverridableConfig = Factory(OverridableConfig)
+    #: List keys by flat key, compiled from the values of the list keys.
+    _compiled_list_keys: dict[str, ListKey] = field(factory=dict, init=False, repr=False, eq=False)
+
+    def list_key(self, flat_key: str) -> ListKey:
+        """Key of the elements of a list, compiled once; a list without a key is compared by the whole elements."""
+        list_key = self._compiled_list_keys.get(flat_key)
+        if list_key is None:
+            list_key = self._compiled_list_keys[flat_key] = ListKey.from_string(self.list_keys.value.get(flat_key, ""))
+        return list_key
@@ -7,15 +7,17 @@ import re
 from datetime import timedelta
 from enum import Enum, IntEnum, auto
 
-import jmespath
-from requests_cache import DO_NOT_CACHE, NEVER_EXPIRE
+from loguru import logger
 
 # keep-sorted start
 ANY_BUILTIN_STYLE = "any"
 CACHE_DIR_NAME = ".cache"
+CACHE_MODE_SEPARATORS = " \t\n,;"
 COMMENT_MARKER_END = "-end"
 COMMENT_MARKER_START = "-start"
 CONFIG_DUNDER_LIST_KEYS = "__list_keys"
+CONFIG_KEY_CACHE_BACKEND = "cache_backend"
+CONFIG_KEY_FETCH_WORKERS = "fetch_workers"
 CONFIG_KEY_IGNORE_STYLES = "ignore_styles"
 CONFIG_KEY_STYLE = "style"
 CONFIG_KEY_TOOL = "tool"
@@ -23,22 +25,27 @@ CONFIG_TOOL_KEY = "tool"
 DOT = "."
 DOT_NITPICK_TOML = ".nitpick.toml"
 EDITOR_CONFIG = ".editorconfig"
+FETCH_WORKERS_DEFAULT = 8
 FLAKE8_PREFIX = "NIP"
 GITHUB_COM = "github.com"
 GITHUB_COM_API = "api.github.com"
 GITHUB_COM_QUERY_STRING_TOKEN = "token"  # nosec # noqa: S105
 GITHUB_COM_RAW = "raw.githubusercontent.com"
+GITHUB_DEFAULT_BRANCH_TTL = timedelta(days=1)
 GIT_AT_REFERENCE = "@"
+GIT_CACHE_DIR_NAME = "git"
 GIT_CORE_EXCLUDES_FILE = "core.excludesFile"
 GIT_DIR = ".git"
+GIT_EXTENSION = ".git"
 GIT_IGNORE = ".gitignore"
 GOLANG_MOD = "go.mod"
 GOLANG_SUM = "go.sum"
 JAVASCRIPT_PACKAGE_JSON = "package.json"
-JMEX_NITPICK_MINIMUM_VERSION = jmespath.compile("nitpick.minimum_version")
-JMEX_NITPICK_STYLES_INCLUDE = jmespath.compile("nitpick.styles.include")
+JMEX_NITPICK_MINIMUM_VERSION = "nitpick.minimum_version"
+JMEX_NITPICK_STYLES_INCLUDE = "nitpick.styles.include"
 MAKEFILE = "Makefile"
 MERGED_STYLE_TOML = "merged-style.toml"
+NITPICK_LOCK = "nitpick.lock"
 NITPICK_STYLE_TOML = "nitpick-style.toml"
 PRE_COMMIT_CONFIG_YAML = ".pre-commit-config.yaml"
 PROJECT_NAME = "nitpick"
@@ -54,9 +61,10 @@ PYTHON_SETUP_PY = "setup.py"
 PYTHON_TOX_INI = "tox.ini"
 READ_THE_DOCS_URL = "https://nitpick.rtfd.io/latest/"
 REGEX_CACHE_UNIT = re.compile(r"(?P<number>\d+)\s+(?P<unit>(minute|hour|day|week))", re.IGNORECASE)
+REGEX_GIT_COMMIT = re.compile(r"[0-9a-f]{40}")
 RUST_CARGO_STAR = "Cargo.*"
+SHARED_CACHE_MAX_SIZE_DEFAULT = 100 * 1024 * 1024
 TOML_EXTENSION = ".toml"
-WRITE_STYLE_MAX_ATTEMPTS = 5
 # keep-sorted end
 
 # These depend on some constants above, so they can't be sorted automatically
@@ -90,7 +98,7 @@ CONFIG_RUN_NITPICK_INIT_OR_CONFIGURE_STYLE_MANUALLY = (
     f" See {READ_THE_DOCS_URL}configuration.html"
 )
 CONFIG_TOOL_NITPICK_KEY = f"{CONFIG_TOOL_KEY}.{PROJECT_NAME}"
-JMEX_TOOL_NITPICK = jmespath.compile(CONFIG_TOOL_NITPICK_KEY)
+JMEX_TOOL_NITPICK = CONFIG_TOOL_NITPICK_KEY
 
 
 class EmojiEnum(Enum):
@@ -131,6 +139,13 @@ class Flake8OptionEnum(_OptionMixin, Enum):
     OFFLINE = "Offline mode: no style will be downloaded (no HTTP requests at all)"
 
 
+class CacheEnvVarEnum(_OptionMixin, Enum):
+    """Environment variables to configure a style cache shared by all projects on the same machine."""
+
+    CACHE_DIR = "Directory of the remote style cache shared by all projects (by default, each project has its own)"
+    CACHE_MAX_SIZE = "Maximum size of the shared remote style cache, e.g. 500MB (default: 100MB)"
+
+
 class CachingEnum(IntEnum):
     """Caching modes for styles."""
 
@@ -144,9 +159,28 @@ class CachingEnum(IntEnum):
     EXPIRES = auto()
 
 
-# TODO: move this to the enum above
-CACHE_EXPIRATION_DEFAULTS = {
-    CachingEnum.NEVER: DO_NOT_CACHE,
-    CachingEnum.FOREVER: NEVER_EXPIRE,
-    CachingEnum.EXPIRES: timedelta(hours=1),
-}
+class CacheBackendEnum(Enum):
+    """Storage of the remote style cache."""
+
+    SQLITE = "sqlite"
+    FILESYSTEM = "filesystem"
+    MEMORY = "memory"
+
+
+class CacheModeEnum(Enum):
+    """Extra cache modes for remote styles, combined with the expiration on the ``cache`` option."""
+
+    #: An expired style is used right away, while it's revalidated in the background (with ETag/If-None-Match).
+    STALE_WHILE_REVALIDATE = "stale-while-revalidate"
+
+    #: An expired style is used when the network fails or the server returns an error.
+    STALE_IF_ERROR = "stale-if-error"
+
+
+#: Styles that were not found (HTTP 404) are cached for a short time, to avoid a request on every run.
+CACHE_NOT_FOUND_EXPIRATION = timedelta(minutes=5)
+
+# Nitpick logs are disabled, unless the CLI is verbose.
+# This is done here instead of the package, so the thin client of the daemon doesn't import loguru;
+# all modules that log import the constants.
+logger.disable(PROJECT_NAME)
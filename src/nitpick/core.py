@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import itertools
 import os
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
 from functools import lru_cache
 from itertools import chain
 from pathlib import Path
@@ -15,33 +17,51 @@ import tomlkit
 from autorepr import autorepr
 from identify import identify
 from loguru import logger
+from marshmallow.validate import OneOf
 from marshmallow_polyfield import PolyField
 from more_itertools import always_iterable
 from packaging.version import parse as parse_version
-from pluggy import PluginManager
 from tomlkit import items
 
-from nitpick import fields, plugins, tomlkit_ext
+from nitpick import __version__, fields, tomlkit_ext
 from nitpick.blender import search_json
+from nitpick.cache import (
+    RESULTS_STATE_NAME,
+    FileResult,
+    ResultsState,
+    hash_bytes,
+    hash_json,
+    hash_text,
+    stat_validator,
+    styles_cache_dir,
+)
 from nitpick.constants import (
     ANY_BUILTIN_STYLE,
+    CACHE_DIR_NAME,
     CONFIG_FILES,
+    CONFIG_KEY_CACHE_BACKEND,
+    CONFIG_KEY_FETCH_WORKERS,
     CONFIG_KEY_IGNORE_STYLES,
     CONFIG_KEY_STYLE,
     CONFIG_KEY_TOOL,
     CONFIG_TOOL_NITPICK_KEY,
     DOT_NITPICK_TOML,
+    FETCH_WORKERS_DEFAULT,
     JMEX_NITPICK_MINIMUM_VERSION,
+    NITPICK_LOCK,
     PROJECT_NAME,
     PYTHON_MANAGE_PY,
     PYTHON_PYPROJECT_TOML,
     ROOT_FILES_DIRS,
     ROOT_PYTHON_FILES,
+    CacheBackendEnum,
 )
 from nitpick.exceptions import QuitComplainingError
 from nitpick.generic import filter_names, glob_files, glob_non_ignored_files, relative_to_current_dir
 from nitpick.plugins.info import FileInfo
+from nitpick.plugins.registry import PluginRegistry
 from nitpick.schemas import BaseNitpickSchema, flatten_marshmallow_errors, help_message
+from nitpick.snapshot import ProjectSnapshot
 from nitpick.style import (
     BuiltinStyle,
     StyleManager,
@@ -52,6 +72,10 @@ from nitpick.violations import Fuss, ProjectViolations, Reporter, StyleViolation
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
 
+    from pluggy import PluginManager
+
+    from nitpick.lock import StyleLock
+    from nitpick.plugins.base import NitpickPlugin
     from nitpick.typedefs import JsonDict, PathOrStr
 
 
@@ -64,7 +88,10 @@ class Nitpick:
 
     def __init__(self) -> None:
         if not self._allow_init:
-            msg = "This class cannot be instantiated directly. Use Nitpick.singleton().init(...) instead"
+            msg = (
+                "This class cannot be instantiated directly."
+                " Use Nitpick.singleton().init(...) or Nitpick.create(...) instead"
+            )
             raise TypeError(msg)
 
         self.offline: bool = False
@@ -78,6 +105,29 @@ class Nitpick:
         Nitpick._allow_init = False
         return instance
 
+    @classmethod
+    def create(
+        cls,
+        project_root: PathOrStr | None = None,
+        offline=False,
+        plugin_registry: PluginRegistry | None = None,
+        shared_cache_dir: Path | None = None,
+    ) -> Nitpick:
+        """Return a new instance for a project, independent of the singleton (e.g. to check many projects).
+
+        :param plugin_registry: A plugin registry shared by many projects; by default, the project has its own.
+        :param shared_cache_dir: A style cache dir shared by many projects;
+            by default, the one configured with an environment variable, or the cache dir of the project.
+        """
+        Nitpick._allow_init = True
+        try:
+            instance = cls()
+        finally:
+            Nitpick._allow_init = False
+        instance.project = Project(project_root, plugin_registry, shared_cache_dir)
+        instance.offline = offline
+        return instance
+
     def init(self, project_root: PathOrStr | None = None, offline: bool | None = None) -> Nitpick:
         """Initialize attributes of the singleton."""
         self.project = Project(project_root)
@@ -87,11 +137,13 @@ class Nitpick:
 
         return self
 
-    def run(self, *partial_names: str, autofix=False) -> Iterator[Fuss]:
+    def run(self, *partial_names: str, autofix=False, jobs: int = 1, incremental=False) -> Iterator[Fuss]:
         """Run Nitpick.
 
         :param partial_names: Names of the files to enforce configs for.
         :param autofix: Flag to modify files, if the plugin supports it (default: True).
+        :param jobs: Number of threads enforcing files at the same time; they only overlap I/O (default: 1).
+        :param incremental: Reuse the violations of the previous run for files that didn't change (check mode only).
         :return: Fuss generator.
         """
         Reporter.reset()
@@ -101,7 +153,7 @@ class Nitpick:
             yield from chain(
                 self.project.merge_styles(self.offline),
                 self.enforce_present_absent(*partial_names),
-                self.enforce_style(*partial_names, autofix=autofix),
+                self.enforce_style(*partial_names, autofix=autofix, jobs=jobs, incremental=incremental),
             )
         except QuitComplainingError as err:
             yield from err.violations
@@ -122,38 +174,95 @@ class Nitpick:
             file_mapping = self.project.nitpick_files_section.get(key, {})
             for filename in filter_names(file_mapping, *partial_names):
                 custom_message = file_mapping[filename]
-                file_path: Path = self.project.root / filename
-                exists = file_path.exists()
+                exists = self.project.snapshot.exists(filename)
                 if (present and exists) or (absent and not exists):
                     continue
 
-                reporter = Reporter(FileInfo.create(self.project, filename))
+                reporter = Reporter(self.project.file_info(filename))
 
                 extra = f": {custom_message}" if custom_message else ""
                 violation = ProjectViolations.MISSING_FILE if present else ProjectViolations.FILE_SHOULD_BE_DELETED
                 yield reporter.make_fuss(violation, extra=extra)
 
-    def enforce_style(self, *partial_names: str, autofix=True) -> Iterator[Fuss]:
+    def enforce_style(self, *partial_names: str, autofix=True, jobs: int = 1, incremental=False) -> Iterator[Fuss]:
         """Read the merged style and enforce the rules in it.
 
-        1. Get all root keys from the merged style (every key is a filename, except "nitpick").
-        2. For each file name, find the plugin(s) that can handle the file.
-
         :param partial_names: Names of the files to enforce configs for.
         :param autofix: Flag to modify files, if the plugin supports it (default: True).
+        :param jobs: Number of threads enforcing files at the same time; they only overlap I/O (default: 1).
+        :param incremental: Reuse the violations of the previous run for files that didn't change (check mode only).
         :return: Fuss generator.
         """
+        config_keys = filter_names(self.project.style_dict, *partial_names)
+        for _, violations in self.enforce_files(config_keys, autofix=autofix, jobs=jobs, incremental=incremental):
+            yield from violations
+
+    def enforce_files(
+        self, config_keys: list[str], *, autofix=True, jobs: int = 1, incremental=False
+    ) -> Iterator[tuple[str, list[Fuss]]]:
+        """Enforce the merged style on some of the configured files.
 
+        1. For each file name (a root key of the merged style), find the plugin classes that can handle the file.
+        2. On incremental checks, reuse the violations of files that didn't change since the previous run.
+        3. Create and run the plugins of the other files;
+           with more than one job, different files are enforced at the same time.
+
+        :param config_keys: File names, as root keys of the merged style.
+        :param autofix: Flag to modify files, if the plugin supports it (default: True).
+        :param jobs: Number of threads enforcing files at the same time; they only overlap I/O (default: 1).
+        :param incremental: Reuse the violations of the previous run for files that didn't change (check mode only).
+        :return: The file name and its violations, in the same order as ``config_keys``.
+        """
         # 1.
-        for config_key in filter_names(self.project.style_dict, *partial_names):
-            config_dict = self.project.style_dict[config_key]
-            logger.debug(f"{config_key}: Finding plugins to enforce style")
+        file_classes = [(config_key, self._plugin_classes(config_key)) for config_key in config_keys]
+
+        # 2.
+        state = self.project.read_results() if incremental and not autofix else None
+        current, reused = _compare_results(state, file_classes, self.project) if state is not None else ({}, {})
 
-            # 2.
-            info = FileInfo.create(self.project, config_key)
-            # pylint: disable=no-member
-            for plugin_class in self.project.plugin_manager.hook.can_handle(info=info):
-                yield from plugin_class(info, config_dict, autofix).entry_point()
+        # 3.
+        pending = [
+            self._file_plugins(config_key, plugin_classes, autofix)
+            for config_key, plugin_classes in file_classes
+            if config_key not in reused
+        ]
+        workers = min(jobs, len(pending))
+        with ExitStack() as stack:
+            if workers > 1:
+                logger.info(f"Enforcing {len(pending)} files with {workers} workers")
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers, thread_name_prefix=PROJECT_NAME))
+                enforced = executor.map(_enforce_file, pending)
+            else:
+                enforced = map(_enforce_file, pending)
+
+            for config_key, _ in file_classes:
+                if config_key in reused:
+                    violations = reused[config_key]
+                    for fuss in violations:
+                        Reporter.increment(fuss.fixed)
+                else:
+                    violations = next(enforced)
+                    if config_key in current:
+                        current[config_key].violations = [asdict(fuss) for fuss in violations]
+                yield config_key, violations
+
+        # Without files enforced again, the previous results are still up to date
+        if state is not None and current:
+            state.files.update(current)
+            state.write(self.project.results_path)
+
+    def _plugin_classes(self, config_key: str) -> list[type[NitpickPlugin]]:
+        """Plugin classes that enforce the style of a configured file."""
+        logger.debug(f"{config_key}: Finding plugins to enforce style")
+        return self.project.plugin_registry.can_handle(self.project.file_info(config_key))
+
+    def _file_plugins(
+        self, config_key: str, plugin_classes: list[type[NitpickPlugin]], autofix: bool
+    ) -> list[NitpickPlugin]:
+        """Plugins that enforce the style of a configured file."""
+        config_dict = self.project.style_dict[config_key]
+        info = self.project.file_info(config_key)
+        return [plugin_class(info, config_dict, autofix) for plugin_class in plugin_classes]
 
     def configured_files(self, *partial_names: str) -> list[Path]:
         """List of files configured in the Nitpick style.
@@ -170,6 +279,48 @@ class Nitpick:
         click.echo(f"{relative}{message}")
 
 
+def _enforce_file(plugins: list[NitpickPlugin]) -> list[Fuss]:
+    """Run the plugins of one file, one after the other."""
+    return [fuss for plugin in plugins for fuss in plugin.entry_point()]
+
+
+def _compare_results(
+    state: ResultsState, file_classes: list[tuple[str, list[type[NitpickPlugin]]]], project: Project
+) -> tuple[dict[str, FileResult], dict[str, list[Fuss]]]:
+    """Compare the hashes of each file with the previous run, before any plugin is created.
+
+    :return: The results of the files that should be enforced again, and the violations that can be reused.
+    """
+    current: dict[str, FileResult] = {}
+    reused: dict[str, list[Fuss]] = {}
+    for config_key, plugin_classes in file_classes:
+        result = _file_result(hash_json(project.style_dict[config_key]), project.file_info(config_key), plugin_classes)
+        if not result:
+            continue
+        violations = state.reusable(config_key, result)
+        if violations is None:
+            current[config_key] = result
+        else:
+            logger.debug(f"{config_key}: Reusing the violations of the previous run")
+            reused[config_key] = [Fuss(**violation) for violation in violations]
+    return current, reused
+
+
+def _file_result(expected_hash: str, info: FileInfo, plugin_classes: list[type[NitpickPlugin]]) -> FileResult | None:
+    """Hashes of a configured file, to compare with the previous run; None if a plugin opted out."""
+    if not plugin_classes:
+        return None
+    fingerprints = []
+    for plugin_class in plugin_classes:
+        fingerprint = plugin_class.fingerprint(info)
+        if fingerprint is None:
+            logger.debug(f"{info.path_from_root} ({plugin_class.__name__}): Incremental check disabled by the plugin")
+            return None
+        fingerprints.append(f"{plugin_class.__module__}.{plugin_class.__qualname__}:{fingerprint}")
+    contents = info.project.snapshot.read_bytes(info.path_from_root)
+    return FileResult(expected_hash, hash_bytes(contents), hash_text(*fingerprints))
+
+
 def confirm_project_root(dir_: PathOrStr | None = None) -> Path:
     """Confirm this is the root dir of the project (the one that has one of the ``ROOT_FILES``)."""
     possible_root_dir = Path(dir_ or Path.cwd()).resolve()
@@ -216,6 +367,8 @@ class ToolNitpickSectionSchema(BaseNitpickSchema):
     style = PolyField(deserialization_schema_selector=fields.string_or_list_field)
     cache = fields.NonEmptyString()
     ignore_styles = fields.List(fields.NonEmptyString())
+    fetch_workers = fields.PositiveInteger()
+    cache_backend = fields.String(validate=OneOf([backend.value for backend in CacheBackendEnum]))
 
 
 @dataclass
@@ -228,6 +381,8 @@ class Configuration:
     styles: items.Array
     dont_suggest: items.Array
     cache: str
+    fetch_workers: int = FETCH_WORKERS_DEFAULT
+    cache_backend: CacheBackendEnum = CacheBackendEnum.SQLITE
 
 
 class Project:
@@ -235,15 +390,26 @@ class Project:
 
     __repr__ = autorepr(["_chosen_root", "root"])
 
-    _plugin_manager: PluginManager
+    _plugin_registry: PluginRegistry
     _confirmed_root: Path
-
-    def __init__(self, root: PathOrStr | None = None) -> None:
+    _snapshot: ProjectSnapshot
+
+    def __init__(
+        self,
+        root: PathOrStr | None = None,
+        plugin_registry: PluginRegistry | None = None,
+        shared_cache_dir: Path | None = None,
+    ) -> None:
         self._chosen_root = root
+        #: Style cache dir shared with other projects, chosen by the caller (e.g. the batch runner).
+        self.shared_cache_dir = shared_cache_dir
+        if plugin_registry is not None:
+            self._plugin_registry = plugin_registry
 
         self.style_dict: JsonDict = {}
         self.nitpick_section: JsonDict = {}
         self.nitpick_files_section: JsonDict = {}
+        self._file_infos: dict[str, FileInfo] = {}
 
     @property
     def root(self) -> Path:
@@ -254,16 +420,72 @@ class Project:
             root = self._confirmed_root = confirm_project_root(self._chosen_root)
         return root
 
+    @property
+    def cache_dir(self) -> Path:
+        """Cache dir of the project."""
+        return self.root / CACHE_DIR_NAME / PROJECT_NAME
+
+    @property
+    def styles_cache_dir(self) -> Path:
+        """Directory of the remote style cache: the project cache dir, or the cache dir shared by all projects."""
+        return styles_cache_dir(self.cache_dir, self.shared_cache_dir)
+
+    @property
+    def plugin_registry(self) -> PluginRegistry:
+        """Registry of the installed plugins; they are imported only when needed."""
+        try:
+            registry = self._plugin_registry
+        except AttributeError:
+            registry = self._plugin_registry = PluginRegistry()
+        return registry
+
     @property
     def plugin_manager(self) -> PluginManager:
-        """Load all defined plugins."""
+        """Plugin manager with all plugins registered; all plugin modules are imported.
+
+        Kept for compatibility: Nitpick uses [plugin_registry][nitpick.core.Project.plugin_registry],
+        which imports only the plugins that handle the files of the style.
+        """
+        return self.plugin_registry.register_all()
+
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Files of the project read during this run; they are read and parsed once, and shared by the plugins."""
         try:
-            manager = self._plugin_manager
+            snapshot = self._snapshot
         except AttributeError:
-            manager = self._plugin_manager = PluginManager(PROJECT_NAME)
-            manager.add_hookspecs(plugins)
-            manager.load_setuptools_entrypoints(PROJECT_NAME)
-        return manager
+            snapshot = self._snapshot = ProjectSnapshot(self.root)
+        return snapshot
+
+    def file_info(self, path_from_root: str) -> FileInfo:
+        """Info of a file configured in the style; its clean path and tags are computed once per run.
+
+        The same keys are validated for each included style, and then enforced.
+        """
+        info = self._file_infos.get(path_from_root)
+        if info is None:
+            info = self._file_infos[path_from_root] = FileInfo.create(self, path_from_root)
+        return info
+
+    def forget_file_infos(self, paths_from_root: Iterable[str]) -> None:
+        """Forget the info of files that changed (e.g. created or removed); it's computed again when needed."""
+        for path_from_root in paths_from_root:
+            self._file_infos.pop(path_from_root, None)
+
+    @property
+    def results_path(self) -> Path:
+        """Results of the previous incremental check, in the cache dir."""
+        return self.cache_dir / RESULTS_STATE_NAME
+
+    def read_results(self) -> ResultsState:
+        """Read the results of the previous incremental check; they are discarded if the merged style changed."""
+        key = hash_text(hash_json(self.style_dict), self.plugins_fingerprint)
+        return ResultsState.read(self.results_path, key)
+
+    @property
+    def plugins_fingerprint(self) -> str:
+        """Hash of the Nitpick version, the installed plugin classes and the distributions that provide them."""
+        return self.plugin_registry.fingerprint
 
     def config_file_or_default(self) -> Path:
         """Return a config file if found, or the default one."""
@@ -326,34 +548,104 @@ class Project:
         if ignored_styles is None:
             ignored_styles = tomlkit.array()
 
-        return Configuration(config_file, doc, table, existing_styles, ignored_styles, table.get("cache", ""))
+        return Configuration(
+            config_file,
+            doc,
+            table,
+            existing_styles,
+            ignored_styles,
+            table.get("cache", ""),
+            int(table.get(CONFIG_KEY_FETCH_WORKERS, FETCH_WORKERS_DEFAULT)),
+            CacheBackendEnum(table.get(CONFIG_KEY_CACHE_BACKEND, CacheBackendEnum.SQLITE.value)),
+        )
 
     def merge_styles(self, offline: bool) -> Iterator[Fuss]:
         """Merge one or multiple style files."""
+        # Files might have been created or removed since the last run (e.g. in watch mode)
+        self._file_infos.clear()
+        self.snapshot.clear()
         config = self.read_configuration()
-        style = StyleManager(self, offline, config.cache)
+        style = self._merging_style_manager(offline, config)
         base = config.file.expanduser().resolve().as_uri()
-        style_errors = list(style.find_initial_styles(list(always_iterable(config.styles)), base))
-        if style_errors:
-            raise QuitComplainingError(style_errors)
+        initial_style_urls = style.initial_style_urls(list(always_iterable(config.styles)), base)
 
-        self.style_dict = style.merge_toml_dict()
+        snapshot = style.load_snapshot(initial_style_urls)
+        if snapshot is not None:
+            self.style_dict = snapshot
+        else:
+            style_errors = list(style.find_initial_styles(initial_style_urls))
+            if style_errors:
+                raise QuitComplainingError(style_errors)
 
-        from nitpick.flake8 import NitpickFlake8Extension  # pylint: disable=import-outside-toplevel  # noqa: PLC0415
+            self.style_dict = style.merge_toml_dict()
 
         minimum_version = search_json(self.style_dict, JMEX_NITPICK_MINIMUM_VERSION, None)
         logger.debug(f"Minimum version: {minimum_version}")
-        if minimum_version and parse_version(NitpickFlake8Extension.version) < parse_version(minimum_version):
+        if minimum_version and parse_version(__version__) < parse_version(minimum_version):
             yield Reporter().make_fuss(
                 ProjectViolations.MINIMUM_VERSION,
                 project=PROJECT_NAME,
                 expected=minimum_version,
-                actual=NitpickFlake8Extension.version,
+                actual=__version__,
             )
 
         self.nitpick_section = self.style_dict.get("nitpick", {})
         self.nitpick_files_section = self.nitpick_section.get("files", {})
 
+    def _merging_style_manager(self, offline: bool, config: Configuration) -> StyleManager:
+        """Reuse the style manager of the previous merge (e.g. in watch mode), while its options are the same.
+
+        Its HTTP session, plugin classes and dynamic schema are kept in memory; the styles are merged again.
+        """
+        options = (offline, config.cache, config.fetch_workers, config.cache_backend, stat_validator(self.lock_path))
+        try:
+            previous_options, style = self._merging
+        except AttributeError:
+            previous_options = style = None
+        if style is None or previous_options != options:
+            style = self.style_manager(offline, config)
+            self._merging = options, style
+        else:
+            style.reset()
+        return style
+
+    def local_style_paths(self) -> list[Path]:
+        """Local files of the styles included on the last merge."""
+        try:
+            _, style = self._merging
+        except AttributeError:
+            return []
+        return style.local_style_paths()
+
+    @property
+    def lock_path(self) -> Path:
+        """Lock file of the remote styles."""
+        return self.root / NITPICK_LOCK
+
+    def style_manager(
+        self, offline: bool, config: Configuration | None = None, *, locking: bool = False
+    ) -> StyleManager:
+        """Create a style manager with the cache options of the configuration file."""
+        config = config or self.read_configuration()
+        return StyleManager(
+            self, offline, config.cache, config.fetch_workers, locking=locking, cache_backend=config.cache_backend
+        )
+
+    def lock_styles(self) -> StyleLock:
+        """Resolve the include tree of the configured styles to immutable addresses, and write the lock file."""
+        config = self.read_configuration()
+        style = self.style_manager(False, config, locking=True)
+        base = config.file.expanduser().resolve().as_uri()
+        initial_style_urls = style.initial_style_urls(list(always_iterable(config.styles)), base)
+
+        style_errors = list(style.find_initial_styles(initial_style_urls))
+        if style_errors:
+            raise QuitComplainingError(style_errors)
+
+        lock = style.style_lock()
+        lock.write(self.lock_path)
+        return lock
+
     def suggest_styles(self, library_path_str: PathOrStr | None) -> list[str]:
         """Suggest styles based on the files in the project root (skipping Git ignored files)."""
         all_tags: set[str] = {ANY_BUILTIN_STYLE}
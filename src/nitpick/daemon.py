@@ -0,0 +1,225 @@
+"""Daemon mode: keep a warm Nitpick process for a project root, and run the commands of the thin client.
+
+The modules, the plugin manager and the style manager (with its HTTP session and dynamic schema)
+stay in memory between commands; see [the client][nitpick.client] for the protocol.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socketserver
+import subprocess  # nosec
+import sys
+import time
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import click
+from loguru import logger
+
+from nitpick import __version__
+from nitpick.client import ENV_VAR_PREFIX, FORWARDED_COMMANDS, nitpick_environ, ping, send, socket_path
+from nitpick.constants import PROJECT_NAME, CacheEnvVarEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import timedelta
+
+    from nitpick.core import Nitpick
+
+#: Seconds to wait for a daemon started in the background to accept connections.
+START_TIMEOUT = 30
+
+
+def _reply(wfile: BinaryIO, **message: Any) -> None:
+    wfile.write(json.dumps(message).encode() + b"\n")
+    wfile.flush()
+
+
+@contextmanager
+def _client_environ(env: dict[str, str]) -> Iterator[None]:
+    """Replace the Nitpick environment variables of the daemon with the ones of the client, while a command runs."""
+    original = nitpick_environ()
+    try:
+        _replace_nitpick_environ({key: value for key, value in env.items() if key.startswith(ENV_VAR_PREFIX)})
+        yield
+    finally:
+        _replace_nitpick_environ(original)
+
+
+def _replace_nitpick_environ(env: dict[str, str]) -> None:
+    for key in nitpick_environ():
+        del os.environ[key]
+    os.environ.update(env)
+
+
+class _MessageWriter(io.RawIOBase):
+    """Send everything written on a stream (stdout or stderr of a command) as messages to the client."""
+
+    def __init__(self, wfile: BinaryIO, key: str) -> None:
+        super().__init__()
+        self.wfile = wfile
+        self.key = key
+
+    def writable(self) -> bool:
+        """The stream is writable."""
+        return True
+
+    def write(self, data) -> int:
+        """Send the data to the client."""
+        _reply(self.wfile, **{self.key: bytes(data).decode("utf-8", errors="replace")})
+        return len(data)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Read one request of the client, and stream back the response."""
+
+    server: DaemonServer
+
+    def handle(self) -> None:
+        """Handle the request."""
+        line = self.rfile.readline()
+        if line:
+            self.server.respond(json.loads(line), self.wfile)
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Run the commands of the thin client on a warm Nitpick instance, one at a time.
+
+    :param nit: Nitpick instance initialised for the project root.
+    :param idle_timeout: Stop after this time without commands; None to run until stopped.
+    """
+
+    def __init__(self, nit: Nitpick, idle_timeout: timedelta | None = None) -> None:
+        self.nit = nit
+        self.timeout = idle_timeout.total_seconds() if idle_timeout else None
+        self.path = socket_path(nit.project.root)
+        self.started = time.time()
+        self.stopping = False
+        #: The style cache was configured with these environment variables when the daemon started.
+        self.cache_environ = self._cache_environ(nitpick_environ())
+        if ping(nit.project.root):
+            msg = f"A daemon is already running for {nit.project.root}"
+            raise RuntimeError(msg)
+        # A daemon that was killed leaves its socket behind
+        self.path.unlink(missing_ok=True)
+        super().__init__(os.fspath(self.path), DaemonRequestHandler)
+
+    def serve(self) -> None:
+        """Handle requests until the daemon is stopped, or until the idle timeout expires."""
+        logger.info(f"Daemon listening on {self.path}")
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            self.path.unlink(missing_ok=True)
+
+    def handle_timeout(self) -> None:
+        """Stop the daemon when it's idle."""
+        logger.info("Daemon stopped: idle timeout")
+        self.stopping = True
+
+    @staticmethod
+    def _cache_environ(env: dict[str, str]) -> dict[str, str]:
+        return {var.as_envvar(): env.get(var.as_envvar(), "") for var in CacheEnvVarEnum}
+
+    def status(self) -> dict[str, Any]:
+        """Status of the daemon."""
+        return {"pid": os.getpid(), "version": __version__, "root": str(self.nit.project.root), "started": self.started}
+
+    def respond(self, request: dict[str, Any], wfile: BinaryIO) -> None:
+        """Respond to a request of the client.
+
+        Commands from another version of Nitpick (or unknown commands) get an empty exit code;
+        the client runs them in its own process.
+        The same happens when the client configures another shared style cache than the warm one of the daemon.
+        """
+        if request.get("ping"):
+            _reply(wfile, **self.status())
+        elif request.get("stop"):
+            self.stopping = True
+            _reply(wfile, exit=0)
+        elif request.get("version") != __version__ or request.get("command") not in FORWARDED_COMMANDS:
+            logger.warning(f"Request not handled: {request}")
+            _reply(wfile, exit=None)
+        elif self._cache_environ(request.get("env", {})) != self.cache_environ:
+            logger.warning(f"Request not handled, the client has another style cache: {request}")
+            _reply(wfile, exit=None)
+        else:
+            _reply(wfile, exit=self.run_command(request, wfile))
+
+    def run_command(self, request: dict[str, Any], wfile: BinaryIO) -> int:
+        """Run a command of the CLI in the current dir and environment of the client, sending its output to the client."""
+        # pylint: disable=import-outside-toplevel
+        from nitpick.cli import nitpick_cli  # noqa: PLC0415
+
+        args = [*(["--offline"] if request.get("offline") else []), request["command"], *request.get("args", [])]
+        logger.info(f"Running command: {args}")
+        out, err = (io.TextIOWrapper(_MessageWriter(wfile, key), write_through=True) for key in ("out", "err"))
+        current_dir = Path.cwd()
+        try:
+            os.chdir(request.get("cwd") or current_dir)
+            with _client_environ(request.get("env", {})), redirect_stdout(out), redirect_stderr(err):
+                try:
+                    return (
+                        nitpick_cli.main(
+                            args,
+                            prog_name=PROJECT_NAME,
+                            standalone_mode=False,
+                            auto_envvar_prefix=PROJECT_NAME,
+                            obj=self.nit,
+                            color=bool(request.get("color")),
+                        )
+                        or 0
+                    )
+                except click.ClickException as error:
+                    error.show()
+                    return error.exit_code
+        except Exception as error:  # pylint: disable=broad-exception-caught # noqa: BLE001
+            logger.exception("Command failed")
+            err.write(f"The Nitpick daemon failed to run the command: {error!r}\n")
+            return 2
+        finally:
+            os.chdir(current_dir)
+
+
+def log_path(root: Path) -> Path:
+    """Log file of the daemon started in the background, next to its socket."""
+    return socket_path(root).with_suffix(".log")
+
+
+def start_daemon(root: Path, offline: bool, idle_timeout: timedelta, verbose: int) -> dict[str, Any] | None:
+    """Start a daemon for the project root in the background; its logs are written in ``log_path(root)``.
+
+    :return: The status of the daemon, once it accepts connections; None if it failed to start.
+    """
+    args = [sys.executable, "-m", PROJECT_NAME, "--project", str(root)]
+    if offline:
+        args.append("--offline")
+    args.extend(["daemon", "run", "--idle-timeout", f"{int(idle_timeout.total_seconds() // 60)} minutes"])
+    if verbose:
+        args.append(f"-{'v' * verbose}")
+    with log_path(root).open("a", encoding="utf-8") as log:
+        process = subprocess.Popen(  # noqa: S603 # nosec
+            args, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline and process.poll() is None:
+        status = ping(root)
+        if status:
+            return status
+        time.sleep(0.05)
+    return None
+
+
+def stop_daemon(root: Path) -> bool:
+    """Stop the daemon of the project root; return False if it wasn't running."""
+    try:
+        return any(message.get("exit") == 0 for message in send(root, {"stop": True}))
+    except OSError:
+        return False
@@ -4,7 +4,7 @@ import json
 
 from marshmallow import ValidationError, fields
 from marshmallow.fields import URL, Dict, Field, List, Nested, String
-from marshmallow.validate import Length
+from marshmallow.validate import Length, Range
 from more_itertools import always_iterable
 
 from nitpick.constants import DOT
@@ -41,6 +41,15 @@ class NonEmptyString(fields.String):
         super().__init__(validate=validate, **kwargs)
 
 
+class PositiveInteger(fields.Integer):
+    """An integer field that must be greater than zero."""
+
+    def __init__(self, **kwargs) -> None:
+        validate = list(always_iterable(kwargs.pop("validate", None)))
+        validate.append(Range(min=1))
+        super().__init__(strict=True, validate=validate, **kwargs)
+
+
 class JsonString(fields.String):
     """A string field with valid JSON content."""
 
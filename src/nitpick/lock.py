@@ -0,0 +1,82 @@
+"""Lock file with the remote styles resolved to immutable addresses, written by ``nitpick lock``."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field, fields
+from typing import TYPE_CHECKING
+
+import tomlkit
+from tomlkit.exceptions import TOMLKitError
+
+from nitpick.cache import write_atomically
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+LOCK_FORMAT = 1
+LOCK_HEADER = 'Generated by "nitpick lock". Don\'t edit this file manually; run "nitpick lock" again to update it.'
+
+
+@dataclass(frozen=True)
+class LockedStyle:
+    """A style pinned to an immutable address.
+
+    :param url: Normalized URL of the style, as it's configured or included.
+    :param pinned: URL pinned to a Git commit; the same as ``url`` when the style can't be pinned (e.g. plain HTTP).
+    :param sha256: Hash of the contents of the style.
+    """
+
+    url: str
+    pinned: str
+    sha256: str
+
+
+LOCKED_STYLE_KEYS = {locked_field.name for locked_field in fields(LockedStyle)}
+
+
+@dataclass()
+class StyleLock:
+    """All the locked styles of a project, by URL."""
+
+    styles: dict[str, LockedStyle] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, path: Path) -> StyleLock | None:
+        """Read a lock file; None if it doesn't exist.
+
+        :raises ValueError: If the lock file is invalid.
+        """
+        try:
+            text = path.read_text(encoding="UTF-8")
+        except FileNotFoundError:
+            return None
+        try:
+            data = tomlkit.parse(text).unwrap()
+        except TOMLKitError as err:
+            raise ValueError(str(err)) from err
+        if data.get("version") != LOCK_FORMAT:
+            msg = f"Unsupported version {data.get('version')!r}, expected {LOCK_FORMAT}"
+            raise ValueError(msg)
+        styles = {}
+        for item in data.get("style", []):
+            if not isinstance(item, dict) or set(item) != LOCKED_STYLE_KEYS:
+                msg = f"Each style should have the keys {', '.join(sorted(LOCKED_STYLE_KEYS))}"
+                raise ValueError(msg)
+            style = LockedStyle(**item)
+            styles[style.url] = style
+        return cls(styles)
+
+    def write(self, path: Path) -> None:
+        """Write the lock file, with the styles sorted by URL."""
+        doc = tomlkit.document()
+        doc.add(tomlkit.comment(LOCK_HEADER))
+        doc.add("version", LOCK_FORMAT)
+        styles = tomlkit.aot()
+        for url in sorted(self.styles):
+            styles.append(tomlkit.item(asdict(self.styles[url])))
+        doc.add("style", styles)
+        write_atomically(path, tomlkit.dumps(doc))
+
+    def get(self, url: str) -> LockedStyle | None:
+        """Return the locked style for this URL, if any."""
+        return self.styles.get(url)
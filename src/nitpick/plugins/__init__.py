@@ -33,6 +33,10 @@ def plugin_class() -> type[NitpickPlugin]:  # type: ignore[empty-body]
 def can_handle(info: FileInfo) -> type[NitpickPlugin] | None:  # pylint: disable=unused-argument
     """Return a valid [NitpickPlugin][] instance or `None`.
 
+    Plugin modules are imported lazily, and plugin classes are found by their `identify_tags` and `filename`
+    without calling this hook. It's only called if `dispatch_by_tags` is `False` on your plugin class
+    (or if it has no tags and no file name), and only for the files that might match them.
+
     :return: A plugin instance if your plugin handles this file info (path or any of its `identify` tags).
         Return `None` if your plugin doesn't handle this file or file type.
     """
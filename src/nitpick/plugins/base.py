@@ -47,6 +47,10 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
     #: Which `identify` tags this [NitpickPlugin][] child recognises.
     identify_tags: ClassVar[set[str]] = set()
 
+    #: Find this plugin by its `identify_tags` (or its `filename`) in an index, without calling its `can_handle()` hook.
+    #: Set it to `False` if the hook has custom logic.
+    dispatch_by_tags: ClassVar[bool] = True
+
     skip_empty_suggestion = False
 
     def __init__(self, info: FileInfo, expected_config: JsonDict, autofix=False) -> None:
@@ -57,6 +61,7 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
         self.file_path: Path = self.info.project.root / self.filename
 
         # Configuration for this file as a TOML dict, taken from the style file.
+        # It's the dict of the merged style, shared by all plugins of the file: read it, don't change it.
         self.expected_config: JsonDict = expected_config or {}
 
         self.autofix = self.fixable and autofix
@@ -72,17 +77,29 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
 
         # The user can override the default list keys (if any) by setting them on the style file.
         # pylint: disable=assigning-non-slot,no-member
-        spc.list_keys.from_style = self.expected_config.pop(CONFIG_DUNDER_LIST_KEYS, None) or {}
+        spc.list_keys.from_style = self.expected_config.get(CONFIG_DUNDER_LIST_KEYS) or {}
         temp_dict.update(flatten_quotes(spc.list_keys.from_style))
-
-        flat_config = flatten_quotes(self.expected_config)
+        if CONFIG_DUNDER_LIST_KEYS in self.expected_config:
+            # A shallow copy without the special key; the merged style is kept intact
+            self.expected_config = {
+                key: value for key, value in self.expected_config.items() if key != CONFIG_DUNDER_LIST_KEYS
+            }
 
         for key_with_pattern, parent_child_keys in temp_dict.items():
-            for expanded_key in fnmatch.filter(flat_config.keys(), key_with_pattern):
+            for expanded_key in fnmatch.filter(self.flat_expected_config.keys(), key_with_pattern):
                 spc.list_keys.value[expanded_key] = parent_child_keys
+                # Compile the expressions once, instead of once per comparison
+                spc.list_key(expanded_key)
 
         self.special_config = spc
 
+    @property
+    def flat_expected_config(self) -> JsonDict:
+        """Flattened expected config; it's flattened once per run, and shared by the plugins of the same file."""
+        if self.info.flat_expected_config is None:
+            self.info.flat_expected_config = flatten_quotes(self.expected_config)
+        return self.info.flat_expected_config
+
     def predefined_special_config(self) -> SpecialConfig:
         """Create a predefined special configuration for this plugin.
 
@@ -100,7 +117,7 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
         self.post_init()
 
         should_exist: bool = bool(self.info.project.nitpick_files_section.get(self.filename, True))
-        if self.file_path.exists() and not should_exist:
+        if self.info.project.snapshot.exists(self.filename) and not should_exist:
             logger.info(f"{self}: File {self.filename} exists when it should not")
             # Only display this message if the style is valid.
             yield self.reporter.make_fuss(SharedViolations.DELETE_FILE)
@@ -113,7 +130,7 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
         yield from self._enforce_file_configuration()
 
     def _enforce_file_configuration(self):
-        file_exists = self.file_path.exists()
+        file_exists = self.info.project.snapshot.exists(self.filename)
         if file_exists:
             logger.info(f"{self}: Enforcing rules")
             yield from self.enforce_rules()
@@ -125,6 +142,18 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
             if fuss:
                 yield fuss
 
+    @classmethod
+    def fingerprint(cls, info: FileInfo) -> str | None:  # noqa: ARG003
+        """Anything besides the file contents and its expected config that changes the violations of this plugin.
+
+        Incremental checks (``nitpick check --incremental``) reuse the violations of the previous run
+        while the file, its expected config and the fingerprints of its plugins don't change;
+        the plugin is only created if the file is enforced again.
+        Override this method if the plugin also reads other files or settings; return None to opt out,
+        and always enforce the file.
+        """
+        return ""
+
     def post_init(self):  # noqa: B027
         """Hook for plugin initialization after the instance was created.
 
@@ -169,6 +198,5 @@ class NitpickPlugin(metaclass=abc.ABCMeta):  # pylint: disable=too-many-instance
 
         formatted_str = doc_class(obj=expected_dict).reformatted
         if self.autofix:
-            self.file_path.parent.mkdir(exist_ok=True, parents=True)
-            self.file_path.write_text(formatted_str)
+            self.info.project.snapshot.write_text(self.filename, formatted_str)
         return formatted_str
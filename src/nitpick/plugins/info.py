@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import TYPE_CHECKING
 
 from identify import identify
@@ -13,6 +12,7 @@ from nitpick.exceptions import Deprecation
 
 if TYPE_CHECKING:
     from nitpick.core import Project
+    from nitpick.typedefs import JsonDict
 
 
 @dataclass
@@ -22,18 +22,24 @@ class FileInfo:
     project: Project
     path_from_root: str
     tags: set[str] = field(default_factory=set)
+    #: Flattened expected config of the file, shared by its plugins during a run.
+    flat_expected_config: JsonDict | None = field(default=None, compare=False, repr=False)
+
+    @staticmethod
+    def clean_path(path_from_root: str) -> str:
+        """Clean the file name of a style key (e.g. a pre-commit config without the dot)."""
+        if Deprecation.pre_commit_without_dash(path_from_root):
+            return DOT + path_from_root
+        return DOT + path_from_root[1:] if path_from_root.startswith("-") else path_from_root
 
     @classmethod
     def create(cls, project: Project, path_from_root: str) -> FileInfo:
         """Clean the file name and get its tags."""
-        if Deprecation.pre_commit_without_dash(path_from_root):
-            clean_path = DOT + path_from_root
-        else:
-            clean_path = DOT + path_from_root[1:] if path_from_root.startswith("-") else path_from_root
+        clean_path = cls.clean_path(path_from_root)
 
         # When we run identify on the actual file we get better tags
-        if Path(clean_path).exists():
-            tags = set(identify.tags_from_path(clean_path))
+        if project.snapshot.exists(clean_path):
+            tags = set(identify.tags_from_path(str(project.root / clean_path)))
         else:
             tags = set(identify.tags_from_filename(clean_path))
 
@@ -99,17 +99,18 @@ class IniPlugin(NitpickPlugin):
         """Missing sections."""
         return self.expected_sections - self.current_sections
 
-    def write_file(self, file_exists: bool) -> Fuss | None:
+    def write_file(self, file_exists: bool) -> Fuss | None:  # pylint: disable=unused-argument # noqa: ARG002
         """Write the new file."""
         try:
             if self.needs_top_section:
-                self.file_path.write_text(self.contents_without_top_section(str(self.updater)))
+                self.info.project.snapshot.write_text(
+                    self.filename, self.contents_without_top_section(str(self.updater))
+                )
                 return None
 
-            if file_exists:
-                self.updater.update_file()
-            else:
-                self.updater.write(self.file_path.open("w"))
+            # Validate before writing, like ConfigUpdater.update_file() does; the file was read from a string
+            self.updater.validate_format()
+            self.info.project.snapshot.write_text(self.filename, str(self.updater))
         except ParsingError as err:
             return self.reporter.make_fuss(Violations.PARSING_ERROR, cls=err.__class__.__name__, msg=err)
         return None
@@ -162,11 +163,11 @@ class IniPlugin(NitpickPlugin):
     def _read_file(self) -> Iterator[Fuss]:
         """Read the .ini file or special files like .editorconfig."""
         parsing_err: Error | None = None
+        original_contents = self.info.project.snapshot.read_text(self.filename)
         try:
-            self.updater.read(str(self.file_path))
+            self.updater.read_string(original_contents, str(self.file_path))
         except MissingSectionHeaderError as err:
             if self.needs_top_section:
-                original_contents = self.file_path.read_text()
                 self.updater.read_string(f"[{TOP_SECTION}]\n{original_contents}")
                 return
 
@@ -47,7 +47,7 @@ class JsonPlugin(NitpickPlugin):
 
     def enforce_rules(self) -> Iterator[Fuss]:
         """Enforce rules for missing keys and JSON content."""
-        json_doc = JsonDoc(path=self.file_path)
+        json_doc = self.info.project.snapshot.doc(self.filename, JsonDoc)
         blender: JsonDict = json_doc.as_object.copy() if self.autofix else {}
 
         comparison = Comparison(json_doc, self.expected_dict_from_contains_keys(), self.special_config)()
@@ -62,7 +62,7 @@ class JsonPlugin(NitpickPlugin):
             )
 
         if self.autofix and self.dirty and blender:
-            self.file_path.write_text(JsonDoc(obj=unflatten_quotes(blender)).reformatted)
+            self.info.project.snapshot.write_text(self.filename, JsonDoc(obj=unflatten_quotes(blender)).reformatted)
 
     def expected_dict_from_contains_keys(self):
         """Expected dict created from "contains_keys" values."""
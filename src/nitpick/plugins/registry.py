@@ -0,0 +1,334 @@
+"""Lazy registry of the plugins installed as ``nitpick`` entry points.
+
+The entry points are discovered once per environment, and the plugin classes they declare
+(their ``identify_tags`` and ``filename``) are kept in a manifest file in the user cache dir;
+each Python environment (e.g. a virtualenv, a tox env or the pre-commit env) has its own manifest.
+With the manifest, a plugin module is only imported when a file of the style needs it.
+The plugin classes of a file are found in an index by tag and by file name, instead of calling the hooks of all plugins.
+"""
+
+from __future__ import annotations
+
+import importlib.metadata
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from pluggy import PluginManager
+
+from nitpick import __version__, plugins
+from nitpick.cache import hash_text, stat_validator, user_cache_dir, write_atomically
+from nitpick.constants import PROJECT_NAME
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import ModuleType
+
+    from nitpick.plugins.base import NitpickPlugin
+    from nitpick.plugins.info import FileInfo
+
+#: Name of the plugins manifest; each Python environment has its own, named after a hash of its ``sys.prefix``.
+PLUGINS_MANIFEST_NAME = "plugins-{}.json"
+
+#: Bump this when the format of the plugins manifest changes.
+PLUGINS_MANIFEST_FORMAT = 2
+
+#: Directories of ``sys.path`` where distributions are installed; their state is part of the manifest key.
+SITE_DIR_NAMES = {"site-packages", "dist-packages"}
+
+
+def qualified_name(plugin_class: type[NitpickPlugin]) -> str:
+    """Module and qualified name of a plugin class."""
+    return f"{plugin_class.__module__}.{plugin_class.__qualname__}"
+
+
+def manifest_name() -> str:
+    """Name of the plugins manifest of the current Python environment."""
+    return PLUGINS_MANIFEST_NAME.format(hash_text(sys.prefix)[:16])
+
+
+def environment_key() -> str:
+    """Hash of the Python version, the Nitpick version and the state of the site-packages dirs.
+
+    Installing, upgrading or removing a distribution changes the modification time of its site-packages dir.
+    """
+    site_dirs = [path for path in sys.path if Path(path).name in SITE_DIR_NAMES]
+    return hash_text(
+        str(PLUGINS_MANIFEST_FORMAT),
+        sys.version,
+        __version__,
+        *(f"{path}:{stat_validator(Path(path))}" for path in site_dirs),
+    )
+
+
+@dataclass
+class PluginDeclaration:
+    """A plugin class, as declared in the manifest.
+
+    A plugin handles the files that have one of its ``identify_tags``, or the file with its ``filename``.
+    A plugin without tags and without a file name might handle any file.
+    """
+
+    name: str
+    identify_tags: list[str] = field(default_factory=list)
+    filename: str = ""
+    dispatch_by_tags: bool = True
+
+    @classmethod
+    def create(cls, plugin_class: type[NitpickPlugin]) -> PluginDeclaration:
+        """Declaration of a plugin class."""
+        return cls(
+            qualified_name(plugin_class),
+            sorted(plugin_class.identify_tags),
+            plugin_class.filename,
+            plugin_class.dispatch_by_tags,
+        )
+
+    @property
+    def indexed(self) -> bool:
+        """Check if the plugin is found by its tags or file name, without calling its ``can_handle()`` hook."""
+        return self.dispatch_by_tags and bool(self.identify_tags or self.filename)
+
+    def might_handle(self, info: FileInfo) -> bool:
+        """Could the plugin handle this file? The ``can_handle()`` hook of the plugin has the final say."""
+        if not self.identify_tags and not self.filename:
+            return True
+        return bool(info.tags.intersection(self.identify_tags)) or self.filename == info.path_from_root
+
+
+@dataclass
+class PluginEntry:
+    """A ``nitpick`` entry point, its distribution and the plugin classes of its module.
+
+    :param origin: File of the plugin module; when it changes, the plugin classes are declared again.
+    """
+
+    name: str
+    value: str
+    distribution: str
+    origin: str = ""
+    validator: str | None = None
+    classes: list[PluginDeclaration] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PluginEntry:
+        """Entry read from the manifest."""
+        fields = {**data, "classes": [PluginDeclaration(**declaration) for declaration in data["classes"]]}
+        return cls(**fields)
+
+    def is_current(self) -> bool:
+        """Check if the plugin module is the same as when the manifest was written."""
+        return stat_validator(Path(self.origin)) == self.validator if self.origin else True
+
+    def might_handle(self, info: FileInfo) -> bool:
+        """Check if one of the plugin classes might handle this file."""
+        return any(declaration.might_handle(info) for declaration in self.classes)
+
+
+@dataclass
+class PluginIndex:
+    """Plugin classes by identify tag and by fixed file name, built once from the entry points.
+
+    :param positions: Position of the entry point of each plugin class, to sort plugin classes.
+    :param hook_entries: Entry points with plugin classes that are not indexed; their ``can_handle()`` hook is called.
+    """
+
+    tags: dict[str, list[PluginDeclaration]] = field(default_factory=dict)
+    filenames: dict[str, list[PluginDeclaration]] = field(default_factory=dict)
+    entries: dict[str, PluginEntry] = field(default_factory=dict)
+    positions: dict[str, int] = field(default_factory=dict)
+    hook_entries: list[PluginEntry] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, entries: list[PluginEntry]) -> PluginIndex:
+        """Index the plugin classes of the entry points."""
+        index = cls()
+        for position, entry in enumerate(entries):
+            for declaration in entry.classes:
+                index.entries[declaration.name] = entry
+                index.positions[declaration.name] = position
+                if not declaration.indexed:
+                    if entry not in index.hook_entries:
+                        index.hook_entries.append(entry)
+                    continue
+                for tag in declaration.identify_tags:
+                    index.tags.setdefault(tag, []).append(declaration)
+                if declaration.filename:
+                    index.filenames.setdefault(declaration.filename, []).append(declaration)
+        return index
+
+    def lookup(self, info: FileInfo) -> set[str]:
+        """Names of the indexed plugin classes that handle a file: one lookup per tag, and one for the file name."""
+        names = {declaration.name for tag in info.tags for declaration in self.tags.get(tag, ())}
+        names.update(declaration.name for declaration in self.filenames.get(info.path_from_root, ()))
+        return names
+
+    def sort(self, plugin_classes: Iterable[type[NitpickPlugin]]) -> list[type[NitpickPlugin]]:
+        """Sort plugin classes in the order of the hook calls, as if all entry points were registered in order.
+
+        Pluggy calls the last registered plugin first.
+        """
+
+        def _key(plugin_class: type[NitpickPlugin]) -> tuple[int, str]:
+            name = qualified_name(plugin_class)
+            return self.positions.get(name, -1), name
+
+        return sorted(plugin_classes, key=_key, reverse=True)
+
+
+class PluginRegistry:
+    """Plugins installed as entry points, imported and registered on the plugin manager only when needed.
+
+    :param manifest_path: Manifest of the entry points; by default, a file of the current environment
+        in the user cache dir.
+    """
+
+    def __init__(self, manifest_path: Path | None = None) -> None:
+        self._manifest_path = manifest_path
+        self.manager = PluginManager(PROJECT_NAME)
+        self.manager.add_hookspecs(plugins)
+        self._modules: dict[str, ModuleType] = {}
+        self._classes: dict[str, type[NitpickPlugin]] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        """Manifest of the entry points."""
+        return self._manifest_path or user_cache_dir() / manifest_name()
+
+    @property
+    def entries(self) -> list[PluginEntry]:
+        """Entry points read from the manifest; they are discovered again if the environment changed."""
+        try:
+            entries = self._entries
+        except AttributeError:
+            key = environment_key()
+            entries = self._read_manifest(key)
+            if entries is None:
+                entries = self._discover()
+                self._write_manifest(key, entries)
+            self._entries = entries
+        return entries
+
+    @property
+    def index(self) -> PluginIndex:
+        """Index of the plugin classes by tag and by file name."""
+        try:
+            index = self._index
+        except AttributeError:
+            index = self._index = PluginIndex.create(self.entries)
+        return index
+
+    def _read_manifest(self, key: str) -> list[PluginEntry] | None:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="UTF-8"))
+            if data["key"] == key:
+                entries = [PluginEntry.from_dict(entry) for entry in data["entries"]]
+                if all(entry.is_current() for entry in entries):
+                    return entries
+        except (OSError, ValueError, TypeError, KeyError) as err:
+            logger.debug(f"Plugins manifest not used: {err!r}")
+        return None
+
+    def _write_manifest(self, key: str, entries: list[PluginEntry]) -> None:
+        contents = json.dumps({"key": key, "entries": [asdict(entry) for entry in entries]}, indent=2)
+        try:
+            write_atomically(self.manifest_path, contents)
+        except OSError as err:
+            logger.warning(f"Plugins manifest not written: {err}")
+
+    def _discover(self) -> list[PluginEntry]:
+        """Scan the installed distributions, importing all plugin modules to declare their classes."""
+        logger.debug(f"Discovering plugins, manifest: {self.manifest_path}")
+        entries: list[PluginEntry] = []
+        names: set[str] = set()
+        for dist in importlib.metadata.distributions():
+            for entry_point in dist.entry_points:
+                # The first distribution wins, as in pluggy's ``load_setuptools_entrypoints()``
+                if entry_point.group != PROJECT_NAME or entry_point.name in names:
+                    continue
+                names.add(entry_point.name)
+                entry = PluginEntry(entry_point.name, entry_point.value, f"{dist.metadata['name']}=={dist.version}")
+                module = self._import(entry)
+                entry.origin = getattr(module, "__file__", None) or ""
+                entry.validator = stat_validator(Path(entry.origin)) if entry.origin else None
+                entry.classes = [
+                    PluginDeclaration.create(plugin_class) for plugin_class in self._plugin_classes(module)
+                ]
+                entries.append(entry)
+        return entries
+
+    def _import(self, entry: PluginEntry) -> ModuleType:
+        """Import the module of an entry point, and register it on the plugin manager."""
+        module = self._modules.get(entry.name)
+        if module is None:
+            logger.debug(f"Loading plugin {entry.name}: {entry.value}")
+            module = importlib.metadata.EntryPoint(entry.name, entry.value, PROJECT_NAME).load()
+            self.manager.register(module, name=entry.name)
+            self._modules[entry.name] = module
+            for plugin_class in self._plugin_classes(module):
+                self._classes[qualified_name(plugin_class)] = plugin_class
+        return module
+
+    def _plugin_classes(self, module: ModuleType) -> list[type[NitpickPlugin]]:
+        """Plugin classes returned by the ``plugin_class()`` hook of a registered module."""
+        hook_impls = self.manager.hook.plugin_class.get_hookimpls()  # pylint: disable=no-member
+        return [impl.function() for impl in hook_impls if impl.plugin is module]
+
+    def _call_can_handle(self, module: ModuleType, info: FileInfo) -> list[type[NitpickPlugin]]:
+        """Call the ``can_handle()`` hook of a registered module only."""
+        hook_impls = self.manager.hook.can_handle.get_hookimpls()  # pylint: disable=no-member
+        results = (impl.function(**dict.fromkeys(impl.argnames, info)) for impl in hook_impls if impl.plugin is module)
+        return [plugin_class for plugin_class in results if plugin_class]
+
+    def plugin_class(self, name: str) -> type[NitpickPlugin]:
+        """Indexed plugin class, by its qualified name; its module is imported if needed."""
+        self._import(self.index.entries[name])
+        return self._classes[name]
+
+    def can_handle(self, info: FileInfo) -> list[type[NitpickPlugin]]:
+        """Plugin classes that handle a file.
+
+        Indexed plugin classes are found by the tags and name of the file; only their modules are imported.
+        The ``can_handle()`` hook is called for the other plugins that might handle the file.
+        """
+        index = self.index
+        plugin_classes = {self.plugin_class(name) for name in index.lookup(info)}
+        for entry in index.hook_entries:
+            if entry.might_handle(info):
+                plugin_classes.update(self._call_can_handle(self._import(entry), info))
+        return index.sort(plugin_classes)
+
+    def register_all(self) -> PluginManager:
+        """Import all plugin modules, and return the plugin manager where they are registered."""
+        for entry in self.entries:
+            self._import(entry)
+        return self.manager
+
+    def plugin_classes(self) -> list[type[NitpickPlugin]]:
+        """All plugin classes; all plugin modules are imported."""
+        return self.index.sort(self.register_all().hook.plugin_class())  # pylint: disable=no-member
+
+    def fixed_name_classes(self) -> set[type[NitpickPlugin]]:
+        """Plugin classes with a fixed file name; only their plugin modules are imported."""
+        for entry in self.entries:
+            if any(declaration.filename for declaration in entry.classes):
+                self._import(entry)
+        return {
+            plugin_class
+            for plugin_class in self.manager.hook.plugin_class()  # pylint: disable=no-member
+            if plugin_class.filename
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the Nitpick version, the plugin classes and the distributions that provide them."""
+        try:
+            fingerprint = self._fingerprint
+        except AttributeError:
+            plugin_classes = sorted(declaration.name for entry in self.entries for declaration in entry.classes)
+            distributions = sorted(entry.distribution for entry in self.entries)
+            fingerprint = self._fingerprint = hash_text(__version__, *plugin_classes, *distributions)
+        return fingerprint
@@ -76,7 +76,7 @@ class TextPlugin(NitpickPlugin):
     def enforce_rules(self) -> Iterator[Fuss]:
         """Enforce rules for missing lines."""
         expected = OrderedSet(self._expected_lines())
-        actual = OrderedSet(self.file_path.read_text().split("\n"))
+        actual = OrderedSet(self.info.project.snapshot.read_text(self.filename).split("\n"))
         missing = expected - actual
         if missing:
             yield self.reporter.make_fuss(Violations.MISSING_LINES, "\n".join(sorted(missing)))
@@ -37,8 +37,10 @@ class TomlPlugin(NitpickPlugin):
 
     def enforce_rules(self) -> Iterator[Fuss]:
         """Enforce rules for missing key/value pairs in the TOML file."""
-        toml_doc = TomlDoc(path=self.file_path)
-        comparison = Comparison(toml_doc, self.expected_config, self.special_config)()
+        toml_doc = self.info.project.snapshot.doc(self.filename, TomlDoc)
+        comparison = Comparison(
+            toml_doc, self.expected_config, self.special_config, flat_expected=self.flat_expected_config
+        )()
         if not comparison.has_changes:
             return
 
@@ -53,7 +55,7 @@ class TomlPlugin(NitpickPlugin):
             ),
         )
         if self.autofix and self.dirty:
-            self.file_path.write_text(dumps(document))
+            self.info.project.snapshot.write_text(self.filename, dumps(document))
 
     def report(
         self,
@@ -73,8 +73,10 @@ class YamlPlugin(NitpickPlugin):
             # TODO: fix: allow a YAML file with a "contains" key on its root (how?)
             return
 
-        yaml_doc = YamlDoc(path=self.file_path)
-        comparison = Comparison(yaml_doc, self._remove_yaml_subkey(self.expected_config), self.special_config)()
+        yaml_doc = self.info.project.snapshot.doc(self.filename, YamlDoc)
+        expected = self._remove_yaml_subkey(self.expected_config)
+        flat_expected = self.flat_expected_config if expected is self.expected_config else None
+        comparison = Comparison(yaml_doc, expected, self.special_config, flat_expected=flat_expected)()
         if not comparison.has_changes:
             return
 
@@ -89,6 +91,7 @@ class YamlPlugin(NitpickPlugin):
         )
         if self.autofix and self.dirty:
             yaml_doc.updater.dump(yaml_doc.as_object, self.file_path)
+            self.info.project.snapshot.discard(self.filename)
 
     @staticmethod
     def _remove_yaml_subkey(old_config: JsonDict) -> JsonDict:
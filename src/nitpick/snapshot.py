@@ -0,0 +1,134 @@
+"""Files of a project, as seen during one run: each file is read once, and its parsed documents are shared by plugins."""
+
+from __future__ import annotations
+
+import os
+import threading
+from io import StringIO
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, TypeVar
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from nitpick.blender import BaseDoc
+
+DocT = TypeVar("DocT", bound="BaseDoc")
+
+#: Paths with this part can't be resolved with a directory scan of the project.
+PARENT_DIR = ".."
+
+
+class ProjectSnapshot:
+    """Contents of the project files read during a run; it should be cleared before the next run (e.g. in watch mode).
+
+    Existence checks are answered by scanning each directory once, instead of calling ``stat()`` on each file.
+    Plugins that handle the same file share its contents and its parsed documents;
+    a plugin that changes a file should write it with ``write_text()`` or call ``discard()`` after writing it.
+
+    Files of different config keys might be enforced in different threads at the same time:
+    the caches are guarded by a lock, which is not held while files are scanned, read or parsed;
+    concurrent threads at worst scan or read the same path twice, and then share the first result.
+
+    :param root: Root dir of the project.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._dirs: dict[str, dict[str, os.DirEntry]] = {}
+        self._contents: dict[str, bytes | None] = {}
+        self._docs: dict[tuple[str, type[BaseDoc]], BaseDoc] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Forget everything that was scanned, read and parsed; files might have changed since the last run."""
+        with self._lock:
+            self._dirs.clear()
+            self._contents.clear()
+            self._docs.clear()
+
+    def _scan(self, dir_from_root: str) -> dict[str, os.DirEntry]:
+        """Entries of a dir, by name; empty if the dir doesn't exist."""
+        with self._lock:
+            entries = self._dirs.get(dir_from_root)
+        if entries is None:
+            try:
+                with os.scandir(self.root / dir_from_root) as iterator:
+                    entries = {entry.name: entry for entry in iterator}
+            except OSError:
+                entries = {}
+            with self._lock:
+                entries = self._dirs.setdefault(dir_from_root, entries)
+        return entries
+
+    def exists(self, path_from_root: str) -> bool:
+        """Check if a file or dir exists in the project, scanning its parent dirs."""
+        path = PurePosixPath(path_from_root)
+        if not path.parts or path.is_absolute() or PARENT_DIR in path.parts:
+            return (self.root / path_from_root).exists()
+
+        last = len(path.parts) - 1
+        for position, (dir_from_root, name) in enumerate(zip(self._parent_dirs(path), path.parts, strict=False)):
+            entry = self._scan(dir_from_root).get(name)
+            if entry is None:
+                return False
+            # Every part but the last one is a dir, even with the same name as the file (e.g. "docs/docs")
+            if position < last and not entry.is_dir():
+                return False
+        return True
+
+    @staticmethod
+    def _parent_dirs(path: PurePosixPath) -> list[str]:
+        """The root and the parent dirs of a path, as keys of the scanned dirs."""
+        return ["", *(f"{parent.as_posix()}/" for parent in reversed(path.parents[:-1]))]
+
+    def read_bytes(self, path_from_root: str) -> bytes | None:
+        """Contents of a file, read once; None if the file doesn't exist or can't be read."""
+        with self._lock:
+            if path_from_root in self._contents:
+                return self._contents[path_from_root]
+
+        contents: bytes | None = None
+        if self.exists(path_from_root):
+            try:
+                contents = (self.root / path_from_root).read_bytes()
+            except OSError as err:
+                logger.warning(f"{path_from_root}: Can't read the file: {err}")
+        with self._lock:
+            return self._contents.setdefault(path_from_root, contents)
+
+    def read_text(self, path_from_root: str) -> str:
+        """Contents of a UTF-8 file with universal newlines, like :py:meth:`pathlib.Path.read_text`; empty if missing."""
+        contents = self.read_bytes(path_from_root)
+        if contents is None:
+            return ""
+        return StringIO(contents.decode("UTF-8"), newline=None).read()
+
+    def doc(self, path_from_root: str, doc_class: type[DocT]) -> DocT:
+        """Parsed document of a file, shared by all plugins that handle it."""
+        key = (path_from_root, doc_class)
+        with self._lock:
+            doc = self._docs.get(key)
+        if doc is None:
+            parsed = doc_class(string=self.read_text(path_from_root))
+            with self._lock:
+                doc = self._docs.setdefault(key, parsed)
+        return doc  # type: ignore[return-value]
+
+    def write_text(self, path_from_root: str, contents: str) -> None:
+        """Write a file (and its parent dirs); the next reads will get the new contents."""
+        path = self.root / path_from_root
+        path.parent.mkdir(exist_ok=True, parents=True)
+        path.write_text(contents)
+        self.discard(path_from_root)
+
+    def discard(self, path_from_root: str) -> None:
+        """Forget a file that was changed, and the scanned dirs that might have a new entry for it."""
+        with self._lock:
+            self._contents.pop(path_from_root, None)
+            for key in [key for key in self._docs if key[0] == path_from_root]:
+                del self._docs[key]
+            for dir_from_root in self._parent_dirs(PurePosixPath(path_from_root)):
+                self._dirs.pop(dir_from_root, None)
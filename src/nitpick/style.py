@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
 from enum import auto
 from functools import lru_cache
+from http import HTTPStatus
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar, cast
 
@@ -21,36 +30,69 @@ from identify import identify
 from loguru import logger
 from more_itertools import always_iterable, peekable
 from requests import Session
-from requests_cache import CachedSession
+from requests_cache import DO_NOT_CACHE, NEVER_EXPIRE, CachedSession
+from requests_cache.policy.expiration import get_expiration_datetime
 from slugify import slugify
 from strenum import LowercaseStrEnum
 from toml import TomlDecodeError
 
 from nitpick import compat, fields
 from nitpick.blender import SEPARATOR_FLATTEN, TomlDoc, custom_reducer, custom_splitter, search_json
+from nitpick.cache import (
+    CACHE_INDEX_NAME,
+    CONTENT_STORE_DIR_NAME,
+    GITHUB_DEFAULT_BRANCHES_NAME,
+    MERGED_STYLE_FORMAT,
+    PARSED_STYLES_DIR_NAME,
+    CachedResponseStats,
+    ContentStore,
+    GitHubDefaultBranchCache,
+    MergedStyleSnapshot,
+    ParsedStyle,
+    ParsedStyleCache,
+    StyleCacheIndex,
+    create_cache_backend,
+    existing_paths,
+    hash_contents,
+    hash_text,
+    prune_files,
+    shared_cache_max_size,
+    stat_validator,
+    styles_cache_dir,
+    user_cache_dir,
+    write_atomically,
+)
 from nitpick.constants import (
-    CACHE_DIR_NAME,
-    CACHE_EXPIRATION_DEFAULTS,
+    CACHE_MODE_SEPARATORS,
+    CACHE_NOT_FOUND_EXPIRATION,
     DOT,
+    FETCH_WORKERS_DEFAULT,
     GIT_AT_REFERENCE,
+    GIT_CACHE_DIR_NAME,
+    GIT_EXTENSION,
     GITHUB_COM,
     GITHUB_COM_API,
     GITHUB_COM_QUERY_STRING_TOKEN,
     GITHUB_COM_RAW,
+    GITHUB_DEFAULT_BRANCH_TTL,
     JMEX_NITPICK_STYLES_INCLUDE,
     MERGED_STYLE_TOML,
+    NITPICK_LOCK,
     NITPICK_STYLE_TOML,
     PROJECT_NAME,
     PROJECT_OWNER,
     PYTHON_PYPROJECT_TOML,
     REGEX_CACHE_UNIT,
+    REGEX_GIT_COMMIT,
     TOML_EXTENSION,
-    WRITE_STYLE_MAX_ATTEMPTS,
+    CacheBackendEnum,
+    CacheModeEnum,
     CachingEnum,
     Flake8OptionEnum,
 )
 from nitpick.exceptions import Deprecation, QuitComplainingError, pretty_exception
 from nitpick.generic import glob_files, url_to_python_path
+from nitpick.lock import LockedStyle, StyleLock
 from nitpick.plugins.info import FileInfo
 from nitpick.schemas import BaseStyleSchema, NitpickSectionSchema, flatten_marshmallow_errors
 from nitpick.violations import Fuss, Reporter, StyleViolations
@@ -64,6 +106,12 @@ except ImportError:  # pragma: no cover
 
 GITHUB_API_SESSION = Session()  # Dedicated session to reuse connections
 
+CACHE_EXPIRATION_DEFAULTS = {
+    CachingEnum.NEVER: DO_NOT_CACHE,
+    CachingEnum.FOREVER: NEVER_EXPIRE,
+    CachingEnum.EXPIRES: timedelta(hours=1),
+}
+
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Sequence
@@ -92,6 +140,11 @@ def builtin_styles() -> Iterable[Path]:
     yield from builtin_resources_root().glob("**/*.toml")
 
 
+def github_default_branch_cache() -> GitHubDefaultBranchCache:
+    """Default branches stored on disk, shared by all projects of the current user."""
+    return GitHubDefaultBranchCache(user_cache_dir() / GITHUB_DEFAULT_BRANCHES_NAME, GITHUB_DEFAULT_BRANCH_TTL)
+
+
 @lru_cache
 def github_default_branch(api_url: str, *, token: str | None = None) -> str:
     """Get the default branch from the GitHub repo using the API.
@@ -100,21 +153,40 @@ def github_default_branch(api_url: str, *, token: str | None = None) -> str:
     not authenticated on GitHub, so it might hit a rate limit with:
     ``requests.exceptions.HTTPError: 403 Client Error: rate limit exceeded for url``
 
-    This function is using ``lru_cache()`` as a simple memoizer, trying to avoid this rate limit error.
+    To avoid this rate limit error, the default branch is stored on disk for a day
+    (shared by all processes and projects), and this function uses ``lru_cache()`` as a simple memoizer.
     """
+    branch_cache = github_default_branch_cache()
+    branch = branch_cache.get(api_url)
+    if branch:
+        return branch
+
     headers = {"Authorization": f"token {token}"} if token else None
     response = GITHUB_API_SESSION.get(api_url, headers=headers)
     response.raise_for_status()
 
-    return response.json()["default_branch"]
+    branch = response.json()["default_branch"]
+    branch_cache.put(api_url, branch)
+    return branch
+
+
+def github_commit(api_url: str, git_reference: str, *, token: str | None = None) -> str:
+    """Resolve a Git reference (or the default branch, if empty) of a GitHub repo to a commit hash, using the API."""
+    headers = {"Accept": "application/vnd.github.sha"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    response = GITHUB_API_SESSION.get(f"{api_url}/commits/{git_reference or 'HEAD'}", headers=headers)
+    response.raise_for_status()
+    return response.text.strip()
 
 
 def parse_cache_option(cache_option: str) -> tuple[CachingEnum, timedelta | int]:
     """Parse the cache option provided on pyproject.toml.
 
     If no cache is provided or is invalid, the default is *one hour*.
+    Cache modes (see ``parse_cache_modes()``) are ignored here.
     """
-    clean_cache_option = cache_option.strip().upper() if cache_option else ""
+    clean_cache_option = _remove_cache_modes(cache_option).strip(CACHE_MODE_SEPARATORS).upper() if cache_option else ""
     try:
         caching = CachingEnum[clean_cache_option]
         logger.info(f"Simple cache option: {caching.name}")
@@ -135,6 +207,39 @@ def parse_cache_option(cache_option: str) -> tuple[CachingEnum, timedelta | int]
     return caching, expires_after
 
 
+def parse_cache_modes(cache_option: str) -> set[CacheModeEnum]:
+    """Parse the extra cache modes from the cache option provided on pyproject.toml.
+
+    The modes can be combined with the expiration, in any order, e.g.: ``"1 day, stale-if-error"``.
+
+    >>> sorted(mode.value for mode in parse_cache_modes("1 day, stale-if-error, STALE-while-revalidate"))
+    ['stale-if-error', 'stale-while-revalidate']
+    >>> parse_cache_modes("forever")
+    set()
+    """
+    lower_cache_option = cache_option.lower() if cache_option else ""
+    modes = {mode for mode in CacheModeEnum if mode.value in lower_cache_option}
+    if modes:
+        logger.info(f"Cache modes: {', '.join(sorted(mode.value for mode in modes))}")
+    return modes
+
+
+def _remove_cache_modes(cache_option: str) -> str:
+    for mode in CacheModeEnum:
+        cache_option = re.sub(re.escape(mode.value), "", cache_option, flags=re.IGNORECASE)
+    return cache_option
+
+
+@dataclass()
+class PrefetchedStyle:
+    """A style downloaded ahead of time, while resolving the include tree."""
+
+    contents: str | None = None
+    toml_dict: JsonDict | None = None
+    parsed: ParsedStyle | None = None
+    error: Exception | None = None
+
+
 @dataclass()
 class StyleManager:  # pylint: disable=too-many-instance-attributes
     """Include styles recursively from one another."""
@@ -142,22 +247,67 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
     project: Project
     offline: bool
     cache_option: str
+    #: Maximum number of styles fetched at the same time, on each level of the include tree.
+    fetch_workers: int = FETCH_WORKERS_DEFAULT
+    #: Resolve the styles to immutable addresses for ``nitpick lock``, ignoring the current lock file.
+    locking: bool = False
+    cache_backend: CacheBackendEnum = CacheBackendEnum.SQLITE
 
     _cache_dir: Path = field(init=False)
     _fixed_name_classes: set = field(init=False)
 
     def __post_init__(self) -> None:
         """Initialize dependant fields."""
-        self._merged_styles: JsonDict = {}
-        self._already_included: set[str] = set()
+        self.reset()
         self._dynamic_schema_class: type = BaseStyleSchema
-        self._style_fetcher_manager = StyleFetcherManager(self.offline, self.cache_dir, self.cache_option)
+        self._style_fetcher_manager = StyleFetcherManager(
+            self.offline,
+            self.cache_dir,
+            self.cache_option,
+            None if self.locking else self._read_lock(),
+            self.locking,
+            self.cache_backend,
+            self.project.shared_cache_dir,
+        )
         self._config_validator = ConfigValidator(self.project)
+        # The validation changes with the Nitpick version and the loaded plugins
+        # Parsed styles are shared by all projects too, when the remote style cache is shared
+        self._parsed_styles = ParsedStyleCache(
+            self._style_fetcher_manager.styles_cache_dir / PARSED_STYLES_DIR_NAME, self.project.plugins_fingerprint
+        )
         self.rebuild_dynamic_schema()
 
     def __hash__(self):
         """Calculate hash on hashable items so lru_cache knows how to cache data from this class."""
-        return hash((self.project, self.offline, self.cache_option))
+        return hash(
+            (self.project, self.offline, self.cache_option, self.fetch_workers, self.locking, self.cache_backend)
+        )
+
+    def reset(self) -> None:
+        """Forget the styles of the previous merge; the session, the caches and the dynamic schema are kept."""
+        self._merged_styles: JsonDict = {}
+        self._already_included: set[str] = set()
+        self._initial_style_urls: list[furl] = []
+        self._deprecations: list[str] = []
+        self._prefetched: dict[str, PrefetchedStyle] = {}
+
+    def local_style_paths(self) -> list[Path]:
+        """Local files of the included styles."""
+        return sorted(
+            url_to_python_path(furl(url)) for url in self._already_included if furl(url).scheme == Scheme.FILE
+        )
+
+    def _read_lock(self) -> StyleLock | None:
+        try:
+            return StyleLock.read(self.project.lock_path)
+        except ValueError as err:
+            raise QuitComplainingError(
+                Reporter(FileInfo(self.project, NITPICK_LOCK)).make_fuss(StyleViolations.INVALID_LOCK, exception=err)
+            ) from err
+
+    def style_lock(self) -> StyleLock:
+        """Lock file with the styles resolved by ``find_initial_styles()``, when locking."""
+        return StyleLock(dict(self._style_fetcher_manager.locked_styles))
 
     @property
     def cache_dir(self) -> Path:
@@ -165,12 +315,29 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
         try:
             path = self._cache_dir
         except AttributeError:
-            self._cache_dir = path = self.project.root / CACHE_DIR_NAME / PROJECT_NAME
-            # TODO: fix: check if the merged style file is still needed
-            #  if not, this line can be removed
+            self._cache_dir = path = self.project.cache_dir
             path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def cache_stats(self) -> list[CachedResponseStats]:
+        """Usage of the cached remote styles, the most recently used first."""
+        return self._style_fetcher_manager.cache_index.stats()
+
+    def prune_cache(self, *, older_than: timedelta | None = None, max_size: int | None = None) -> int:
+        """Evict cached styles downloaded before a time, and then the least recently used ones above a size.
+
+        Parsed styles and locked styles in the content store are removed by age too.
+        Return the number of evicted responses and files.
+        """
+        manager = self._style_fetcher_manager
+        evicted = manager.cache_index.prune(manager.session.cache, older_than=older_than, max_size=max_size)
+        if older_than is not None:
+            # Responses cached before the index existed
+            manager.session.cache.delete(older_than=older_than)
+            evicted += prune_files(manager.styles_cache_dir / PARSED_STYLES_DIR_NAME, older_than)
+            evicted += prune_files(manager.styles_cache_dir / CONTENT_STORE_DIR_NAME, older_than)
+        return evicted
+
     @staticmethod
     def get_default_style_url(github=False) -> furl:
         """Return the URL of the default style/preset."""
@@ -181,14 +348,14 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
 
         return furl(scheme=Scheme.PY, host=PROJECT_NAME, path=["resources", "presets", PROJECT_NAME])
 
-    def find_initial_styles(self, configured_styles: Sequence[str], base: str | None = None) -> Iterator[Fuss]:
-        """Find the initial style(s) and include them.
+    def initial_style_urls(self, configured_styles: Sequence[str], base: str | None = None) -> list[furl]:
+        """Find the normalized URLs of the initial style(s); the list is empty if no style was found.
 
         base is the URL for the source of the initial styles, and is used to
         resolve relative references. If omitted, defaults to the project root.
         """
         project_root = self.project.root
-        base_url = furl(base or project_root.resolve().as_uri())
+        base_url = StyleURL(base or project_root.resolve().as_uri())
 
         if configured_styles:
             chosen_styles = configured_styles
@@ -196,29 +363,96 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
             logger.info(f"Using styles configured in {config_file}: {', '.join(chosen_styles)}")
         else:
             paths = glob_files(project_root, [NITPICK_STYLE_TOML])
-            if paths:
-                chosen_styles = [sorted(paths)[0].expanduser().resolve().as_uri()]
-                log_message = "Using local style found climbing the directory tree"
-            else:
-                yield Reporter().make_fuss(StyleViolations.NO_STYLE_CONFIGURED)
-                return
-            logger.info(f"{log_message}: {chosen_styles[0]}")
+            if not paths:
+                return []
+            chosen_styles = [sorted(paths)[0].expanduser().resolve().as_uri()]
+            logger.info(f"Using local style found climbing the directory tree: {chosen_styles[0]}")
 
-        yield from self.include_multiple_styles(
-            self._style_fetcher_manager.normalize_url(ref, base_url) for ref in chosen_styles
-        )
+        return [self._style_fetcher_manager.normalize_url(ref, base_url) for ref in chosen_styles]
+
+    def find_initial_styles(self, initial_style_urls: list[furl]) -> Iterator[Fuss]:
+        """Include the initial style(s) returned by ``initial_style_urls()``."""
+        if not initial_style_urls:
+            yield Reporter().make_fuss(StyleViolations.NO_STYLE_CONFIGURED)
+            return
+
+        self._initial_style_urls = initial_style_urls
+        yield from self.include_multiple_styles(initial_style_urls)
 
     def include_multiple_styles(self, chosen_styles: Iterable[furl]) -> Iterator[Fuss]:
         """Include a list of styles (or just one) into this style tree."""
-        for style_url in chosen_styles:
+        style_urls = list(chosen_styles)
+        self._prefetch_include_tree(style_urls)
+        for style_url in style_urls:
             yield from self._include_style(style_url)
 
+    def _prefetch_include_tree(self, style_urls: list[furl]) -> None:
+        """Walk the include tree breadth-first, fetching all styles of the same level concurrently.
+
+        Styles are only downloaded and parsed here; they are merged later by ``_include_style()``,
+        in the same depth-first order as before, so the precedence of the merged keys doesn't change.
+        Errors are stored and raised only when the style is actually included.
+        """
+        level = style_urls
+        while level:
+            pending: dict[str, furl] = {}
+            for style_url in level:
+                if style_url.url not in self._already_included and style_url.url not in self._prefetched:
+                    pending.setdefault(style_url.url, style_url)
+            if not pending:
+                return
+
+            level = []
+            style_urls_to_fetch = list(pending.values())
+            for style_url, prefetched in zip(
+                style_urls_to_fetch, self._fetch_concurrently(style_urls_to_fetch), strict=True
+            ):
+                self._prefetched[style_url.url] = prefetched
+                if prefetched.contents is None:
+                    continue
+                prefetched.parsed = self._cached_parsed_style(style_url, prefetched.contents)
+                if prefetched.parsed:
+                    level.extend(StyleURL(url) for url in prefetched.parsed.includes)
+                    continue
+                try:
+                    prefetched.toml_dict = TomlDoc(string=prefetched.contents).as_object
+                except TomlDecodeError:
+                    # The error will be reported with the proper display name when this style is included
+                    continue
+                level.extend(self._find_sub_styles(prefetched.toml_dict, style_url))
+
+    def _fetch_concurrently(self, style_urls: list[furl]) -> list[PrefetchedStyle]:
+        """Fetch styles using a thread pool, keeping the order of the URLs."""
+        workers = min(self.fetch_workers, len(style_urls))
+        if workers <= 1:
+            return [self._prefetch(style_url) for style_url in style_urls]
+
+        logger.info(f"Fetching {len(style_urls)} styles with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=PROJECT_NAME) as executor:
+            return list(executor.map(self._prefetch, style_urls))
+
+    def _prefetch(self, style_url: furl) -> PrefetchedStyle:
+        try:
+            return PrefetchedStyle(contents=self._style_fetcher_manager.fetch(style_url))
+        except Exception as err:  # noqa: BLE001
+            return PrefetchedStyle(error=err)
+
+    def _find_sub_styles(self, read_toml_dict: JsonDict, style_url: furl) -> list[furl]:
+        """Find and normalize the URLs of the styles included by this style."""
+        return [
+            self._style_fetcher_manager.normalize_url(ref, style_url)
+            for ref in always_iterable(search_json(read_toml_dict, JMEX_NITPICK_STYLES_INCLUDE, []))
+        ]
+
     def _include_style(self, style_url: furl) -> Iterator[Fuss]:
         if style_url.url in self._already_included:
             return
         self._already_included.add(style_url.url)
 
-        file_contents = self._style_fetcher_manager.fetch(style_url)
+        prefetched = self._prefetched.pop(style_url.url, None) or self._prefetch(style_url)
+        if prefetched.error:
+            raise prefetched.error
+        file_contents = prefetched.contents
         if file_contents is None:
             return
 
@@ -231,28 +465,62 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
                 path = path.relative_to(self.project.root)
             display_name = str(path)
 
-        read_toml_dict = self._read_toml(file_contents, display_name)
+        parsed = prefetched.parsed or self._parse_style(style_url, file_contents, display_name, prefetched.toml_dict)
+        if parsed.errors:
+            yield Reporter(FileInfo(self.project, display_name)).make_fuss(
+                StyleViolations.INVALID_CONFIG, parsed.errors
+            )
+
+        self._deprecations.extend(parsed.deprecations)
+        dpath_merge(self._merged_styles, parsed.flat)
+
+        yield from self.include_multiple_styles(StyleURL(url) for url in parsed.includes)
+
+    def _file_exists(self, path_from_root: str) -> bool:
+        """Check if a file configured on a style exists in the project, the same way FileInfo checks it."""
+        return self.project.snapshot.exists(FileInfo.clean_path(path_from_root))
+
+    def _cached_parsed_style(self, style_url: furl, file_contents: str) -> ParsedStyle | None:
+        parsed = self._parsed_styles.get(self._parsed_styles.key(style_url.url, file_contents), self._file_exists)
+        if parsed:
+            logger.debug(f"Parsed style cache hit: {style_url}")
+            for message in parsed.deprecations:
+                warnings.warn(message, DeprecationWarning, stacklevel=2)
+        return parsed
+
+    def _parse_style(
+        self, style_url: furl, file_contents: str, display_name: str, read_toml_dict: JsonDict | None = None
+    ) -> ParsedStyle:
+        """Parse, validate and flatten a style, storing the result in the parsed style cache."""
+        if read_toml_dict is None:
+            read_toml_dict = self._read_toml(file_contents, display_name)
 
         # normalize sub-style URIs, before merging
-        sub_styles = [
-            self._style_fetcher_manager.normalize_url(ref, style_url)
-            for ref in always_iterable(search_json(read_toml_dict, JMEX_NITPICK_STYLES_INCLUDE, []))
-        ]
+        sub_styles = self._find_sub_styles(read_toml_dict, style_url)
         if sub_styles:
             read_toml_dict.setdefault("nitpick", {}).setdefault("styles", {})["include"] = [
                 str(url) for url in sub_styles
             ]
 
-        toml_dict, validation_errors = self._config_validator.validate(read_toml_dict)
-
-        if validation_errors:
-            yield Reporter(FileInfo(self.project, display_name)).make_fuss(
-                StyleViolations.INVALID_CONFIG, flatten_marshmallow_errors(validation_errors)
-            )
-
-        dpath_merge(self._merged_styles, flatten(toml_dict, custom_reducer(SEPARATOR_FLATTEN)))
-
-        yield from self.include_multiple_styles(sub_styles)
+        with warnings.catch_warnings(record=True) as captured:
+            warnings.simplefilter("always")
+            toml_dict, validation_errors = self._config_validator.validate(read_toml_dict)
+        for warning in captured:
+            warnings.warn_explicit(warning.message, warning.category, warning.filename, warning.lineno)
+
+        files = [key for key in toml_dict if key != PROJECT_NAME]
+        parsed = ParsedStyle(
+            flat=flatten(toml_dict, custom_reducer(SEPARATOR_FLATTEN)),
+            includes=[url.url for url in sub_styles],
+            errors=flatten_marshmallow_errors(validation_errors) if validation_errors else "",
+            deprecations=[
+                str(warning.message) for warning in captured if issubclass(warning.category, DeprecationWarning)
+            ],
+            files=files,
+            existing=existing_paths(files, self._file_exists),
+        )
+        self._parsed_styles.put(self._parsed_styles.key(style_url.url, file_contents), parsed)
+        return parsed
 
     def _read_toml(self, file_contents: str, display_name: str) -> JsonDict:
         toml = TomlDoc(string=file_contents)
@@ -269,22 +537,108 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
         return read_toml_dict
 
     def merge_toml_dict(self) -> JsonDict:
-        """Merge all included styles into a TOML (actually JSON) dictionary."""
+        """Merge all included styles into a TOML (actually JSON) dictionary.
+
+        The merged style is written to the cache dir, with a fingerprint to reuse it on the next run.
+        The file is written atomically, because other processes might be reading it at the same time.
+        """
         merged_dict = unflatten(self._merged_styles, custom_splitter(SEPARATOR_FLATTEN))
-        # TODO: fix: check if the merged style file is still needed
-        merged_style_path: Path = self.cache_dir / MERGED_STYLE_TOML
-        toml = TomlDoc(obj=merged_dict)
-
-        attempt = 1
-        while attempt < WRITE_STYLE_MAX_ATTEMPTS:
-            try:
-                merged_style_path.write_text(toml.reformatted)
-                break
-            except OSError:
-                attempt += 1
+        toml_string = TomlDoc(obj=merged_dict).reformatted
+
+        snapshot = self._snapshot_fingerprint(merged_dict, toml_string)
+        try:
+            if snapshot:
+                snapshot.write(self.merged_style_path, toml_string)
+            else:
+                write_atomically(self.merged_style_path, toml_string)
+        except OSError as err:
+            logger.warning(f"Merged style not written: {err}")
+        return merged_dict
+
+    @property
+    def merged_style_path(self) -> Path:
+        """Path of the merged style file, in the cache dir."""
+        return self.cache_dir / MERGED_STYLE_TOML
+
+    def _snapshot_key(self, initial_style_urls: list[furl]) -> str:
+        """Hash of everything that changes the merged style, except the contents of the styles."""
+        return hash_text(
+            str(MERGED_STYLE_FORMAT),
+            self._parsed_styles.salt,
+            str(self.offline),
+            self.cache_option,
+            *(url.url for url in initial_style_urls),
+        )
+
+    def _snapshot_fingerprint(self, merged_dict: JsonDict, toml_string: str) -> MergedStyleSnapshot | None:
+        """Fingerprint of the merged style; None if it can't be reused on the next run."""
+        sources = {}
+        for url in sorted(self._already_included):
+            validator = self._style_fetcher_manager.validator(StyleURL(url))
+            if validator is None:
+                logger.debug(f"Merged style can't be reused; no cache validator for {url}")
+                return None
+            sources[url] = validator
+
+        order = list(self._merged_styles)
+        # Some values can't be represented in TOML (e.g. None); then the snapshot would differ from the merged style
+        if not _same_json(self._unflatten_in_order(TomlDoc(string=toml_string).as_object, order), merged_dict):
+            logger.debug("Merged style can't be reused; it changes when converted to TOML")
+            return None
+
+        files = [key for key in merged_dict if key != PROJECT_NAME]
+        return MergedStyleSnapshot(
+            self._snapshot_key(self._initial_style_urls),
+            sources,
+            files,
+            existing_paths(files, self._file_exists),
+            list(dict.fromkeys(self._deprecations)),
+            order,
+        )
+
+    @staticmethod
+    def _unflatten_in_order(toml_dict: JsonDict, order: list[str]) -> JsonDict | None:
+        """Unflatten a dict read from TOML, with the keys in the same order as the merged style."""
+        flat = flatten(toml_dict, custom_reducer(SEPARATOR_FLATTEN))
+        if set(flat) != set(order):
+            return None
+        return unflatten({key: flat[key] for key in order}, custom_splitter(SEPARATOR_FLATTEN))
+
+    def load_snapshot(self, initial_style_urls: list[furl]) -> JsonDict | None:
+        """Load the merged style from the previous run, if its fingerprint still matches.
+
+        Then the styles are not fetched, parsed, validated and merged again.
+        """
+        stored = MergedStyleSnapshot.read(self.merged_style_path) if initial_style_urls else None
+        if not stored or not self._snapshot_matches(stored[0], initial_style_urls):
+            return None
 
+        snapshot, toml_string = stored
+        try:
+            merged_dict = self._unflatten_in_order(TomlDoc(string=toml_string).as_object, snapshot.order)
+        except TomlDecodeError:
+            return None
+        if merged_dict is None:
+            return None
+        logger.info("Using the merged style snapshot")
+        self._already_included = set(snapshot.sources)
+        for message in snapshot.deprecations:
+            warnings.warn(message, DeprecationWarning, stacklevel=2)
         return merged_dict
 
+    def _snapshot_matches(self, snapshot: MergedStyleSnapshot, initial_style_urls: list[furl]) -> bool:
+        if snapshot.key != self._snapshot_key(initial_style_urls):
+            logger.debug("Merged style snapshot: configured styles, Nitpick version or plugins changed")
+            return False
+        if snapshot.existing != existing_paths(snapshot.files, self._file_exists):
+            logger.debug("Merged style snapshot: files were created or removed")
+            return False
+        for url, validator in snapshot.sources.items():
+            if self._style_fetcher_manager.validator(StyleURL(url)) != validator:
+                logger.debug(f"Merged style snapshot: style changed or cache expired: {url}")
+                return False
+        return True
+
     @staticmethod
     def file_field_pair(filename: str, base_file_class: type[NitpickPlugin]) -> dict[str, fields.Field]:
         """Return a schema field with info from a config file class."""
@@ -305,11 +659,7 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
         try:
             fixed_name_classes = self._fixed_name_classes
         except AttributeError:
-            fixed_name_classes = self._fixed_name_classes = {
-                plugin_class
-                for plugin_class in self.project.plugin_manager.hook.plugin_class()  # pylint: disable=no-member
-                if plugin_class.filename
-            }
+            fixed_name_classes = self._fixed_name_classes = self.project.plugin_registry.fixed_name_classes()
         return fixed_name_classes
 
     def rebuild_dynamic_schema(self) -> None:
@@ -348,7 +698,7 @@ class ConfigValidator:
         validation_errors = {}
         toml_dict = {}
         for key, value_dict in config_dict.items():
-            info = FileInfo.create(self.project, key)
+            info = self.project.file_info(key)
             toml_dict[info.path_from_root] = value_dict
             validation_errors.update(self._validate_item(key, info, value_dict))
         return toml_dict, validation_errors
@@ -369,7 +719,7 @@ class ConfigValidator:
         return validation_errors
 
     def _get_validation_schemas_for_file(self, info):
-        for plugin_class in self.project.plugin_manager.hook.can_handle(info=info):  # pylint: disable=no-member
+        for plugin_class in self.project.plugin_registry.can_handle(info):
             yield plugin_class.validation_schema
 
     def _validate_schemas(self, info, schemas, value_dict):
@@ -405,6 +755,9 @@ class Scheme(LowercaseStrEnum):
     FILE = auto()
     GH = auto()
     GITHUB = auto()
+    GIT_FILE = "git+file"
+    GIT_HTTP = "git+http"
+    GIT_HTTPS = "git+https"
     HTTP = auto()
     HTTPS = auto()
     PY = auto()
@@ -419,29 +772,63 @@ class StyleFetcherManager:
     offline: bool
     cache_dir: Path
     cache_option: str
+    #: Locked styles are fetched by their pinned address, or from the content store.
+    lock: StyleLock | None = None
+    #: Pin the styles and record them in ``locked_styles``.
+    locking: bool = False
+    cache_backend: CacheBackendEnum = CacheBackendEnum.SQLITE
+    #: Cache dir shared by all projects, chosen by the caller; by default, the one configured with an environment var.
+    shared_cache_dir: Path | None = None
 
     session: CachedSession = field(init=False)
     fetchers: dict[str, StyleFetcher] = field(init=False)
     schemes: tuple[str] = field(init=False)
+    #: The project cache dir, or the cache dir shared by all projects.
+    styles_cache_dir: Path = field(init=False)
+    cache_index: StyleCacheIndex = field(init=False)
+    content_store: ContentStore = field(init=False)
+    locked_styles: dict[str, LockedStyle] = field(init=False, default_factory=dict)
 
     def __post_init__(self):
         """Initialize dependant properties."""
+        self.styles_cache_dir = styles_dir = styles_cache_dir(self.cache_dir, self.shared_cache_dir)
+        # Only the shared cache has a size limit
+        max_size = shared_cache_max_size() if styles_dir != self.cache_dir else None
+        self.cache_index = StyleCacheIndex(styles_dir / CACHE_INDEX_NAME, max_size)
+
         caching, expire_after = parse_cache_option(self.cache_option)
         # honour caching headers on the response when an expiration time has
         # been set meaning that the server can dictate cache expiration
         # overriding the local expiration time. This may need to become a
         # separate configuration option in future.
         cache_control = caching is CachingEnum.EXPIRES
+        modes = parse_cache_modes(self.cache_option)
         self.session = CachedSession(
-            str(self.cache_dir / "styles"), expire_after=expire_after, cache_control=cache_control
+            backend=create_cache_backend(self.cache_backend, styles_dir),
+            expire_after=expire_after,
+            cache_control=cache_control,
+            stale_if_error=CacheModeEnum.STALE_IF_ERROR in modes,
+            stale_while_revalidate=CacheModeEnum.STALE_WHILE_REVALIDATE in modes,
         )
-        self.fetchers = fetchers = _get_fetchers(self.session)
+        self.session.hooks["response"].append(self._record_cache_access)
+        self.fetchers = fetchers = _get_fetchers(self.session, styles_dir)
+        self.content_store = ContentStore(styles_dir / CONTENT_STORE_DIR_NAME)
 
         # used to test if a string URL is relative or not. These strings
         # *include the colon*.
         protocols = {prot for fetcher in fetchers.values() for prot in fetcher.protocols}
         self.schemes = tuple(f"{prot}:" for prot in protocols)
 
+    def _record_cache_access(self, response: requests.Response, *args, **kwargs) -> None:  # noqa: ARG002
+        """Response hook: keep the index of the cache, evicting old styles from the shared cache when it's full."""
+        cache_key = getattr(response, "cache_key", None)
+        if not cache_key:
+            return
+        from_cache = getattr(response, "from_cache", False)
+        self.cache_index.touch(
+            cache_key, response.url, len(response.content), None if from_cache else self.session.cache
+        )
+
     def normalize_url(self, url: str | furl, base: furl) -> furl:
         """Normalize a style URL.
 
@@ -450,7 +837,7 @@ class StyleFetcherManager:
         """
         if isinstance(url, str) and not url.startswith(self.schemes):
             url = self._fetcher_for(base).preprocess_relative_url(url)
-        absolute = base.copy().join(url)
+        absolute = StyleURL(base).join(url)
         return self._fetcher_for(absolute).normalize(absolute)
 
     def fetch(self, url: furl) -> str | None:
@@ -460,11 +847,66 @@ class StyleFetcherManager:
         require a connection.
         """
         fetcher = self._fetcher_for(url)
-        if self.offline and fetcher.requires_connection:
+        locked = self.lock.get(url.url) if self.lock else None
+        if locked:
+            return self._fetch_locked(locked)
+        if self.offline and fetcher.needs_connection(url):
             return None
+        if fetcher.lockable:
+            if self.locking:
+                return self._fetch_and_lock(fetcher, url)
+            if self.lock is not None:
+                logger.warning(f"Style not found in {NITPICK_LOCK}, run 'nitpick lock' to add it: {url}")
 
         return fetcher.fetch(url)
 
+    def _fetch_locked(self, locked: LockedStyle) -> str | None:
+        """Read a locked style from the content store, or fetch it by its pinned address and check its hash."""
+        contents = self.content_store.get(locked.sha256)
+        if contents is not None:
+            return contents
+
+        pinned = StyleURL(locked.pinned)
+        fetcher = self._fetcher_for(pinned)
+        if self.offline and fetcher.needs_connection(pinned):
+            return None
+        contents = fetcher.fetch(pinned)
+        if not contents:
+            # The fetcher already reported why the style could not be downloaded
+            return contents
+        actual = hash_contents(contents)
+        if actual != locked.sha256:
+            raise QuitComplainingError(
+                Reporter().make_fuss(
+                    StyleViolations.LOCKED_STYLE_CHANGED, url=locked.url, expected=locked.sha256, actual=actual
+                )
+            )
+        self.content_store.put(contents)
+        return contents
+
+    def _fetch_and_lock(self, fetcher: StyleFetcher, url: furl) -> str:
+        """Fetch a style by its pinned address (so the locked contents match the pinned commit) and record it."""
+        pinned = fetcher.pin(url) or url
+        contents = fetcher.fetch(pinned)
+        if not contents:
+            raise QuitComplainingError(Reporter().make_fuss(StyleViolations.STYLE_NOT_LOCKED, url=url))
+        self.locked_styles[url.url] = LockedStyle(url.url, pinned.url, self.content_store.put(contents))
+        return contents
+
+    def validator(self, url: furl) -> str | None:
+        """Return a validator that changes when the style changes, without fetching it.
+
+        Returns None when the validator can't be known without fetching the style again.
+        """
+        locked = self.lock.get(url.url) if self.lock else None
+        if locked:
+            return locked.sha256
+        fetcher = self._fetcher_for(url)
+        if self.offline and fetcher.needs_connection(url):
+            # The style is skipped when offline
+            return "offline"
+        return fetcher.validator(url)
+
     def _fetcher_for(self, url: furl) -> StyleFetcher:
         """Determine which fetcher to be used.
 
@@ -484,6 +926,8 @@ class StyleFetcher:
     """Base class of all fetchers, it encapsulates get/fetch from a specific source."""
 
     requires_connection: ClassVar[bool] = False
+    #: Styles that can change without any change in the project are recorded by ``nitpick lock``.
+    lockable: ClassVar[bool] = False
 
     # only set when requires_connection is True
     session: CachedSession | None = None
@@ -496,6 +940,10 @@ class StyleFetcher:
             msg = "session is required"
             raise ValueError(msg)
 
+    def needs_connection(self, url: furl) -> bool:  # noqa: ARG002
+        """Return True if fetching this URL needs a network connection."""
+        return self.requires_connection
+
     def preprocess_relative_url(self, url: str) -> str:
         """Preprocess a relative URL.
 
@@ -532,12 +980,31 @@ class StyleFetcher:
         """Fetch a style from a specific fetcher."""
         raise NotImplementedError
 
+    def validator(self, url: furl) -> str | None:  # noqa: ARG002
+        """Return a cheap validator for the contents of a style, or None if it can't be known without fetching."""
+        return None
+
+    def pin(self, url: furl) -> furl | None:  # noqa: ARG002
+        """Return an immutable address of the style (e.g. pinned to a Git commit), or None if there is none."""
+        return None
 
-def _get_fetchers(session: CachedSession) -> dict[str, StyleFetcher]:
+
+def _same_json(first: JsonDict | None, second: JsonDict) -> bool:
+    """Compare two dicts including the order of their keys, which is kept when they are written to config files."""
+    return json.dumps(first, default=str) == json.dumps(second, default=str)
+
+
+def _get_fetchers(session: CachedSession, cache_dir: Path) -> dict[str, StyleFetcher]:
     def _factory(klass: type[StyleFetcher]) -> StyleFetcher:
         return klass(session) if klass.requires_connection else klass()
 
-    fetchers = (_factory(FileFetcher), _factory(HttpFetcher), _factory(GitHubFetcher), _factory(PythonPackageFetcher))
+    fetchers = (
+        _factory(FileFetcher),
+        _factory(HttpFetcher),
+        _factory(GitHubFetcher),
+        _factory(PythonPackageFetcher),
+        GitFetcher(git_dir=cache_dir / GIT_CACHE_DIR_NAME),
+    )
     return dict(_fetchers_to_pairs(fetchers))
 
 
@@ -577,6 +1044,10 @@ class FileFetcher(StyleFetcher):  # pylint: disable=too-few-public-methods
         """Fetch a style from a local file."""
         return url_to_python_path(url).read_text(encoding="UTF-8")
 
+    def validator(self, url: furl) -> str | None:
+        """Modification time and size of the local file."""
+        return stat_validator(url_to_python_path(url))
+
 
 @dataclass(frozen=True)
 class GitHubURL:
@@ -689,6 +1160,7 @@ class HttpFetcher(StyleFetcher):
     """Fetch a style from an http/https server."""
 
     requires_connection = True
+    lockable = True
 
     protocols: tuple[str, ...] = (Scheme.HTTP, Scheme.HTTPS)  # type: ignore[assignment]
 
@@ -714,9 +1186,30 @@ class HttpFetcher(StyleFetcher):
             msg = "No session provided to fetcher"
             raise RuntimeError(msg)
         response = self.session.get(url.url, **kwargs)
+        if response.status_code == HTTPStatus.NOT_FOUND and not getattr(response, "from_cache", False):
+            self._cache_not_found(response)
         response.raise_for_status()
         return response.text
 
+    def _cache_not_found(self, response: requests.Response) -> None:
+        """Cache a "not found" response for a short time, unless caching is disabled."""
+        if self.session is None or self.session.settings.expire_after == DO_NOT_CACHE:
+            return
+        logger.info(f"Style not found, caching for {CACHE_NOT_FOUND_EXPIRATION}: {response.url}")
+        self.session.cache.save_response(response, expires=get_expiration_datetime(CACHE_NOT_FOUND_EXPIRATION))
+
+    def validator(self, url: furl) -> str | None:
+        """Validator of the cached response (ETag, Last-Modified or a hash of the contents), while it's not expired."""
+        return self._cached_response_validator(url)
+
+    def _cached_response_validator(self, url: furl) -> str | None:
+        if self.session is None:
+            return None
+        response = self.session.cache.get_response(self.session.cache.create_key(requests.Request("GET", url.url)))
+        if response is None or response.is_expired or not response.ok:
+            return None
+        return response.headers.get("ETag") or response.headers.get("Last-Modified") or hash_text(response.text)
+
 
 @dataclass(frozen=True)
 class GitHubFetcher(HttpFetcher):  # pylint: disable=too-few-public-methods
@@ -734,6 +1227,30 @@ class GitHubFetcher(HttpFetcher):  # pylint: disable=too-few-public-methods
         kwargs.setdefault("headers", github_url.authorization_header)
         return super()._download(github_url.raw_content_url, **kwargs)
 
+    def validator(self, url: furl) -> str | None:
+        """Validator of the cached raw content; without a Git reference, the default branch must be cached too."""
+        github_url = GitHubURL.from_furl(url)
+        if not github_url.git_reference:
+            default_branch = github_default_branch_cache().get(github_url.api_url.url)
+            if not default_branch:
+                return None
+            github_url = replace(github_url, git_reference=default_branch)
+        return self._cached_response_validator(github_url.raw_content_url)
+
+    def pin(self, url: furl) -> furl | None:
+        """The same style, on the commit of its Git reference (or of the default branch)."""
+        github_url = GitHubURL.from_furl(url)
+        commit = github_url.git_reference
+        if not REGEX_GIT_COMMIT.fullmatch(commit):
+            commit = github_commit(github_url.api_url.url, commit, token=github_url.token)
+        return furl(
+            scheme=Scheme.GITHUB,
+            username=github_url.auth_token,
+            host=github_url.owner,
+            path=[f"{github_url.repository}{GIT_AT_REFERENCE}{commit}", *github_url.path],
+            query_params=github_url.query_params,
+        )
+
 
 @dataclass(frozen=True)
 class PythonPackageURL:
@@ -785,6 +1302,193 @@ class PythonPackageFetcher(StyleFetcher):  # pylint: disable=too-few-public-meth
         package_url = PythonPackageURL.from_furl(url)
         return package_url.content_path.read_text(encoding="UTF-8")
 
+    def validator(self, url: furl) -> str | None:
+        """Modification time and size of the resource file."""
+        try:
+            content_path = PythonPackageURL.from_furl(url).content_path
+        except ImportError:
+            return None
+        return stat_validator(content_path)
+
+
+class StyleURL(furl):
+    """A style URL that keeps the ``//`` of an empty netloc for any scheme (e.g. ``git+file:///path/to/repo``).
+
+    ``urllib.parse`` only keeps it for the schemes it knows, so ``furl`` would print ``git+file:/path/to/repo``;
+    relative URLs are then joined on the printed URL, which must keep its ``//``.
+    """
+
+    def tostr(self, *args, **kwargs) -> str:
+        """Print the URL, with ``//`` after the scheme if the URL has an empty netloc (as ``urlunsplit()`` does)."""
+        url = super().tostr(*args, **kwargs)
+        if not self.scheme or self.netloc != "" or url.startswith(f"{self.scheme}://"):
+            return url
+        path = url.removeprefix(f"{self.scheme}:")
+        if path and not path.startswith("/"):
+            path = f"/{path}"
+        return f"{self.scheme}://{path}"
+
+
+#: Added to the environment of Git commands, so they never ask for credentials on the terminal; they fail instead.
+GIT_ENV = {"GIT_TERMINAL_PROMPT": "0"}
+
+
+@dataclass(frozen=True)
+class GitURL:
+    """Represent a style file in a Git repository, created from a ``git+`` URL.
+
+    The repository is the part of the path up to the first segment ending with ``.git``
+    or with a Git reference (``@<commit/tag/branch>``), e.g.:
+
+    - ``git+https://github.com/some-org/styles.git@v1.0/python/style.toml``;
+    - ``git+file:///path/to/styles@main/python/style.toml``.
+    """
+
+    remote: str
+    git_reference: str
+    path: tuple[str, ...]
+
+    @classmethod
+    def from_furl(cls, url: furl) -> GitURL:
+        """Create an instance from a parsed ``git+`` URL."""
+        segments = url.path.segments
+        index = next(
+            (
+                index
+                for index, segment in enumerate(segments)
+                if GIT_AT_REFERENCE in segment or segment.endswith(GIT_EXTENSION)
+            ),
+            None,
+        )
+        if index is None:
+            msg = f"No Git repository in the URL {url}: end the repository with {GIT_EXTENSION!r} or with '@<ref>'"
+            raise ValueError(msg)
+        repository, _, git_reference = segments[index].partition(GIT_AT_REFERENCE)
+
+        remote = url.copy().set(scheme=url.scheme.removeprefix("git+"), path=[*segments[:index], repository])
+        return cls(remote.url, git_reference, tuple(segments[index + 1 :]))
+
+    @property
+    def is_commit(self) -> bool:
+        """The Git reference is a full commit hash, so the contents never change."""
+        return bool(REGEX_GIT_COMMIT.fullmatch(self.git_reference))
+
+    @property
+    def url(self) -> furl:
+        """The ``git+`` URL of the style."""
+        url = StyleURL(self.remote)
+        *directories, repository = url.path.segments
+        at_reference = f"{GIT_AT_REFERENCE}{self.git_reference}" if self.git_reference else ""
+        return url.set(scheme=f"git+{url.scheme}", path=[*directories, f"{repository}{at_reference}", *self.path])
+
+
+@dataclass(frozen=True)
+class GitFetcher(StyleFetcher):
+    """Fetch styles from a Git repository.
+
+    The repository is cloned once into the cache dir, and then fetched incrementally once per run.
+    All styles (and their relative includes) are read from this local copy.
+    """
+
+    lockable = True
+
+    protocols: tuple[str, ...] = (Scheme.GIT_FILE, Scheme.GIT_HTTP, Scheme.GIT_HTTPS)  # type: ignore[assignment]
+
+    git_dir: Path | None = None
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+    _updated_repos: set[Path] = field(default_factory=set, compare=False, repr=False)
+
+    def needs_connection(self, url: furl) -> bool:
+        """Only local repositories can be read when offline."""
+        return url.scheme != Scheme.GIT_FILE
+
+    def fetch(self, url: furl) -> str:
+        """Fetch a style from the local copy of the Git repository."""
+        git_url = GitURL.from_furl(url)
+        repo_dir, commit = self._resolve_commit(git_url)
+        path = "/".join(git_url.path)
+        try:
+            return self._git(repo_dir, "show", f"{commit}:{path}", strip=False)
+        except subprocess.CalledProcessError as err:
+            msg = f"{path} not found in {git_url.remote} at {commit}"
+            raise FileNotFoundError(msg) from err
+
+    def validator(self, url: furl) -> str | None:
+        """The commit hash, if the URL is pinned to one; branches and tags can change."""
+        git_url = GitURL.from_furl(url)
+        return git_url.git_reference if git_url.is_commit else None
+
+    def pin(self, url: furl) -> furl | None:
+        """The same style, on the commit of its Git reference (or of the default branch)."""
+        git_url = GitURL.from_furl(url)
+        _, commit = self._resolve_commit(git_url)
+        return replace(git_url, git_reference=commit).url
+
+    def _resolve_commit(self, git_url: GitURL) -> tuple[Path, str]:
+        """Update the local copy of the repository and return it, with the commit of the Git reference."""
+        repo_dir = self._update_local_repo(git_url)
+        reference = git_url.git_reference or "HEAD"
+        commit = self._git(repo_dir, "rev-parse", "--verify", "--quiet", f"{reference}^{{commit}}", check=False)
+        if not commit:
+            msg = f"Git reference {git_url.git_reference!r} not found in {git_url.remote}"
+            raise FileNotFoundError(msg)
+        return repo_dir, commit
+
+    def _update_local_repo(self, git_url: GitURL) -> Path:
+        """Clone the repository, or fetch new commits; only once per run for each repository."""
+        if self.git_dir is None:
+            msg = "No cache dir provided to the Git fetcher"
+            raise RuntimeError(msg)
+        anonymous_remote = furl(git_url.remote).remove(username=True, password=True).url
+        repo_dir = self.git_dir / f"{slugify(anonymous_remote)[:50]}-{hash_text(git_url.remote)[:12]}.git"
+
+        with self._lock:
+            if repo_dir in self._updated_repos:
+                return repo_dir
+            if not repo_dir.exists():
+                self._clone(git_url.remote, repo_dir)
+            elif not (git_url.is_commit and self._git(repo_dir, "cat-file", "-t", git_url.git_reference, check=False)):
+                logger.info(f"Fetching Git repository {anonymous_remote}")
+                try:
+                    self._git(repo_dir, "fetch", "--prune", "--quiet", "origin")
+                except subprocess.CalledProcessError as err:
+                    logger.warning(f"Using the local copy of {anonymous_remote}; git fetch failed: {err.stderr}")
+            self._updated_repos.add(repo_dir)
+        return repo_dir
+
+    def _clone(self, remote: str, repo_dir: Path) -> None:
+        logger.info(f"Cloning Git repository {furl(remote).remove(username=True, password=True)}")
+        repo_dir.parent.mkdir(parents=True, exist_ok=True)
+        # Clone into a temporary dir, so other processes never see a partial clone
+        temp_dir = Path(tempfile.mkdtemp(dir=repo_dir.parent, prefix=f".{repo_dir.name}."))
+        try:
+            self._git(temp_dir, "clone", "--mirror", "--quiet", remote, ".")
+            temp_dir.replace(repo_dir)
+        except OSError:
+            if not repo_dir.exists():
+                raise
+            # Another process cloned it first
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _git(repo_dir: Path, *args: str, strip: bool = True, check: bool = True) -> str:
+        git = shutil.which("git")
+        if not git:
+            msg = "Git command not found. Please make sure Git is installed and on the PATH."
+            raise RuntimeError(msg)
+        result = subprocess.run(  # noqa: S603
+            [git, *args],
+            cwd=repo_dir,
+            env={**os.environ, **GIT_ENV},
+            capture_output=True,
+            text=True,
+            check=check,
+            encoding="UTF-8",
+        )
+        return result.stdout.strip() if strip else result.stdout
+
 
 @attr.mutable(kw_only=True)
 class BuiltinStyle:  # pylint: disable=too-few-public-methods
@@ -805,10 +1509,7 @@ class BuiltinStyle:  # pylint: disable=too-few-public-methods
         if library_dir:
             # Style in a directory
             from_resources_root = without_suffix.relative_to(library_dir)
-            bis = BuiltinStyle(
-                formatted=str(without_suffix),
-                path_from_resources_root=from_resources_root.as_posix(),
-            )
+            bis = BuiltinStyle(formatted=str(without_suffix), path_from_resources_root=from_resources_root.as_posix())
         else:
             # Style from the built-in library
             package_path = resource_path.relative_to(builtin_resources_root().parent.parent)
@@ -5,6 +5,7 @@ Name inspired by [flake8's violations](https://flake8.pycqa.org/en/latest/user/e
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
@@ -69,6 +70,12 @@ class StyleViolations(ViolationEnum):
     INVALID_TOML = (1, " has an incorrect style. Invalid TOML{exception}")
     INVALID_CONFIG = (1, " has an incorrect style. Invalid config:")
     NO_STYLE_CONFIGURED = (4, f"No style file configured.{CONFIG_RUN_NITPICK_INIT_OR_CONFIGURE_STYLE_MANUALLY}")
+    INVALID_LOCK = (5, " is invalid: {exception}. Run 'nitpick lock' to create it again")
+    LOCKED_STYLE_CHANGED = (
+        6,
+        "The locked style {url} changed (expected SHA-256 {expected}, got {actual}). Run 'nitpick lock' to update it",
+    )
+    STYLE_NOT_LOCKED = (7, "The style {url} could not be downloaded, so it can't be locked")
 
 
 class ProjectViolations(ViolationEnum):
@@ -105,6 +112,8 @@ class Reporter:  # pylint: disable=too-few-public-methods
 
     manual: int = 0
     fixed: int = 0
+    # Plugins of different files can make a fuss at the same time (see ``nitpick check --jobs``)
+    _lock = threading.Lock()
 
     def __init__(self, info: FileInfo | None = None, violation_base_code: int = 0) -> None:
         self.info: FileInfo | None = info
@@ -123,24 +132,31 @@ class Reporter:  # pylint: disable=too-few-public-methods
     @classmethod
     def reset(cls):
         """Reset the counters."""
-        cls.manual = cls.fixed = 0
+        with cls._lock:
+            cls.manual = cls.fixed = 0
 
     @classmethod
     def increment(cls, fixed=False):
         """Increment the fixed ou manual count."""
-        if fixed:
-            cls.fixed += 1
-        else:
-            cls.manual += 1
+        with cls._lock:
+            if fixed:
+                cls.fixed += 1
+            else:
+                cls.manual += 1
 
     @classmethod
     def get_counts(cls) -> str:
         """String representation with error counts and emojis."""
-        parts = []
-        if cls.fixed:
-            parts.append(f"{EmojiEnum.GREEN_CHECK.value} {cls.fixed} fixed")
-        if cls.manual:
-            parts.append(f"{EmojiEnum.X_RED_CROSS.value} {cls.manual} to fix manually")
-        if not parts:
-            return f"No violations found. {EmojiEnum.STAR_CAKE.value}"
-        return f"Violations: {', '.join(parts)}."
+        return format_counts(cls.fixed, cls.manual)
+
+
+def format_counts(fixed: int, manual: int) -> str:
+    """String representation of the fixed and manual violation counts, with emojis."""
+    parts = []
+    if fixed:
+        parts.append(f"{EmojiEnum.GREEN_CHECK.value} {fixed} fixed")
+    if manual:
+        parts.append(f"{EmojiEnum.X_RED_CROSS.value} {manual} to fix manually")
+    if not parts:
+        return f"No violations found. {EmojiEnum.STAR_CAKE.value}"
+    return f"Violations: {', '.join(parts)}."
@@ -0,0 +1,270 @@
+"""Watch mode: check a project again when its configured files or its styles change."""
+
+from __future__ import annotations
+
+import abc
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from nitpick.cache import hash_json, stat_validator
+from nitpick.exceptions import QuitComplainingError
+from nitpick.generic import filter_names
+from nitpick.violations import Reporter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from nitpick.core import Nitpick
+    from nitpick.violations import Fuss
+
+#: How often files are polled when inotify is not available.
+POLL_INTERVAL = 0.5
+#: Changes that happen together (e.g. an editor saving many files, or writing a file in steps) are checked once.
+DEBOUNCE_INTERVAL = 0.1
+
+# Events from ``/usr/include/linux/inotify.h``
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+INOTIFY_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class Watcher(metaclass=abc.ABCMeta):
+    """Wait until some files change."""
+
+    def __init__(self) -> None:
+        self.paths: set[Path] = set()
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Replace the watched files; they don't need to exist."""
+        self.paths = set(paths)
+
+    @abc.abstractmethod
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until some watched files change, and return them; an empty set if the timeout expires."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources of the watcher."""
+
+
+class PollingWatcher(Watcher):
+    """Compare the modification time and size of the watched files, every interval."""
+
+    def __init__(self, interval: float = POLL_INTERVAL) -> None:
+        super().__init__()
+        self.interval = interval
+        self._validators: dict[Path, str | None] = {}
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Replace the watched files, and take their current state."""
+        super().watch(paths)
+        self._validators = {path: stat_validator(path) for path in self.paths}
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Poll the files until some of them change."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.interval)
+            changed = {path for path, validator in self._validators.items() if stat_validator(path) != validator}
+            if changed:
+                self.watch(self.paths)
+                return changed
+        return set()
+
+
+class InotifyWatcher(Watcher):
+    """Watch the directories of the files with Linux inotify, so there's no polling.
+
+    Directories are watched instead of files, because editors usually save a file by replacing it.
+    Files in directories that don't exist yet are watched on their closest existing parent directory.
+
+    :raises OSError: If inotify is not available.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._directories: dict[int, Path] = {}
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        """Replace the watched files, adding and removing directory watches as needed."""
+        super().watch(paths)
+        wanted = {self._closest_directory(path) for path in self.paths}
+        for descriptor, directory in list(self._directories.items()):
+            if directory not in wanted:
+                self._libc.inotify_rm_watch(self._fd, descriptor)
+                del self._directories[descriptor]
+        for directory in wanted - set(self._directories.values()):
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), INOTIFY_MASK)
+            if descriptor < 0:
+                logger.warning(f"Directory not watched: {directory}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._directories[descriptor] = directory
+
+    @staticmethod
+    def _closest_directory(path: Path) -> Path:
+        return next(parent for parent in path.parents if parent.is_dir())
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Read events until some watched files change; then wait a little for related changes."""
+        changed: set[Path] = set()
+        while select.select([self._fd], [], [], timeout)[0]:
+            changed.update(self._read_events())
+            if changed:
+                timeout = DEBOUNCE_INTERVAL
+        return changed
+
+    def _read_events(self) -> set[Path]:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return set(self.paths)
+            directory = self._directories.get(descriptor)
+            if directory is None or not name:
+                continue
+            event_path = directory / name
+            changed.update(path for path in self.paths if path == event_path or event_path in path.parents)
+        return changed
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self._fd)
+
+
+def create_watcher() -> Watcher:
+    """Create a watcher with inotify on Linux, or one that polls the files on other systems."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as err:
+            logger.info(f"Polling files, inotify is not available: {err}")
+    return PollingWatcher()
+
+
+class WatchSession:
+    """Check a project again after each change, enforcing only the files affected by it.
+
+    The project (with its plugin manager) and its style manager (with its HTTP session and dynamic schema)
+    are kept in memory between runs.
+
+    - When the configuration, the lock file or a local style changes, the styles are merged again;
+      unchanged styles come from the caches, and only the files with a different expected config are enforced.
+    - When a configured file changes, only its plugins run again.
+
+    :param incremental: Reuse the violations of the previous incremental check on the first run,
+        and store the violations of each run for the next incremental check.
+    """
+
+    def __init__(self, nit: Nitpick, partial_names: Iterable[str] = (), *, jobs: int = 1, incremental=False) -> None:
+        self.nit = nit
+        self.partial_names = tuple(partial_names)
+        self.jobs = jobs
+        self.incremental = incremental
+        self._style_violations: list[Fuss] = []
+        self._style_paths: set[Path] = set()
+        self._merged = False
+        #: Hash of the expected config of each configured file, in the order of the merged style.
+        self._expected: dict[str, str] = {}
+        self._results: dict[str, list[Fuss]] = {}
+
+    @property
+    def paths(self) -> set[Path]:
+        """Files that change the violations: the configuration, the lock file, the local styles and the files."""
+        project = self.nit.project
+        files_section = project.nitpick_files_section
+        present_absent = {name for key in ("present", "absent") for name in files_section.get(key, {})}
+        return self._style_paths | set(self._file_keys()) | {(project.root / name).resolve() for name in present_absent}
+
+    def _file_keys(self) -> dict[Path, str]:
+        return {(self.nit.project.root / config_key).resolve(): config_key for config_key in self._expected}
+
+    def run(self, changed: set[Path] | None = None) -> list[Fuss]:
+        """Check the project, or only what was affected by the changed files.
+
+        :param changed: Files that changed since the previous run; None to check everything.
+        :return: All violations of the project, in the same order as a full check.
+        """
+        # Files changed since the previous run; they are scanned and read again
+        self.nit.project.snapshot.clear()
+        file_keys = self._file_keys()
+        # Changed files might have been created or removed, and then their tags are different
+        self.nit.project.forget_file_infos(file_keys[path] for path in changed or () if path in file_keys)
+        to_enforce: set[str] = set()
+        if changed is None or not self._merged or changed & self._style_paths:
+            try:
+                to_enforce = self._merge_styles()
+            except QuitComplainingError as err:
+                self._style_violations = list(err.violations)
+                return self._count(self._style_violations)
+
+        file_keys = self._file_keys()
+        to_enforce.update(file_keys[path] for path in changed or () if path in file_keys)
+        ordered = [config_key for config_key in self._expected if config_key in to_enforce]
+        logger.info(f"Enforcing {len(ordered)} files affected by the changes")
+        self._results.update(
+            self.nit.enforce_files(ordered, autofix=False, jobs=self.jobs, incremental=self.incremental)
+        )
+
+        return self._count(
+            [
+                *self._style_violations,
+                *self.nit.enforce_present_absent(*self.partial_names),
+                *chain.from_iterable(self._results[config_key] for config_key in self._expected),
+            ]
+        )
+
+    def _merge_styles(self) -> set[str]:
+        """Merge the styles again; return the files whose expected config changed."""
+        project = self.nit.project
+        self._merged = False
+        self._style_paths = {project.config_file_or_default().resolve(), project.lock_path.resolve()}
+        try:
+            self._style_violations = list(project.merge_styles(self.nit.offline))
+        finally:
+            self._style_paths.update(path.resolve() for path in project.local_style_paths())
+        self._merged = True
+
+        expected = {
+            config_key: hash_json(project.style_dict[config_key])
+            for config_key in filter_names(project.style_dict, *self.partial_names)
+        }
+        changed = {config_key for config_key, value in expected.items() if self._expected.get(config_key) != value}
+        self._expected = expected
+        self._results = {config_key: self._results[config_key] for config_key in expected if config_key not in changed}
+        return changed
+
+    @staticmethod
+    def _count(violations: list[Fuss]) -> list[Fuss]:
+        """Count the violations of this run, including the ones from previous runs that are still valid."""
+        Reporter.reset()
+        for fuss in violations:
+            Reporter.increment(fuss.fixed)
+        return violations
@@ -199,6 +199,15 @@ def test(  # pylint: disable=too-many-positional-arguments
         c.run("open htmlcov/index.html")
 
 
+@task(help={"backend": "Benchmark only this cache backend (sqlite, filesystem or memory)"})
+def benchmark(c: Context, backend: str = ""):
+    """Run the micro-benchmarks, and benchmark the fetch latency of the cache backends with 8 concurrent processes."""
+    backend_opt = f" --backend {backend}" if backend else ""
+    if not backend:
+        c.run("uv run pytest --benchmark -m benchmark")
+    c.run(f"uv run python tests/benchmark_cache_backends.py{backend_opt}")
+
+
 @task(
     help={
         "full": "Run all steps",
@@ -0,0 +1,108 @@
+"""Benchmark the remote style cache backends with many processes fetching styles at the same time.
+
+Each process opens its own session on the same cache directory, like parallel ``flake8 -j`` workers or pre-commit
+hooks do, and fetches styles from a local HTTP server with some artificial latency.
+It's not collected by pytest; run it with ``invoke benchmark`` or ``python tests/benchmark_cache_backends.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from requests_cache import CachedSession
+
+from nitpick.cache import create_cache_backend
+from nitpick.constants import CacheBackendEnum
+
+STYLE = '["pyproject.toml".tool.black]\nline-length = 100\n'
+
+
+class SlowStyleHandler(BaseHTTPRequestHandler):
+    """Serve the same style on any path, after a delay that simulates the network."""
+
+    delay = 0.0
+
+    def do_GET(self):
+        """Serve the style."""
+        time.sleep(self.delay)
+        body = STYLE.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Don't log requests."""
+
+
+def fetch_styles(backend: CacheBackendEnum, cache_dir: Path, urls: list[str], fetches: int) -> tuple[list[float], int]:
+    """Fetch styles in random order in a worker process; return the latency of each fetch and the number of errors."""
+    session = CachedSession(backend=create_cache_backend(backend, cache_dir), expire_after=-1)
+    latencies = []
+    errors = 0
+    for _ in range(fetches):
+        start = time.perf_counter()
+        try:
+            session.get(random.choice(urls)).raise_for_status()  # noqa: S311
+        except Exception:  # noqa: BLE001
+            errors += 1
+            traceback.print_exc()
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def run_backend(backend: CacheBackendEnum, base_url: str, args: argparse.Namespace) -> str:
+    """Run all processes on a fresh cache with one backend; return a line with the latency percentiles."""
+    urls = [f"{base_url}/style{index}.toml" for index in range(args.styles)]
+    with tempfile.TemporaryDirectory() as cache_dir, ProcessPoolExecutor(args.processes) as executor:
+        futures = [
+            executor.submit(fetch_styles, backend, Path(cache_dir), urls, args.fetches) for _ in range(args.processes)
+        ]
+        results = [future.result() for future in futures]
+    latencies = sorted(latency * 1000 for process_latencies, _ in results for latency in process_latencies)
+    errors = sum(process_errors for _, process_errors in results)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return (
+        f"{backend.value:<12} {percentiles[49]:>8.2f} {percentiles[94]:>8.2f} {latencies[-1]:>8.2f}"
+        f" {len(latencies):>7} {errors:>6}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark on all backends and print the fetch latency in milliseconds."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8, help="concurrent processes (default: %(default)s)")
+    parser.add_argument("--styles", type=int, default=50, help="distinct style URLs (default: %(default)s)")
+    parser.add_argument("--fetches", type=int, default=200, help="fetches per process (default: %(default)s)")
+    parser.add_argument("--delay", type=float, default=0.02, help="server latency in seconds (default: %(default)s)")
+    parser.add_argument("--backend", choices=[backend.value for backend in CacheBackendEnum], action="append")
+    args = parser.parse_args()
+
+    SlowStyleHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowStyleHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{args.processes} processes, {args.fetches} fetches each, {args.styles} styles; latency in ms")
+    print(f"{'backend':<12} {'p50':>8} {'p95':>8} {'max':>8} {'fetches':>7} {'errors':>6}")
+    try:
+        for backend in args.backend or [backend.value for backend in CacheBackendEnum]:
+            print(run_backend(CacheBackendEnum(backend), base_url, args), flush=True)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
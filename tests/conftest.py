@@ -18,6 +18,42 @@ from _pytest.logging import caplog as _caplog  # noqa: F401
 from loguru import logger
 from responses import RequestsMock
 
+#: Command line option to run the benchmarks; they compare wall-clock times, so they're not run by default.
+BENCHMARK_OPTION = "--benchmark"
+
+
+def pytest_addoption(parser):
+    """Add the option to run the benchmarks."""
+    parser.addoption(BENCHMARK_OPTION, action="store_true", help="run the benchmarks (tests marked with 'benchmark')")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks, unless they were asked for."""
+    if config.getoption(BENCHMARK_OPTION):
+        return
+    skip_benchmark = pytest.mark.skip(reason=f"benchmark; run it with {BENCHMARK_OPTION}")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_cache(monkeypatch):
+    """Don't use a shared cache configured on the machine running the tests."""
+    from nitpick.constants import CacheEnvVarEnum  # noqa: PLC0415
+
+    for env_var in CacheEnvVarEnum:
+        monkeypatch.delenv(env_var.as_envvar(), raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _user_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the data cached for all projects of the user (e.g. GitHub default branches) in a temporary dir."""
+    from nitpick.style import github_default_branch  # noqa: PLC0415
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("xdg_cache")))
+    github_default_branch.cache_clear()
+
 
 @pytest.fixture
 def project_default(tmp_path):
@@ -74,7 +110,7 @@ def caplog(_caplog):  # noqa: F811
             logging.getLogger(record.name).handle(record)
 
     handler_id = logger.add(PropogateHandler(), format="{message} {extra}")
-    from nitpick import PROJECT_NAME  # noqa: PLC0415
+    from nitpick.constants import PROJECT_NAME  # noqa: PLC0415
 
     logger.enable(PROJECT_NAME)
     yield _caplog
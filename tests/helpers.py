@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import subprocess
 import sys
 from pathlib import Path
 from pprint import pprint
@@ -385,12 +386,15 @@ class ProjectMock:
         violations=0,
         exception_class=None,
         exit_code: int | None = None,
+        jobs: int = 1,
+        incremental=False,
     ) -> ProjectMock:
         """Assert the expected CLI output for the chosen command."""
         if exit_code is None:
             exit_code = 1 if expected_str_or_lines else 0
+        options = ["--jobs", str(jobs), *(["--incremental"] if incremental else [])]
         result, actual, expected = self._simulate_cli(
-            "fix" if autofix else "check", expected_str_or_lines, exit_code=exit_code
+            "fix" if autofix else "check", expected_str_or_lines, *options, exit_code=exit_code
         )
         if exception_class:
             assert isinstance(result.exception, exception_class)
@@ -420,6 +424,28 @@ class ProjectMock:
         compare(actual=actual, expected=expected, prefix=f"Result: {result}")
         return self
 
+    def cli_cache(
+        self, subcommand: str, str_or_lines: StrOrList, *command_args: str, exit_code: int | None = None
+    ) -> ProjectMock:
+        """Run a cache subcommand and assert the output."""
+        result, actual, expected = self._simulate_cli(
+            "cache", str_or_lines, subcommand, *command_args, exit_code=exit_code
+        )
+        compare(actual=actual, expected=expected, prefix=f"Result: {result}")
+        return self
+
+    def cli_daemon(self, subcommand: str, str_or_lines: StrOrList, *, exit_code: int | None = None) -> ProjectMock:
+        """Run a daemon subcommand and assert the output."""
+        result, actual, expected = self._simulate_cli("daemon", str_or_lines, subcommand, exit_code=exit_code)
+        compare(actual=actual, expected=expected, prefix=f"Result: {result}")
+        return self
+
+    def cli_lock(self, str_or_lines: StrOrList, *, exit_code: int | None = None) -> ProjectMock:
+        """Run the lock command and assert the output."""
+        result, actual, expected = self._simulate_cli("lock", str_or_lines, exit_code=exit_code)
+        compare(actual=actual, expected=expected, prefix=f"Result: {result}")
+        return self
+
     def cli_init(
         self,
         expected_output: StrOrList,
@@ -477,6 +503,25 @@ class ProjectMock:
         return self
 
 
+def git(cwd: Path, *args: str) -> str:
+    """Run a Git command on a test repository."""
+    return subprocess.check_output(  # noqa: S603
+        ["git", "-c", "user.name=Nitpick", "-c", "user.email=nitpick@example.com", *args],  # noqa: S607
+        cwd=cwd,
+        text=True,
+    ).strip()
+
+
+def commit_styles(work_dir: Path, line_length: int) -> None:
+    """Commit a style that includes another one with a relative path, and push it."""
+    (work_dir / "python").mkdir(exist_ok=True)
+    (work_dir / "python" / "style.toml").write_text('[nitpick.styles]\ninclude = "../black.toml"\n')
+    (work_dir / "black.toml").write_text(f'["pyproject.toml".tool.black]\nline-length = {line_length}\n')
+    git(work_dir, "add", ".")
+    git(work_dir, "commit", "--quiet", "-m", f"Line length {line_length}")
+    git(work_dir, "push", "--quiet", "origin", "main")
+
+
 def filter_desired_warning(captured: list[warnings.WarningMessage], desired_message: str):
     """Filter only desired warnings.
 
@@ -0,0 +1,128 @@
+"""Batch runner tests."""
+
+from textwrap import dedent
+from unittest import mock
+
+import responses
+from click.testing import CliRunner
+
+from nitpick.batch import check_projects
+from nitpick.cache import PARSED_STYLES_DIR_NAME, user_cache_dir
+from nitpick.cli import nitpick_cli
+from nitpick.constants import PYTHON_PYPROJECT_TOML, CacheEnvVarEnum
+from nitpick.core import Nitpick
+from nitpick.violations import Fuss, ProjectViolations
+from tests.helpers import ProjectMock
+
+REMOTE_URL = "https://example.com/remote-style.toml"
+
+
+def make_project(root, line_length: int, style: str = REMOTE_URL) -> ProjectMock:
+    """Project with a style and the desired black line length."""
+    return ProjectMock(root).pyproject_toml(f"""
+        [tool.nitpick]
+        style = "{style}"
+        cache = "forever"
+
+        [tool.black]
+        line-length = {line_length}
+        """)
+
+
+@responses.activate
+def test_batch_command_shares_the_style_cache(tmp_path, monkeypatch):
+    """Each project has its own violations and exit code; the remote style is fetched and parsed only once."""
+    responses.add(responses.GET, REMOTE_URL, '["pyproject.toml".tool.black]\nline-length = 100', status=200)
+    for name, line_length in (("first", 120), ("second", 100), ("third", 100)):
+        make_project(tmp_path / name, line_length)
+    manifest = tmp_path / "projects.txt"
+    manifest.write_text("# Nightly\nfirst\n\nsecond\n")
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(nitpick_cli, ["batch", "--manifest", str(manifest), "third"])
+
+    assert result.output == dedent("""\
+        third: No violations found. ✨ 🍰 ✨
+        first/pyproject.toml:1: NIP319  has different values. Use this:
+        [tool.black]
+        line-length = 100
+        first: Violations: ❌ 1 to fix manually.
+        second: No violations found. ✨ 🍰 ✨
+        3 projects checked, 1 with violations.
+        """)
+    assert result.exit_code == 1
+    assert responses.assert_call_count(REMOTE_URL, 1)
+    assert len(list((user_cache_dir() / PARSED_STYLES_DIR_NAME).glob("*.json"))) == len([REMOTE_URL])
+    assert not list(tmp_path.glob("*/.cache/nitpick/styles*"))
+
+
+def test_projects_checked_in_a_process_pool(tmp_path):
+    """The results keep the order of the projects, and the singleton is not used."""
+    style = tmp_path / "style.toml"
+    style.write_text('["pyproject.toml".tool.black]\nline-length = 100')
+    roots = [make_project(tmp_path / f"project{index}", 100 + index % 2, style.as_uri()).root_dir for index in range(4)]
+    violation = Fuss(
+        False, PYTHON_PYPROJECT_TOML, 319, " has different values. Use this:", "[tool.black]\nline-length = 100"
+    )
+
+    with mock.patch.object(Nitpick, "singleton", side_effect=AssertionError) as singleton:
+        results = list(check_projects(roots, processes=2))
+
+    assert [result.root for result in results] == roots
+    assert [result.violations for result in results] == [[], [violation], [], [violation]]
+    assert [result.exit_code for result in results] == [0, 1, 0, 1]
+    singleton.assert_not_called()
+
+
+def test_unexpected_error_of_a_project(tmp_path):
+    """An unexpected error is reported on the project, and the other projects are still checked."""
+    style = tmp_path / "style.toml"
+    style.write_text('["pyproject.toml".tool.black]\nline-length = 100')
+    first, second = (make_project(tmp_path / name, 100, style.as_uri()).root_dir for name in ("first", "second"))
+    original_run = Nitpick.run
+
+    def run(self, *args, **kwargs):
+        if self.project.root == first:
+            msg = "boom"
+            raise RuntimeError(msg)
+        return original_run(self, *args, **kwargs)
+
+    with mock.patch.object(Nitpick, "run", run):
+        failed, checked = check_projects([first, second], offline=True)
+
+    assert (failed.error, failed.exit_code) == ("RuntimeError: boom", 2)
+    assert (checked.error, checked.exit_code) == ("", 0)
+
+
+def test_batch_command_does_not_change_the_environment(tmp_path, monkeypatch):
+    """The shared cache dir is passed to the projects, instead of being set on the environment of the process."""
+    style = tmp_path / "style.toml"
+    style.write_text('["pyproject.toml".tool.black]\nline-length = 100')
+    make_project(tmp_path / "project", 100, style.as_uri())
+    shared_dir = tmp_path / "shared"
+    monkeypatch.chdir(tmp_path)
+    original_run = Nitpick.run
+    environments = []
+
+    def run(self, *args, **kwargs):
+        environments.append(CacheEnvVarEnum.CACHE_DIR.get_environ())
+        return original_run(self, *args, **kwargs)
+
+    with mock.patch.object(Nitpick, "run", run):
+        result = CliRunner().invoke(nitpick_cli, ["batch", "--cache-dir", str(shared_dir), "project"])
+
+    assert result.exit_code == 0
+    assert environments == [""]
+    assert len(list((shared_dir / PARSED_STYLES_DIR_NAME).glob("*.json"))) == len([style])
+    assert not list(user_cache_dir().glob(f"{PARSED_STYLES_DIR_NAME}/*.json"))
+
+
+def test_project_without_root_has_the_exit_code_of_check(tmp_path):
+    """A project without a root dir stops with its violation, and the exit code is 2, like ``nitpick check``."""
+    empty = tmp_path / "empty"
+    empty.mkdir()
+
+    (result,) = check_projects([empty])
+
+    assert [fuss.pretty for fuss in result.violations] == [f"NIP101 {ProjectViolations.NO_ROOT_DIR.message}"]
+    assert (result.error, result.exit_code) == ("", 2)
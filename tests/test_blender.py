@@ -0,0 +1,243 @@
+"""Dictionary blender tests."""
+
+import json
+import timeit
+from collections.abc import Callable
+from functools import partial
+
+import pytest
+from flatten_dict import flatten, unflatten
+
+from nitpick.blender import (
+    ElementDetail,
+    ListDetail,
+    compile_jmespath,
+    filter_json,
+    flatten_quotes,
+    quote_reducer,
+    quotes_splitter,
+    search_json,
+    split_flat_key,
+    structural_hash,
+    unflatten_quotes,
+)
+from nitpick.config import SpecialConfig
+
+#: A style key with many tables, some of them with dotted names.
+BIG_CONFIG = {
+    f"tool{tool}": {
+        f"section.{index}" if index % 5 == 0 else f"section{index}": {
+            "key": index,
+            "list": [1, 2],
+            "nested": {"deep": "value", "empty": {}},
+        }
+        for index in range(20)
+    }
+    for tool in range(20)
+}
+
+
+def previous_flatten_quotes(dict_, separator="."):
+    """Flatten a dict keeping quotes in keys, with ``flatten_dict`` and a reducer (the previous implementation)."""
+    clean_dict = {}
+    for key, value in flatten(dict_, reducer=quote_reducer(separator)).items():
+        key_with_stripped_ends = key.strip('"')
+        clean_dict[key if key_with_stripped_ends.count('"') else key_with_stripped_ends] = value
+    return clean_dict
+
+
+previous_unflatten_quotes = partial(unflatten, splitter=quotes_splitter)
+
+
+def best_time_ratio(previous, current, *args) -> float:
+    """How many times the current function is faster than the previous one, with their best of many runs."""
+    best_previous = best_current = float("inf")
+    for _ in range(7):
+        best_previous = min(best_previous, timeit.timeit(partial(previous, *args), number=5))
+        best_current = min(best_current, timeit.timeit(partial(current, *args), number=5))
+    return best_previous / best_current
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"tool": {"black": {"line-length": 100}, "isort": {}}},
+        {"scripts.test": "jest", "a.b": {"c.d": {"e": 1}}, 'x."y.z"': 3, '"quoted"': {"key": 4}},
+        {"my key": {"tab\tkey": 1}, "'single'": {"back\\slash": 2}},
+        BIG_CONFIG,
+    ],
+)
+def test_flatten_and_unflatten_like_before(data):
+    """The flat keys, their order and the unflattened dict are the same as the previous implementation."""
+    flat = flatten_quotes(data)
+    assert list(flat.items()) == list(previous_flatten_quotes(data).items())
+    assert unflatten_quotes(flat) == previous_unflatten_quotes(flat)
+
+
+@pytest.mark.parametrize(
+    "flat_key", ["a.b.c", 'a."b.c".d', '"a.b"', 'a.""', "a..b", ".a", "a b.c", "a.'b.c'", 'a"b.c"', 'a\\".b', "a.b\n"]
+)
+def test_split_flat_key(flat_key):
+    """Flat keys are split like shlex does, with or without the fast paths."""
+    assert split_flat_key(flat_key) == quotes_splitter(flat_key)
+
+
+@pytest.mark.benchmark
+def test_flatten_is_faster():
+    """Micro-benchmark: the iterative flattener is faster than the one with a reducer."""
+    assert best_time_ratio(previous_flatten_quotes, flatten_quotes, BIG_CONFIG) > 1
+
+
+@pytest.mark.benchmark
+def test_unflatten_is_faster():
+    """Micro-benchmark: splitting keys without shlex is much faster, even before the keys are cached."""
+    flat = flatten_quotes(BIG_CONFIG)
+
+    def unflatten_cold(dict_):
+        split_flat_key.cache_clear()
+        return unflatten_quotes(dict_)
+
+    assert best_time_ratio(previous_unflatten_quotes, unflatten_cold, flat) > 2  # noqa: PLR2004
+    assert best_time_ratio(previous_unflatten_quotes, unflatten_quotes, flat) > 10  # noqa: PLR2004
+
+
+def previous_find_by_key(list_detail: ListDetail, desired: ElementDetail) -> ElementDetail | None:
+    """Find an element by key, scanning the whole list (the previous implementation, verbatim)."""
+    for actual in list_detail.elements:
+        if isinstance(desired.key, list):
+            if set(desired.key).issubset(set(actual.key)):
+                return actual
+        elif desired.key == actual.key:
+            return actual
+    return None
+
+
+def test_find_by_key_like_before():
+    """The index finds the same element as a scan: the first one with the key, or the first one containing it."""
+    actual = ListDetail.from_data(
+        [
+            {"name": "lint", "run": "make lint"},
+            "scalar",
+            {"name": "test", "run": "make test"},
+            {"hooks": [{"id": "black"}, {"id": "isort"}]},
+            {"name": "test", "run": "pytest"},
+            {"hooks": [{"id": "black"}, {"id": "flake8"}, {"id": "isort"}]},
+            {"name": {"nested": True}},
+            {"other": 1},
+        ],
+        "name",
+    )
+    expected = ListDetail.from_data(
+        [{"name": "test"}, {"name": "deploy"}, "scalar", {"name": {"nested": True}}, {"other": 1}], "name"
+    )
+    for desired in expected.elements:
+        assert actual.find_by_key(desired) is previous_find_by_key(actual, desired)
+
+    actual = ListDetail.from_data(actual.data, "hooks[].id")
+    expected = ListDetail.from_data(
+        [{"hooks": [{"id": "isort"}, {"id": "flake8"}]}, {"hooks": [{"id": "isort"}]}, {"hooks": [{"id": "x"}]}],
+        "hooks[].id",
+    )
+    for desired in expected.elements:
+        assert actual.find_by_key(desired) is previous_find_by_key(actual, desired)
+
+
+def test_find_children_like_jmespath():
+    """Children are found by the value of their child key, like a JMESPath filter; None when an index can't be used."""
+    element = ElementDetail.from_data(
+        0, {"hooks": [{"id": "black"}, {"id": 1}, "text", {"id": "black", "args": ["-q"]}, {"id": "isort"}]}, "id"
+    )
+    for value in ("black", "isort", "missing"):
+        assert element.find_children("hooks", "id", value) == search_json(element.data, f"hooks[?id=='{value}']", [])
+    assert element.find_children("missing", "id", "black") == []
+    assert element.find_children("hooks", "id", 1) is None
+    assert element.find_children("my-hooks", "id", "black") is None
+    assert element.find_children("hooks", "id", "it's") is None
+
+
+def match_long_keyed_lists(find) -> Callable[[], list[ElementDetail | None]]:
+    """Function that finds the elements of a long keyed list in another one, with a fresh index."""
+    steps = [{"name": f"Step {index}", "run": f"make step{index}"} for index in range(500)]
+    actual = ListDetail.from_data(steps, "name")
+    expected = ListDetail.from_data(list(reversed(steps)), "name")
+
+    def match():
+        fresh = ListDetail(actual.data, actual.elements)
+        return [find(fresh, desired) for desired in expected.elements]
+
+    return match
+
+
+def test_long_keyed_lists_match_like_before():
+    """The elements of long keyed lists are matched the same way as the scan of the previous implementation."""
+    assert match_long_keyed_lists(ListDetail.find_by_key)() == match_long_keyed_lists(previous_find_by_key)()
+
+
+@pytest.mark.benchmark
+def test_keyed_list_matching_is_linear():
+    """Micro-benchmark: matching the elements of two long keyed lists doesn't scan the actual list for each element."""
+    ratio = best_time_ratio(
+        match_long_keyed_lists(previous_find_by_key), match_long_keyed_lists(ListDetail.find_by_key)
+    )
+    assert ratio > 10  # noqa: PLR2004
+
+
+def test_structural_hash_is_canonical():
+    """Equal documents have equal hashes, regardless of key order; JSON types and list order make a difference."""
+    anchor = {"id": "black", "args": ["-q", 1.5, None]}
+    document = {"repos": [{"hooks": [anchor, anchor]}], "flag": True}
+    same = json.loads(json.dumps({"flag": True, "repos": [{"hooks": [dict(reversed(anchor.items()))] * 2}]}))
+    assert structural_hash(document) == structural_hash(same)
+
+    different = [
+        {"repos": [{"hooks": [anchor]}], "flag": True},
+        {"repos": [{"hooks": [anchor, anchor]}], "flag": 1},
+        {"repos": [{"hooks": [anchor, anchor]}], "flag": "True"},
+        {"repos": [{"hooks": [anchor, {"id": "black", "args": [1.5, "-q", None]}]}], "flag": True},
+        {"repos": [{"hooks": [anchor, anchor]}], "flag": True, "other": None},
+    ]
+    assert len({structural_hash(data) for data in [document, *different]}) == len(different) + 1
+
+
+def test_equal_elements_have_the_same_digest():
+    """Equal elements have the same digest and are matched by their canonical JSON when they have no key."""
+    actual = ListDetail.from_data([{"b": 1, "a": [1, 2]}, {"a": [2, 1], "b": 1}, "text"], "missing")
+    expected = ListDetail.from_data([{"a": [1, 2], "b": 1}], "missing")
+    first, second, text = actual.elements
+    assert expected.elements[0].digest == first.digest != second.digest
+    assert expected.elements[0].key == first.key == first.compact == '{"a":[1,2],"b":1}'
+    assert actual.find_by_key(expected.elements[0]) is first
+    assert expected.elements[0].same_data(first)
+    assert text.key == text.compact == "text"
+
+
+def test_colliding_digests_are_not_the_same_data():
+    """Different elements with the same digest (``hash(-1) == hash(-2)``) have different keys and different data."""
+    actual = ListDetail.from_data([{"args": [-2]}], "missing")
+    expected = ListDetail.from_data([{"args": [-1]}], "missing")
+    assert actual.elements[0].digest == expected.elements[0].digest
+    assert not actual.elements[0].same_data(expected.elements[0])
+    assert actual.find_by_key(expected.elements[0]) is None
+
+
+def test_filter_json_like_a_filter_expression():
+    """The parametrised filter finds the same children as a JMESPath filter, without compiling an expression per value."""
+    data = {"repos": [{"hooks": [{"id": "black"}, {"id": 1}, "text", {"id": "black", "args": ["-q"]}]}, {"hooks": 1}]}
+    values = ("black", "1", "missing")
+    compile_jmespath.cache_clear()
+    filtered = [filter_json(data, f"repos[{index}].hooks", "id", value, []) for index in (0, 1) for value in values]
+    assert compile_jmespath.cache_info().currsize == len(["repos[0].hooks", "repos[1].hooks", "id"])
+    assert filtered == [
+        search_json(data, f"repos[{index}].hooks[?id=='{value}']", []) for index in (0, 1) for value in values
+    ]
+
+
+def test_list_keys_are_compiled_once():
+    """The list keys of a special config are compiled once, and the same expressions are reused by the comparisons."""
+    special_config = SpecialConfig()
+    special_config.list_keys.value = {"repos": "hooks.id", "steps": "name"}
+    repos = special_config.list_key("repos")
+    assert (repos.parent_key, repos.child_key, repos.expression.expression) == ("hooks", "id", "hooks[].id")
+    assert special_config.list_key("repos") is repos
+    assert special_config.list_key("steps").expression is compile_jmespath("name")
+    assert special_config.list_key("other").expression is None
@@ -1,13 +1,41 @@
 """Test cache."""
 
-from datetime import timedelta
+import sqlite3
+import tarfile
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from textwrap import dedent
+from unittest import mock
 
 import pytest
+import requests
+import responses
 from freezegun import freeze_time
+from requests_cache import SQLiteCache
 from requests_cache.policy.expiration import DO_NOT_CACHE, NEVER_EXPIRE
 
-from nitpick.constants import CachingEnum
-from nitpick.style import parse_cache_option
+from nitpick.cache import (
+    CACHE_INDEX_NAME,
+    MERGED_STYLE_FINGERPRINT_PREFIX,
+    PARSED_STYLES_DIR_NAME,
+    STYLES_FILES_DIR_NAME,
+    create_cache_backend,
+)
+from nitpick.constants import (
+    MERGED_STYLE_TOML,
+    NITPICK_STYLE_TOML,
+    PYTHON_PYPROJECT_TOML,
+    READ_THE_DOCS_URL,
+    CacheBackendEnum,
+    CacheEnvVarEnum,
+    CachingEnum,
+    EmojiEnum,
+)
+from nitpick.core import Nitpick
+from nitpick.style import ConfigValidator, StyleManager, parse_cache_option
+from nitpick.violations import Fuss
+from tests.helpers import SUGGESTION_BEGIN, SUGGESTION_END, ProjectMock
 
 
 @pytest.mark.tool_nitpick("cache = 'forever'")
@@ -71,6 +99,11 @@ def test_never(project_remote):
         ("   ", CachingEnum.EXPIRES, timedelta(hours=1)),
         (" 1 second ", CachingEnum.EXPIRES, timedelta(hours=1)),
         (" 2 bananas ", CachingEnum.EXPIRES, timedelta(hours=1)),
+        ("1 day, stale-if-error", CachingEnum.EXPIRES, timedelta(days=1)),
+        ("stale-while-revalidate; 2 weeks", CachingEnum.EXPIRES, timedelta(weeks=2)),
+        ("Forever STALE-IF-ERROR", CachingEnum.FOREVER, NEVER_EXPIRE),
+        ("never, stale-while-revalidate", CachingEnum.NEVER, DO_NOT_CACHE),
+        ("stale-if-error", CachingEnum.EXPIRES, timedelta(hours=1)),
     ],
 )
 def test_parse_cache_option(cache_option, expected_enum, expected_timedelta):
@@ -136,3 +169,420 @@ def test_default_cache_when_nothing_provided(project_remote):
         # Time's up: another HTTP request
         frozen_datetime.move_to("2021-03-16 12:01")
         project_remote.api_check().assert_violations().assert_call_count(2)
+
+
+def test_parsed_styles_are_cached(tmp_path):
+    """Unchanged styles are not parsed and validated again; the cached flat dict is merged directly."""
+    project = ProjectMock(tmp_path).style(
+        """
+        ["pyproject.toml".tool.black]
+        line-length = 100
+
+        [xxx]
+        wrong = "section"
+        """
+    )
+    project.pyproject_toml("[tool.black]\nline-length = 100")
+    expected = Fuss(
+        False,
+        NITPICK_STYLE_TOML,
+        1,
+        " has an incorrect style. Invalid config:",
+        f"xxx: Unknown file. See {READ_THE_DOCS_URL}plugins.html.",
+    )
+    project.api_check().assert_violations(expected)
+    parsed_dir = project.cache_dir / PARSED_STYLES_DIR_NAME
+    first_run = list(parsed_dir.glob("*.json"))
+    assert len(first_run) == 1
+
+    with mock.patch.object(ConfigValidator, "validate") as mocked_validate:
+        project.api_check().assert_violations(expected)
+    mocked_validate.assert_not_called()
+
+    # A changed style is validated again
+    project.style(
+        """
+        ["pyproject.toml".tool.black]
+        line-length = 120
+        """
+    ).api_check().assert_violations(
+        Fuss(
+            False,
+            PYTHON_PYPROJECT_TOML,
+            319,
+            " has different values. Use this:",
+            """
+            [tool.black]
+            line-length = 120
+            """,
+        )
+    )
+    assert len(list(parsed_dir.glob("*.json"))) == len(first_run) + 1
+
+
+def spy_find_initial_styles():
+    """Spy on the method that fetches, parses, validates and merges the styles."""
+    return mock.patch.object(
+        StyleManager, "find_initial_styles", autospec=True, side_effect=StyleManager.find_initial_styles
+    )
+
+
+def test_merged_style_snapshot_is_reused(tmp_path):
+    """The merged style is loaded from the snapshot until a style or a configured file changes."""
+    project = ProjectMock(tmp_path).style(
+        """
+        ["pyproject.toml".tool.black]
+        line-length = 100
+
+        ["tox.ini".flake8]
+        max-line-length = 100
+        """
+    )
+    project.pyproject_toml("[tool.black]\nline-length = 100")
+    missing_tox = Fuss(
+        False,
+        "tox.ini",
+        321,
+        " was not found. Create it with this content:",
+        """
+        [flake8]
+        max-line-length = 100
+        """,
+    )
+    project.api_check().assert_violations(missing_tox)
+    merged_style = project.cache_dir / MERGED_STYLE_TOML
+    assert merged_style.read_text().startswith(MERGED_STYLE_FINGERPRINT_PREFIX)
+
+    with spy_find_initial_styles() as spy:
+        project.api_check().assert_violations(missing_tox)
+    spy.assert_not_called()
+
+    # Creating a file configured on the style invalidates the snapshot
+    project.save_file("tox.ini", "[flake8]\nmax-line-length = 100")
+    with spy_find_initial_styles() as spy:
+        project.api_check().assert_violations()
+    spy.assert_called_once()
+
+    # So does changing the style
+    project.style(
+        """
+        ["pyproject.toml".tool.black]
+        line-length = 120
+        """
+    )
+    with spy_find_initial_styles() as spy:
+        project.api_check().assert_violations(
+            Fuss(
+                False,
+                PYTHON_PYPROJECT_TOML,
+                319,
+                " has different values. Use this:",
+                """
+                [tool.black]
+                line-length = 120
+                """,
+            )
+        )
+    spy.assert_called_once()
+
+
+def test_cached_styles_check_files_in_the_project_root(tmp_path, monkeypatch):
+    """Files configured on cached styles are checked in the project root, not in the current dir."""
+    project = ProjectMock(tmp_path / "project").style(
+        """
+        [myscript]
+        key = 1
+        """
+    )
+    project.save_file("myscript", "#!/bin/bash\necho hi")
+    monkeypatch.chdir(tmp_path)
+
+    def style_errors() -> list[str]:
+        return [fuss.suggestion for fuss in Nitpick.create(project.root_dir).run()]
+
+    assert style_errors() == [f"myscript.key: Unknown configuration. See {READ_THE_DOCS_URL}plugins.html#text-files."]
+    (project.root_dir / "myscript").unlink()
+    assert style_errors() == [f"myscript: Unknown file. See {READ_THE_DOCS_URL}plugins.html."]
+
+
+def test_merged_style_snapshot_expires_with_remote_cache(project_remote):
+    """A snapshot with remote styles is reused only while the cached responses are fresh."""
+    with freeze_time("2021-03-15 10:00") as frozen_datetime:
+        project_remote.api_check().assert_violations().assert_call_count(1)
+
+        with spy_find_initial_styles() as spy:
+            project_remote.api_check().assert_violations().assert_call_count(1)
+        spy.assert_not_called()
+
+        frozen_datetime.move_to("2021-03-15 11:01")
+        with spy_find_initial_styles() as spy:
+            project_remote.api_check().assert_violations().assert_call_count(2)
+        spy.assert_called_once()
+
+
+REMOTE_URL = "https://example.com/remote-style.toml"
+REMOTE_STYLE = """
+    ["pyproject.toml".tool.black]
+    line-length = 100
+"""
+
+
+def remote_project(tmp_path, cache_option: str) -> ProjectMock:
+    """Project with a remote style and the desired cache option."""
+    return ProjectMock(tmp_path).pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "{REMOTE_URL}"
+        cache = "{cache_option}"
+
+        [tool.black]
+        line-length = 100
+        """
+    )
+
+
+@responses.activate
+def test_stale_if_error(tmp_path):
+    """An expired style is used when the network fails."""
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200)
+    project = remote_project(tmp_path, "1 hour, stale-if-error")
+    with freeze_time("2021-03-15 10:00") as frozen_datetime:
+        project.api_check().assert_violations()
+
+        frozen_datetime.move_to("2021-03-15 11:01")
+        responses.replace(responses.GET, REMOTE_URL, body=requests.ConnectionError("Network is unreachable"))
+        project.api_check().assert_violations()
+
+        responses.replace(responses.GET, REMOTE_URL, status=500)
+        project.api_check().assert_violations()
+    assert responses.assert_call_count(REMOTE_URL, 3)
+
+
+@responses.activate
+def test_stale_while_revalidate(tmp_path):
+    """An expired style is used right away, and revalidated in the background with its ETag."""
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200, headers={"ETag": '"v1"'})
+    project = remote_project(tmp_path, "1 hour, stale-while-revalidate")
+    with freeze_time("2021-03-15 10:00") as frozen_datetime:
+        project.api_check().assert_violations()
+
+        frozen_datetime.move_to("2021-03-15 11:01")
+        responses.replace(responses.GET, REMOTE_URL, status=304, headers={"ETag": '"v1"'})
+        project.api_check().assert_violations()
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+
+    assert responses.assert_call_count(REMOTE_URL, 2)
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+
+@responses.activate
+def test_not_found_is_cached_for_a_short_time(tmp_path):
+    """A style that was not found is requested again only after a few minutes."""
+    responses.add(responses.GET, REMOTE_URL, status=404)
+    project = remote_project(tmp_path, "1 day")
+    with freeze_time("2021-03-15 10:00") as frozen_datetime:
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                project.api_check()
+        assert responses.assert_call_count(REMOTE_URL, 1)
+
+        frozen_datetime.move_to("2021-03-15 10:06")
+        with pytest.raises(requests.HTTPError):
+            project.api_check()
+        assert responses.assert_call_count(REMOTE_URL, 2)
+
+
+@responses.activate
+def test_shared_cache_across_projects(tmp_path, monkeypatch):
+    """Projects on the same machine share the remote style cache configured with an environment variable."""
+    shared_dir = tmp_path / "shared"
+    monkeypatch.setenv(CacheEnvVarEnum.CACHE_DIR.as_envvar(), str(shared_dir))
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200)
+
+    for name in ("first", "second", "third"):
+        remote_project(tmp_path / name, "forever").api_check().assert_violations()
+    assert responses.assert_call_count(REMOTE_URL, 1)
+    assert (shared_dir / CACHE_INDEX_NAME).exists()
+    assert not list(tmp_path.glob("*/.cache/nitpick/styles*"))
+
+
+@responses.activate
+def test_shared_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    """When the shared cache is full, the least recently used styles are evicted."""
+    monkeypatch.setenv(CacheEnvVarEnum.CACHE_DIR.as_envvar(), str(tmp_path / "shared"))
+    style = dedent(REMOTE_STYLE)
+    monkeypatch.setenv(CacheEnvVarEnum.CACHE_MAX_SIZE.as_envvar(), str(len(style) * 2))
+    urls = [f"https://example.com/style-{index}.toml" for index in range(3)]
+    for url in urls:
+        responses.add(responses.GET, url, style, status=200)
+
+    def check(url: str) -> None:
+        ProjectMock(tmp_path / "project").pyproject_toml(
+            f"""
+            [tool.nitpick]
+            style = "{url}"
+            cache = "forever"
+
+            [tool.black]
+            line-length = 100
+            """
+        ).api_check().assert_violations()
+
+    check(urls[0])
+    check(urls[1])
+    check(urls[0])  # Cached, and now more recently used than the second style
+    check(urls[2])  # The second style is evicted
+    assert sum(responses.assert_call_count(url, 1) for url in urls) == len(urls)
+
+    check(urls[0])
+    check(urls[1])
+    assert responses.assert_call_count(urls[0], 1)
+    assert responses.assert_call_count(urls[1], 2)
+
+
+@responses.activate
+def test_cache_warm_stats_and_prune(tmp_path):
+    """Warm the cache before running checks, show its usage, and prune it by age."""
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200)
+    project = remote_project(tmp_path, "forever")
+    project.cli_cache("warm", f"Styles cached in {project.cache_dir}. {EmojiEnum.STAR_CAKE.value}")
+
+    (project.cache_dir / MERGED_STYLE_TOML).unlink()
+    with freeze_time():
+        project.api_check().assert_violations()
+        size = len(dedent(REMOTE_STYLE))
+        project.cli_cache(
+            "stats",
+            f"""
+            {"URL".ljust(len(REMOTE_URL))}  Hits  Misses  Size  Age
+            {REMOTE_URL}  1     1       {size} B  0 seconds
+            Total: 1 style, {size} B, 1 hit, 1 miss
+            """,
+        )
+    assert responses.assert_call_count(REMOTE_URL, 1)
+
+    project.cli_cache("prune", "0 cached files evicted.", "--older-than", "1 day")
+    with freeze_time(datetime.now() + timedelta(days=2)):  # noqa: DTZ005
+        project.cli_cache("prune", "2 cached files evicted.", "--older-than", "1 day")
+    project.cli_cache("stats", "No cached styles.")
+
+
+@responses.activate
+def test_cache_prune_by_size(tmp_path):
+    """The least recently used styles are evicted until the cache is smaller than the desired size."""
+    style = dedent(REMOTE_STYLE)
+    urls = [f"https://example.com/style-{index}.toml" for index in range(2)]
+    for url in urls:
+        responses.add(responses.GET, url, style, status=200)
+        ProjectMock(tmp_path).pyproject_toml(
+            f"""
+            [tool.nitpick]
+            style = "{url}"
+
+            [tool.black]
+            line-length = 100
+            """
+        ).api_check().assert_violations()
+
+    project = ProjectMock(tmp_path)
+    project.cli_cache("prune", "Nothing to do. Use --older-than and/or --max-size.")
+    project.cli_cache(
+        "prune",
+        """
+        Usage: nitpick-cli cache prune [OPTIONS]
+        Try 'nitpick-cli cache prune --help' for help.
+
+        Error: Invalid value for '--max-size': 'huge' is not a size like '500KB', '50MB' or '1GB'
+        """,
+        "--max-size",
+        "huge",
+        exit_code=2,
+    )
+    project.cli_cache("prune", "1 cached file evicted.", "--max-size", str(len(style)))
+    with freeze_time():
+        # The index was updated a moment ago, when the style was downloaded
+        project.cli_cache(
+            "stats",
+            f"""
+            {"URL".ljust(len(urls[1]))}  Hits  Misses  Size  Age
+            {urls[1]}  0     1       {len(style)} B  0 seconds
+            Total: 1 style, {len(style)} B, 0 hits, 1 miss
+            """,
+        )
+
+
+@responses.activate
+def test_cache_export_and_import(tmp_path):
+    """A warm cache can be moved to another machine, which then needs no network round-trips."""
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200)
+    tarball = tmp_path / "cache.tar.gz"
+    first = remote_project(tmp_path / "first", "forever")
+    first.cli_cache("warm", f"Styles cached in {first.cache_dir}. {EmojiEnum.STAR_CAKE.value}")
+    first.cli_cache("export", f"4 cached files exported to {tarball}.", str(tarball))
+
+    second = remote_project(tmp_path / "second", "forever")
+    second.cli_cache("import", f"4 cached files imported from {tarball}.", str(tarball))
+    second.api_check().assert_violations()
+    assert responses.assert_call_count(REMOTE_URL, 1)
+
+
+def test_import_unsafe_tarball(tmp_path):
+    """Tarballs with paths outside the cache dir are not imported."""
+    tarball = tmp_path / "cache.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        tar.add(__file__, arcname="../evil.py")
+    ProjectMock(tmp_path / "project").cli_cache(
+        "import",
+        "The cache could not be imported: Unexpected member in the cache tarball: ../evil.py",
+        str(tarball),
+        exit_code=2,
+    )
+    assert not (tmp_path / "evil.py").exists()
+
+
+@responses.activate
+@pytest.mark.parametrize(
+    ("backend", "cached_files", "expected_calls"),
+    [("sqlite", "styles.sqlite", 1), ("filesystem", STYLES_FILES_DIR_NAME, 1), ("memory", None, 2)],
+)
+def test_cache_backends(tmp_path, backend, cached_files, expected_calls):
+    """Remote styles are cached in the chosen backend; the memory backend lasts only for one run."""
+    responses.add(responses.GET, REMOTE_URL, dedent(REMOTE_STYLE), status=200)
+    project = ProjectMock(tmp_path).pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "{REMOTE_URL}"
+        cache = "forever"
+        cache_backend = "{backend}"
+
+        [tool.black]
+        line-length = 100
+        """
+    )
+    for _ in range(2):
+        project.api_check().assert_violations()
+    responses.assert_call_count(REMOTE_URL, expected_calls)
+    if cached_files:
+        assert (project.cache_dir / cached_files).exists()
+
+
+def test_sqlite_cache_uses_write_ahead_log(tmp_path):
+    """Concurrent processes can read the SQLite cache while another one writes to it."""
+    backend = create_cache_backend(CacheBackendEnum.SQLITE, tmp_path)
+    assert isinstance(backend, SQLiteCache)
+    backend.responses["key"] = "value"
+    with closing(sqlite3.connect(backend.responses.db_path)) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_invalid_cache_backend(tmp_path):
+    """An unknown cache backend is reported as invalid configuration."""
+    ProjectMock(tmp_path).pyproject_toml(
+        '[tool.nitpick]\nstyle = "some_file"\ncache_backend = "redis"'
+    ).flake8().assert_errors_contain(
+        "NIP001 File pyproject.toml has an incorrect style. Invalid data in [tool.nitpick]:"
+        f"{SUGGESTION_BEGIN}\ncache_backend: Must be one of: sqlite, filesystem, memory.{SUGGESTION_END}",
+        1,
+    )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest import mock
@@ -9,6 +11,7 @@ from unittest import mock
 import pytest
 
 from nitpick import __version__
+from nitpick.cache import RESULTS_STATE_NAME
 from nitpick.constants import (
     CONFIG_KEY_IGNORE_STYLES,
     CONFIG_KEY_STYLE,
@@ -17,11 +20,29 @@ from nitpick.constants import (
     PYTHON_PYPROJECT_TOML,
     EmojiEnum,
 )
+from nitpick.plugins.toml import TomlPlugin
 from tests.helpers import BLANK_LINE, OSAgnosticPaths, ProjectMock
 
 if TYPE_CHECKING:
     from collections.abc import Generator
 
+#: Modules needed only to check a project; commands that don't check anything shouldn't import them.
+CHECK_MODULES = {
+    "dictdiffer",
+    "flake8",
+    "jmespath",
+    "marshmallow",
+    "nitpick.blender",
+    "nitpick.core",
+    "nitpick.style",
+    "requests_cache",
+    "ruamel.yaml",
+    "tomlkit",
+}
+
+#: Budget of the cumulative import time of the CLI module, in microseconds (as reported by ``python -X importtime``).
+CLI_IMPORT_TIME_BUDGET = 300_000
+
 
 def test_simple_error(tmp_path: Path) -> None:
     """A simple error on the CLI."""
@@ -263,3 +284,171 @@ def test_use_custom_library_dir(shared_datadir: Path, tmp_path: Path, fix: bool,
         )
     else:
         assert not (tmp_path / DOT_NITPICK_TOML).exists()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_files_enforced_concurrently_keep_their_order(tmp_path: Path, jobs: int) -> None:
+    """Files are enforced at the same time with --jobs, but violations are displayed in the order of the style."""
+    project = ProjectMock(tmp_path).style("""
+        ["pyproject.toml".tool.black]
+        line-length = 100
+
+        ["setup.cfg".flake8]
+        max-line-length = 100
+
+        ["tox.ini".tox]
+        envlist = "py311"
+
+        [".editorconfig"]
+        root = true
+        """)
+    expected = f"""
+        {project.root_dir / "pyproject.toml"!s}:1: NIP311  was not found. Create it with this content:
+        [tool.black]
+        line-length = 100
+        {project.root_dir / "setup.cfg"!s}:1: NIP321  was not found. Create it with this content:
+        [flake8]
+        max-line-length = 100
+        {project.root_dir / "tox.ini"!s}:1: NIP321  was not found. Create it with this content:
+        [tox]
+        envlist = py311
+        {project.root_dir / ".editorconfig"!s}:1: NIP321  was not found. Create it with this content:
+        root = True
+        """
+    project.cli_run(expected, jobs=jobs)
+    project.cli_run(expected, autofix=True, jobs=jobs)
+    project.cli_run(jobs=jobs)
+
+
+@pytest.fixture
+def spy_toml_rules() -> Generator[mock.MagicMock, None, None]:
+    """Spy on the rules enforced by the TOML plugin."""
+    with mock.patch.object(TomlPlugin, "enforce_rules", autospec=True, side_effect=TomlPlugin.enforce_rules) as spy:
+        yield spy
+
+
+def test_incremental_check_reuses_violations_of_unchanged_files(tmp_path: Path, spy_toml_rules) -> None:
+    """Files that didn't change since the previous incremental check are not checked again."""
+    project = (
+        ProjectMock(tmp_path)
+        .style("""
+            ["pyproject.toml".tool.black]
+            line-length = 100
+            """)
+        .pyproject_toml("""
+            [tool.black]
+            line-length = 120
+            """)
+    )
+    expected = f"""
+        {project.root_dir / "pyproject.toml"!s}:1: NIP319  has different values. Use this:
+        [tool.black]
+        line-length = 100
+        """
+    for _ in range(2):
+        project.cli_run(expected, violations=1, incremental=True)
+    spy_toml_rules.assert_called_once()
+    assert project.cache_dir.joinpath(RESULTS_STATE_NAME).exists()
+
+    # Without the option, the previous results are ignored
+    project.cli_run(expected, violations=1)
+    assert spy_toml_rules.call_count == len(["first incremental run", "run without --incremental"])
+
+    project.pyproject_toml("""
+        [tool.black]
+        line-length = 100
+        """)
+    project.cli_run(incremental=True)
+    project.cli_run(incremental=True)
+    assert spy_toml_rules.call_count == len(["first incremental run", "run without --incremental", "changed file"])
+
+
+def test_incremental_check_creates_plugins_only_for_changed_files(tmp_path: Path) -> None:
+    """The violations of unchanged files are reused before their plugins are created."""
+    project = (
+        ProjectMock(tmp_path)
+        .style("""
+            ["pyproject.toml".tool.black]
+            line-length = 100
+
+            ["setup.cfg".flake8]
+            max-line-length = 100
+            """)
+        .pyproject_toml("[tool.black]\nline-length = 100")
+        .setup_cfg("[flake8]\nmax-line-length = 100")
+    )
+    with mock.patch.object(TomlPlugin, "__init__", autospec=True, side_effect=TomlPlugin.__init__) as toml_init:
+        project.cli_run(incremental=True)
+        assert toml_init.call_count == 1
+        project.cli_run(incremental=True)
+        assert toml_init.call_count == 1
+
+        project.setup_cfg("[flake8]\nmax-line-length = 120")
+        project.cli_run(
+            f"""
+            {project.root_dir / "setup.cfg"!s}:1: NIP323 : [flake8]max-line-length is 120 but it should be like this:
+            [flake8]
+            max-line-length = 100
+            """,
+            violations=1,
+            incremental=True,
+        )
+        assert toml_init.call_count == 1
+
+
+def test_plugin_can_opt_out_of_incremental_checks(tmp_path: Path, spy_toml_rules) -> None:
+    """A plugin without a fingerprint always enforces its files."""
+    project = ProjectMock(tmp_path).style("""
+        ["pyproject.toml".tool.black]
+        line-length = 100
+        """)
+    project.pyproject_toml("[tool.black]\nline-length = 100")
+    with mock.patch.object(TomlPlugin, "fingerprint", return_value=None):
+        project.cli_run(incremental=True)
+        project.cli_run(incremental=True)
+    assert spy_toml_rules.call_count == len(["first run", "second run"])
+
+
+def import_times(*args: str, cwd: Path | None = None) -> dict[str, int]:
+    """Run a command in a new interpreter, and return the cumulative import time of each module, in microseconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-m", "nitpick", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=cwd,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_version_imports_no_check_modules() -> None:
+    """Commands that don't check a project don't import the modules needed to check it."""
+    assert not CHECK_MODULES.intersection(import_times("--version"))
+
+
+@pytest.mark.benchmark
+def test_cli_import_time_budget() -> None:
+    """Commands that don't check a project start quickly; the best of a few runs is compared with the budget."""
+    runs = [import_times("--version") for _ in range(3)]
+    assert min(times["nitpick.cli"] for times in runs) < CLI_IMPORT_TIME_BUDGET
+
+
+def test_commands_import_only_what_they_use(tmp_path: Path) -> None:
+    """Listing the files of a TOML style doesn't import flake8, nor the plugins of other file types."""
+    project = ProjectMock(tmp_path).style("""
+        ["pyproject.toml".tool.black]
+        line-length = 100
+        """)
+    # The first run discovers the plugins
+    import_times("ls", cwd=project.root_dir)
+
+    times = import_times("ls", cwd=project.root_dir)
+    assert "nitpick.core" in times
+    assert not {"flake8", "configupdater", "nitpick.plugins.ini", "nitpick.plugins.yaml"}.intersection(times)
@@ -0,0 +1,167 @@
+"""Daemon and thin client tests."""
+
+import os
+import threading
+from datetime import timedelta
+from textwrap import dedent
+
+import pytest
+import responses
+from click.exceptions import Exit
+
+from nitpick import __version__, client
+from nitpick.constants import PYTHON_PYPROJECT_TOML, CacheEnvVarEnum, Flake8OptionEnum
+from nitpick.core import Nitpick
+from nitpick.daemon import DaemonServer, log_path, start_daemon, stop_daemon
+from tests.helpers import ProjectMock
+
+# The client and the daemon talk over a Unix socket
+pytestmark = pytest.mark.enable_socket
+
+STYLE = """
+    ["pyproject.toml".tool.black]
+    line-length = 100
+    """
+VIOLATION = """
+    pyproject.toml:1: NIP319  has different values. Use this:
+    [tool.black]
+    line-length = 100
+    """
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Project with a violation, and a dir for the daemon sockets."""
+    runtime_dir = tmp_path / "run"
+    runtime_dir.mkdir()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    project = ProjectMock(tmp_path / "project").style(STYLE).pyproject_toml("[tool.black]\nline-length = 120")
+    monkeypatch.chdir(project.root_dir)
+    return project
+
+
+@pytest.fixture
+def daemon(project):
+    """Serve the project on a daemon running in a thread."""
+    Nitpick.singleton.cache_clear()
+    server = DaemonServer(Nitpick.singleton().init(project.root_dir))
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    stop_daemon(project.root_dir)
+    thread.join()
+
+
+def test_client_runs_commands_on_the_daemon(project, daemon, capsys):
+    """The output and exit code of the commands are the same as the CLI."""
+    assert client.ping(project.root_dir) == daemon.status()
+    project.cli_run(VIOLATION, violations=1)
+
+    assert client.forward(project.root_dir, "check", []) == 1
+    assert capsys.readouterr().out == f"{dedent(VIOLATION).lstrip()}Violations: ❌ 1 to fix manually.\n"
+
+    assert client.forward(project.root_dir, "ls", ["toml"]) == 0
+    assert capsys.readouterr().out.splitlines() == [PYTHON_PYPROJECT_TOML]
+
+    assert client.forward(project.root_dir, "check", ["--invalid"]) == Exit(2).exit_code
+    assert "Error: No such option '--invalid'." in capsys.readouterr().err
+
+    assert client.forward(project.root_dir, "fix", []) == 1
+    assert capsys.readouterr().out.splitlines()[-1] == "Violations: ✅ 1 fixed."
+    assert client.forward(project.root_dir, "check", []) == 0
+    assert capsys.readouterr().out.splitlines() == ["No violations found. ✨ 🍰 ✨"]
+
+
+@pytest.mark.usefixtures("daemon")
+def test_client_runs_commands_in_its_process_without_a_daemon(project, monkeypatch, capsys):
+    """Other commands, or commands from another version of Nitpick, run in the client process."""
+    monkeypatch.setattr(client, "__version__", "0.0.1")
+    assert client.forward(project.root_dir, "check", []) is None
+    assert capsys.readouterr().out == ""
+
+    stop_daemon(project.root_dir)
+    assert client.ping(project.root_dir) is None
+    assert client.forward(project.root_dir, "check", []) is None
+
+    with pytest.raises(SystemExit) as exit_info:
+        client.main(["ls"])
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out.splitlines() == [PYTHON_PYPROJECT_TOML]
+
+
+@pytest.mark.usefixtures("daemon")
+def test_client_finds_the_daemon_from_a_subdir(project, monkeypatch, capsys):
+    """The client climbs up to the project root served by the daemon; a subdir with root files is another project."""
+    subdir = project.root_dir / "src" / "package"
+    subdir.mkdir(parents=True)
+    monkeypatch.chdir(subdir)
+    assert client.daemon_root(subdir) == project.root_dir
+
+    with pytest.raises(SystemExit) as exit_info:
+        client.main(["check"])
+    assert exit_info.value.code == 1
+    assert "NIP319" in capsys.readouterr().out
+
+    (subdir / "setup.py").write_text("x = 1")
+    assert client.daemon_root(subdir) is None
+
+
+@responses.activate
+def test_client_sends_its_environment(project, daemon, monkeypatch, capsys):
+    """The commands run with the Nitpick environment variables of the client, not the ones of the daemon."""
+    remote_url = "https://example.com/remote-style.toml"
+    responses.add(responses.GET, remote_url, dedent(STYLE), status=200)
+    project.pyproject_toml(f"""
+        [tool.nitpick]
+        style = "{remote_url}"
+
+        [tool.black]
+        line-length = 120
+        """)
+    offline = Flake8OptionEnum.OFFLINE.as_envvar()
+    # Only the client has the variable; the daemon runs in a thread of this process
+    monkeypatch.setattr(client, "nitpick_environ", lambda: {offline: "1"})
+
+    assert client.forward(project.root_dir, "check", []) == 0
+    assert "NIP319" not in capsys.readouterr().out
+    assert daemon.nit.offline
+    assert offline not in os.environ
+    assert not responses.calls
+
+    monkeypatch.setattr(client, "nitpick_environ", dict)
+    assert client.forward(project.root_dir, "check", []) == 1
+    assert "NIP319" in capsys.readouterr().out
+    assert not daemon.nit.offline
+
+
+@pytest.mark.usefixtures("daemon")
+def test_client_with_another_cache_runs_commands_in_its_process(project, monkeypatch, tmp_path):
+    """The warm style cache of the daemon is not used by a client that configures another shared cache."""
+    monkeypatch.setattr(client, "nitpick_environ", lambda: {CacheEnvVarEnum.CACHE_DIR.as_envvar(): str(tmp_path)})
+    assert client.forward(project.root_dir, "check", []) is None
+
+
+def test_daemon_commands(project, daemon):
+    """Show the status of the daemon, and stop it."""
+    daemon.started -= 7300
+    project.cli_daemon(
+        "status",
+        [
+            f"Daemon running for {project.root_dir} (PID {os.getpid()}, version {__version__}, started 2 hours ago).",
+            f"Log file: {log_path(project.root_dir)}",
+        ],
+    )
+    project.cli_daemon("stop", "Daemon stopped.")
+    assert daemon.stopping
+    project.cli_daemon("status", f"No daemon running for {project.root_dir}.", exit_code=1)
+    project.cli_daemon("stop", f"No daemon running for {project.root_dir}.")
+
+
+def test_start_daemon_in_the_background(project, capsys):
+    """The daemon is started in another process, which serves the client until it's stopped."""
+    assert start_daemon(project.root_dir, offline=True, idle_timeout=timedelta(minutes=1), verbose=0)
+    try:
+        assert client.forward(project.root_dir, "check", []) == 1
+        assert "NIP319" in capsys.readouterr().out
+    finally:
+        assert stop_daemon(project.root_dir)
@@ -410,10 +410,10 @@ def test_duplicated_option(tmp_path):
     ).assert_file_contents(PYTHON_SETUP_CFG, original_file)
 
 
-@mock.patch.object(ConfigUpdater, "update_file")
-def test_simulate_parsing_error_when_saving(update_file, tmp_path):
+@mock.patch.object(ConfigUpdater, "validate_format")
+def test_simulate_parsing_error_when_saving(validate_format, tmp_path):
     """Simulate a parsing error when saving an INI file."""
-    update_file.side_effect = ParsingError(source="simulating a captured error")
+    validate_format.side_effect = ParsingError(source="simulating a captured error")
 
     original_file = """
         [flake8]
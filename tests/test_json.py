@@ -2,6 +2,8 @@
 
 import warnings
 
+from nitpick.blender import Comparison, JsonDoc, flatten_quotes
+from nitpick.config import SpecialConfig
 from nitpick.constants import JAVASCRIPT_PACKAGE_JSON, READ_THE_DOCS_URL
 from nitpick.plugins.json import JsonPlugin
 from nitpick.violations import Fuss, SharedViolations
@@ -179,3 +181,18 @@ def test_jsonfile_deprecated(tmp_path):
         )
         assert len(filtered) == 1
         assert issubclass(filtered[0].category, DeprecationWarning)
+
+
+def test_comparison_visits_only_the_expected_keys():
+    """A few expected keys of a big file are found without flattening the whole file, with the same results."""
+    dependencies = {f"package-{index}": f"^{index}.0.0" for index in range(4000)}
+    json_doc = JsonDoc(obj={"name": "big", "scripts": {"test": "jest"}, "dependencies": dependencies})
+    expected = {"scripts": {"test": "mocha", "lint": "eslint"}, "dependencies": {"package-42": "^42.0.0"}}
+
+    projected = Comparison(json_doc, expected, SpecialConfig())()
+
+    flat_expected = flatten_quotes(expected)
+    full = {key: value for key, value in flatten_quotes(json_doc.as_object).items() if key in flat_expected}
+    assert projected.flat_actual == full == {"scripts.test": "jest", "dependencies.package-42": "^42.0.0"}
+    assert projected.missing_dict == {"scripts.lint": "eslint"}
+    assert projected.diff_dict == {"scripts.test": "mocha"}
@@ -0,0 +1,149 @@
+"""Lock file tests."""
+
+import shutil
+
+import pytest
+import responses
+
+from nitpick.cache import CONTENT_STORE_DIR_NAME, hash_contents
+from nitpick.constants import NITPICK_LOCK, PYTHON_PYPROJECT_TOML, EmojiEnum
+from nitpick.lock import LockedStyle, StyleLock
+from nitpick.violations import Fuss
+from tests.helpers import ProjectMock, commit_styles, git
+
+COMMIT = "0123456789abcdef0123456789abcdef01234567"
+API_COMMIT_URL = "https://api.github.com/repos/some-org/styles/commits/HEAD"
+RAW_URL = f"https://raw.githubusercontent.com/some-org/styles/{COMMIT}/black.toml"
+BLACK_STYLE = '["pyproject.toml".tool.black]\nline-length = 100\n'
+
+
+def github_project(tmp_path) -> ProjectMock:
+    """Project with a GitHub style without a Git reference (on the default branch)."""
+    return ProjectMock(tmp_path).pyproject_toml(
+        """
+        [tool.nitpick]
+        style = "gh://some-org/styles/black.toml"
+
+        [tool.black]
+        line-length = 100
+        """
+    )
+
+
+def lock_github_style(project: ProjectMock) -> None:
+    """Lock the GitHub style, resolving the default branch to a commit."""
+    responses.add(responses.GET, API_COMMIT_URL, COMMIT, status=200)
+    responses.add(responses.GET, RAW_URL, BLACK_STYLE, status=200)
+    project.cli_lock(f"1 style locked in {NITPICK_LOCK}. {EmojiEnum.STAR_CAKE.value}")
+
+
+@responses.activate
+def test_lock_github_style_to_a_commit(tmp_path):
+    """The style is pinned to the commit of the default branch, and later read only from the content store."""
+    project = github_project(tmp_path)
+    lock_github_style(project)
+    assert responses.calls[0].request.headers["Accept"] == "application/vnd.github.sha"
+
+    assert StyleLock.read(project.root_dir / NITPICK_LOCK) == StyleLock(
+        {
+            "github://some-org/styles/black.toml": LockedStyle(
+                "github://some-org/styles/black.toml",
+                f"github://some-org/styles@{COMMIT}/black.toml",
+                hash_contents(BLACK_STYLE),
+            )
+        }
+    )
+
+    # No default branch lookup, no HTTP request; even the requests cache is not needed
+    responses.reset()
+    (project.cache_dir / "styles.sqlite").unlink()
+    project.api_check().assert_violations()
+    project.api_check(offline=True).assert_violations()
+    assert not responses.calls
+
+
+@responses.activate
+def test_locked_style_is_fetched_by_its_pinned_address(tmp_path):
+    """Without the content store, the style is fetched from the pinned commit and its hash is checked."""
+    project = github_project(tmp_path)
+    lock_github_style(project)
+    shutil.rmtree(project.cache_dir)
+
+    responses.reset()
+    responses.add(responses.GET, RAW_URL, BLACK_STYLE.replace("100", "120"), status=200)
+    project.api_check().assert_violations(
+        Fuss(
+            False,
+            "",
+            6,
+            f"The locked style github://some-org/styles/black.toml changed (expected SHA-256"
+            f" {hash_contents(BLACK_STYLE)}, got {hash_contents(BLACK_STYLE.replace('100', '120'))})."
+            " Run 'nitpick lock' to update it",
+        )
+    )
+
+    shutil.rmtree(project.cache_dir)
+    responses.replace(responses.GET, RAW_URL, BLACK_STYLE, status=200)
+    project.api_check().assert_violations()
+    assert (project.cache_dir / CONTENT_STORE_DIR_NAME).is_dir()
+    responses.assert_call_count(RAW_URL, 2)
+
+
+def test_lock_git_style_and_its_includes(tmp_path):
+    """Styles in a Git repository are pinned to a commit; new commits are ignored until the lock is updated."""
+    bare_repo = tmp_path / "styles.git"
+    work_dir = tmp_path / "work"
+    git(tmp_path, "init", "--quiet", "--bare", "--initial-branch=main", str(bare_repo))
+    git(tmp_path, "clone", "--quiet", str(bare_repo), str(work_dir))
+    git(work_dir, "checkout", "--quiet", "-b", "main")
+    commit_styles(work_dir, 100)
+    commit = git(work_dir, "rev-parse", "HEAD")
+
+    project = ProjectMock(tmp_path / "project").pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "git+{bare_repo.as_uri()}@main/python/style.toml"
+
+        [tool.black]
+        line-length = 100
+        """
+    )
+    project.cli_lock(f"2 styles locked in {NITPICK_LOCK}. {EmojiEnum.STAR_CAKE.value}")
+    lock = StyleLock.read(project.root_dir / NITPICK_LOCK)
+    assert lock
+    assert [style.pinned for style in lock.styles.values()] == [
+        f"git+{bare_repo.as_uri()}@{commit}/black.toml",
+        f"git+{bare_repo.as_uri()}@{commit}/python/style.toml",
+    ]
+
+    commit_styles(work_dir, 120)
+    project.api_check().assert_violations()
+
+    violation = Fuss(
+        False,
+        PYTHON_PYPROJECT_TOML,
+        319,
+        " has different values. Use this:",
+        """
+        [tool.black]
+        line-length = 120
+        """,
+    )
+    project.cli_lock(f"2 styles locked in {NITPICK_LOCK}. {EmojiEnum.STAR_CAKE.value}")
+    project.api_check().assert_violations(violation)
+
+
+@pytest.mark.parametrize(
+    ("lock_contents", "error"),
+    [
+        ("version = 1\n[[style]]\nurl = 'x'\n", "Each style should have the keys pinned, sha256, url"),
+        ("version = 2\n", "Unsupported version 2, expected 1"),
+        ("version = 1\nversion = 2\n", 'Key "version" already exists. at line 2 col 0'),
+    ],
+)
+def test_invalid_lock_file(tmp_path, lock_contents, error):
+    """An invalid lock file is reported; it's not ignored."""
+    project = github_project(tmp_path).save_file(NITPICK_LOCK, lock_contents)
+    project.api_check().assert_violations(
+        Fuss(False, NITPICK_LOCK, 5, f" is invalid: {error}. Run 'nitpick lock' to create it again")
+    )
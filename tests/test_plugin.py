@@ -1,7 +1,11 @@
 """Plugin tests."""
 
+import json
 import os
+import sys
+from dataclasses import asdict
 from enum import Enum
+from textwrap import dedent
 
 import flake8
 import pytest
@@ -9,7 +13,13 @@ import responses
 from flake8.main import cli
 
 from nitpick.constants import READ_THE_DOCS_URL, _OptionMixin
-from nitpick.core import Nitpick
+from nitpick.core import Nitpick, Project
+from nitpick.plugins import registry as registry_module
+from nitpick.plugins.info import FileInfo
+from nitpick.plugins.registry import PluginDeclaration, PluginEntry, PluginRegistry, environment_key
+from nitpick.plugins.text import TextPlugin
+from nitpick.plugins.toml import TomlPlugin
+from nitpick.plugins.yaml import YamlPlugin
 from nitpick.style import StyleManager
 from nitpick.violations import Fuss
 from tests.helpers import ProjectMock
@@ -140,3 +150,110 @@ def test_offline_recommend_using_flag(tmp_path, capsys):
         "could not be downloaded. Either your network is unreachable or the URL is broken."
         " Check the URL, fix your connection, or use  --nitpick-offline / NITPICK_OFFLINE=1" in err
     )
+
+
+def test_plugin_registry_imports_only_the_plugins_that_handle_a_file(tmp_path):
+    """The first registry discovers and registers all plugins; the next ones read the manifest and register on demand."""
+    manifest = tmp_path / "plugins.json"
+    discovered = PluginRegistry(manifest)
+    names = [entry.name for entry in discovered.entries]
+    assert {"ini", "json", "text", "toml", "yaml"} <= set(names)
+    assert [name for name, _ in discovered.manager.list_name_plugin()] == names
+
+    registry = PluginRegistry(manifest)
+    assert registry.entries == discovered.entries
+    assert registry.fingerprint == discovered.fingerprint
+    assert not registry.fixed_name_classes()
+    assert not registry.manager.get_plugins()
+
+    (tmp_path / "pyproject.toml").touch()
+    info = FileInfo.create(Project(tmp_path), "pyproject.toml")
+    assert registry.can_handle(info) == discovered.can_handle(info) == [TomlPlugin, TextPlugin]
+    assert {name for name, _ in registry.manager.list_name_plugin()} == {"text", "toml"}
+
+
+def test_plugin_registry_discovers_again_when_the_manifest_is_stale(tmp_path):
+    """A manifest from another environment, or with a changed plugin module, is replaced."""
+    manifest = tmp_path / "plugins.json"
+    PluginRegistry(manifest).entries  # noqa: B018
+    data = json.loads(manifest.read_text())
+    data["entries"][0]["validator"] = "0:0"
+    manifest.write_text(json.dumps(data))
+
+    registry = PluginRegistry(manifest)
+    assert len(registry.entries) == len(registry.manager.get_plugins())
+    assert json.loads(manifest.read_text())["entries"][0]["validator"] != "0:0"
+
+    manifest.write_text(json.dumps({**data, "key": "another environment"}))
+    registry = PluginRegistry(manifest)
+    assert len(registry.entries) == len(registry.manager.get_plugins())
+
+
+def test_project_plugin_manager_has_all_plugins(tmp_path):
+    """The plugin manager of the project is still available, with the hooks of all plugins."""
+    (tmp_path / "pyproject.toml").touch()
+    project = Project(tmp_path)
+    info = FileInfo.create(project, "pyproject.toml")
+    assert TomlPlugin in project.plugin_manager.hook.can_handle(info=info)  # pylint: disable=no-member
+    assert set(project.plugin_manager.hook.plugin_class()) == set(project.plugin_registry.plugin_classes())
+
+
+def test_each_environment_has_its_own_plugins_manifest(tmp_path, monkeypatch):
+    """Switching between environments (e.g. a virtualenv and the pre-commit env) keeps the manifest of each one."""
+    monkeypatch.setattr(registry_module, "user_cache_dir", lambda: tmp_path)
+
+    def use_environment(name: str) -> PluginRegistry:
+        monkeypatch.setattr(sys, "prefix", str(tmp_path / name))
+        monkeypatch.setattr(registry_module, "environment_key", lambda: name)
+        registry = PluginRegistry()
+        registry.entries  # noqa: B018
+        return registry
+
+    assert use_environment("venv").manager.get_plugins()
+    assert use_environment("pre-commit").manager.get_plugins()
+    assert len(list(tmp_path.glob("plugins-*.json"))) == len(["venv", "pre-commit"])
+    # The manifest of the first environment was kept, so its plugins are not discovered (and imported) again
+    assert not use_environment("venv").manager.get_plugins()
+
+
+def test_plugin_registry_indexes_plugins_by_tag(tmp_path, monkeypatch):
+    """Indexed plugins are found by tag, without hooks; the hook of a plugin with custom logic is still called."""
+    (tmp_path / "custom_plugin.py").write_text(
+        dedent("""
+        from nitpick.plugins import hookimpl
+        from nitpick.plugins.yaml import YamlPlugin
+
+        class WorkflowPlugin(YamlPlugin):
+            dispatch_by_tags = False
+
+        @hookimpl
+        def plugin_class():
+            return WorkflowPlugin
+
+        @hookimpl
+        def can_handle(info):
+            return WorkflowPlugin if info.path_from_root.startswith(".github/") else None
+        """)
+    )
+    (tmp_path / "pyproject.toml").touch()
+    monkeypatch.syspath_prepend(tmp_path)
+    manifest = tmp_path / "plugins.json"
+    declaration = PluginDeclaration("custom_plugin.WorkflowPlugin", ["yaml"], dispatch_by_tags=False)
+    custom = PluginEntry("custom", "custom_plugin", "custom==1.0", classes=[declaration])
+    entries = [*PluginRegistry(manifest).entries, custom]
+    manifest.write_text(json.dumps({"key": environment_key(), "entries": [asdict(entry) for entry in entries]}))
+
+    registry = PluginRegistry(manifest)
+    assert registry.index.lookup(FileInfo(Project(tmp_path), "pyproject.toml", {"text", "toml"})) == {
+        "nitpick.plugins.text.TextPlugin",
+        "nitpick.plugins.toml.TomlPlugin",
+    }
+    assert registry.index.hook_entries == [custom]
+
+    def handlers(path: str) -> list[str]:
+        return [plugin_class.__name__ for plugin_class in registry.can_handle(FileInfo.create(Project(tmp_path), path))]
+
+    assert handlers("pyproject.toml") == [TomlPlugin.__name__, TextPlugin.__name__]
+    assert "custom" not in dict(registry.manager.list_name_plugin())
+    assert handlers("config.yaml") == [YamlPlugin.__name__, TextPlugin.__name__]
+    assert handlers(".github/workflows/ci.yaml") == ["WorkflowPlugin", YamlPlugin.__name__, TextPlugin.__name__]
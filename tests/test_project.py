@@ -2,9 +2,15 @@
 
 import os
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
 
 import pytest
+from identify import identify
 
+from nitpick.blender import TomlDoc
 from nitpick.constants import (
     CONFIG_RUN_NITPICK_INIT_OR_CONFIGURE_STYLE_MANUALLY,
     DOT_NITPICK_TOML,
@@ -24,7 +30,8 @@ from nitpick.constants import (
 )
 from nitpick.core import Configuration, Nitpick, confirm_project_root, find_main_python_file
 from nitpick.exceptions import QuitComplainingError
-from nitpick.violations import ProjectViolations
+from nitpick.snapshot import ProjectSnapshot
+from nitpick.violations import Fuss, ProjectViolations
 from tests.helpers import ProjectMock
 
 
@@ -244,3 +251,99 @@ def test_find_root_django(tmp_path):
     # Search 2 levels of directories
     assert find_main_python_file(tmp_path) == apps_dir / PYTHON_MANAGE_PY
     assert find_main_python_file(apps_dir) == apps_dir / PYTHON_MANAGE_PY
+
+
+def test_file_info_is_computed_once_per_run(tmp_path):
+    """The same keys of many included styles share the file info; its tags are computed again on the next run."""
+    child_style = """
+        ["setup.cfg".flake8]
+        max-line-length = 100
+        """
+    project = (
+        ProjectMock(tmp_path)
+        .named_style("child1", child_style)
+        .named_style("child2", child_style)
+        .named_style(
+            "parent",
+            """
+            [nitpick.styles]
+            include = ["child1.toml", "child2.toml"]
+            """,
+        )
+        .pyproject_toml('[tool.nitpick]\nstyle = "parent"')
+        .setup_cfg("[flake8]\nmax-line-length = 100")
+    )
+    setup_cfg = str(project.root_dir / PYTHON_SETUP_CFG)
+    with mock.patch("nitpick.plugins.info.identify.tags_from_path", wraps=identify.tags_from_path) as tags_from_path:
+        project.api_check().assert_violations()
+        assert Counter(call.args[0] for call in tags_from_path.call_args_list) == {setup_cfg: 1}
+
+        nit = project.nitpick_instance
+        assert nit.project.file_info(PYTHON_SETUP_CFG) is nit.project.file_info(PYTHON_SETUP_CFG)
+        list(nit.run())
+        assert Counter(call.args[0] for call in tags_from_path.call_args_list) == {setup_cfg: 2}
+
+
+def test_project_files_are_read_once_per_run(tmp_path):
+    """The TOML and text plugins share the contents of ``pyproject.toml``; the files are read again on the next run."""
+    project = (
+        ProjectMock(tmp_path)
+        .style(f"""
+            ["{PYTHON_PYPROJECT_TOML}".tool.black]
+            line-length = 100
+
+            ["{PYTHON_SETUP_CFG}".flake8]
+            max-line-length = 100
+
+            [nitpick.files.present]
+            "{PYTHON_SETUP_CFG}" = ""
+            "{MAKEFILE}" = ""
+            """)
+        .pyproject_toml("[tool.black]\nline-length = 100")
+        .setup_cfg("[flake8]\nmax-line-length = 100")
+    )
+    with mock.patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as read_bytes:
+        project.api_check().assert_violations(
+            Fuss(False, MAKEFILE, ProjectViolations.MISSING_FILE.code, " should exist")
+        )
+        nit = project.nitpick_instance
+        project_reads = {PYTHON_PYPROJECT_TOML: 1, PYTHON_SETUP_CFG: 1}
+        assert Counter(call.args[0].name for call in read_bytes.call_args_list) == project_reads
+        assert nit.project.snapshot.doc(PYTHON_PYPROJECT_TOML, TomlDoc).as_object == {
+            "tool": {"black": {"line-length": 100}}
+        }
+
+        project.save_file(MAKEFILE, "all:")
+        assert not list(nit.run())
+        assert Counter(call.args[0].name for call in read_bytes.call_args_list) == {
+            name: count * 2 for name, count in project_reads.items()
+        }
+
+
+def test_snapshot_checks_every_parent_is_a_dir(tmp_path):
+    """A parent part with the same name as the file must be a dir too."""
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "docs").write_text("nested")
+    (tmp_path / "setup.cfg").write_text("")
+    snapshot = ProjectSnapshot(tmp_path)
+    assert snapshot.exists("docs/docs")
+    assert snapshot.exists("docs")
+    assert not snapshot.exists("setup.cfg/setup.cfg")
+    assert not snapshot.exists("docs/docs/docs")
+
+
+def test_snapshot_is_shared_by_threads(tmp_path):
+    """Threads read, parse and discard files at the same time, and they share the same parsed documents."""
+    for index in range(20):
+        (tmp_path / f"file{index}.toml").write_text(f"key = {index}")
+    snapshot = ProjectSnapshot(tmp_path)
+
+    def read_and_discard(index: int) -> None:
+        for _ in range(50):
+            path = f"file{index % 20}.toml"
+            assert snapshot.doc(path, TomlDoc).as_object == {"key": index % 20}
+            snapshot.discard(f"file{(index + 1) % 20}.toml")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(read_and_discard, range(40)))
+    assert snapshot.doc("file0.toml", TomlDoc) is snapshot.doc("file0.toml", TomlDoc)
@@ -1,5 +1,7 @@
 """Style tests."""
 
+import threading
+import urllib.parse
 import warnings
 from pathlib import Path
 from textwrap import dedent
@@ -8,12 +10,21 @@ from unittest.mock import PropertyMock
 
 import pytest
 import responses
+from freezegun import freeze_time
 from furl import furl
 
 from nitpick.constants import PYTHON_PYPROJECT_TOML, PYTHON_SETUP_CFG, PYTHON_TOX_INI, READ_THE_DOCS_URL, TOML_EXTENSION
-from nitpick.style import GitHubURL, PythonPackageURL
+from nitpick.style import GitHubURL, GitURL, PythonPackageURL, StyleURL, github_default_branch
 from nitpick.violations import Fuss
-from tests.helpers import SUGGESTION_BEGIN, SUGGESTION_END, ProjectMock, assert_conditions, tomlstring
+from tests.helpers import (
+    SUGGESTION_BEGIN,
+    SUGGESTION_END,
+    ProjectMock,
+    assert_conditions,
+    commit_styles,
+    git,
+    tomlstring,
+)
 
 
 @pytest.mark.parametrize("offline", [False, True])
@@ -160,7 +171,7 @@ def test_include_styles_overriding_values(offline, tmp_path):
 
 
 @pytest.mark.parametrize("offline", [False, True])
-@mock.patch("nitpick.flake8.NitpickFlake8Extension.version", new_callable=PropertyMock(return_value="0.5.3"))
+@mock.patch("nitpick.core.__version__", new_callable=PropertyMock(return_value="0.5.3"))
 def test_minimum_version(mocked_version, offline, tmp_path):
     """Stamp a style file with a minimum required version, to indicate new features or breaking changes."""
     assert_conditions(mocked_version == "0.5.3")
@@ -356,6 +367,80 @@ def test_relative_style_on_urls(tmp_path):
     )
 
 
+@responses.activate
+@pytest.mark.parametrize("fetch_workers", [1, 4])
+def test_include_tree_fetched_concurrently_keeps_merge_order(fetch_workers, tmp_path):
+    """Styles on the same level of the include tree are fetched concurrently, but merged in the original order."""
+    base_url = "http://www.example.com/org"
+    mapping = {
+        "main": """
+            [nitpick.styles]
+            include = ["first.toml", "second.toml", "third.toml"]
+            ["pyproject.toml".tool.black]
+            line-length = 1
+            """,
+        "first": """
+            [nitpick.styles]
+            include = "nested.toml"
+            ["pyproject.toml".tool.black]
+            line-length = 2
+            from-first = true
+            """,
+        "second": """
+            [nitpick.styles]
+            include = ["nested.toml", "first.toml"]
+            ["pyproject.toml".tool.black]
+            line-length = 3
+            """,
+        "third": """
+            ["pyproject.toml".tool.black]
+            from-third = true
+            """,
+        "nested": """
+            ["pyproject.toml".tool.black]
+            line-length = 4
+            from-nested = true
+            """,
+    }
+    threads: dict[str, str] = {}
+
+    def callback(request):
+        threads[request.url] = threading.current_thread().name
+        return 200, {}, dedent(mapping[request.url.rsplit("/", 1)[-1].removesuffix(TOML_EXTENSION)])
+
+    for filename in mapping:
+        responses.add_callback(responses.GET, f"{base_url}/{filename}{TOML_EXTENSION}", callback=callback)
+
+    ProjectMock(tmp_path).pyproject_toml(f"""
+        [tool.nitpick]
+        style = ["{base_url}/main"]
+        fetch_workers = {fetch_workers}
+        """).api_check().assert_violations(
+        Fuss(
+            False,
+            PYTHON_PYPROJECT_TOML,
+            318,
+            " has missing values:",
+            """
+            [tool.black]
+            line-length = 3
+            from-first = true
+            from-nested = true
+            from-third = true
+            """,
+        )
+    )
+
+    # Each style is downloaded only once
+    assert len(responses.calls) == len(mapping)
+    main_thread = threading.main_thread().name
+    if fetch_workers == 1:
+        assert set(threads.values()) == {main_thread}
+    else:
+        assert threads[f"{base_url}/main{TOML_EXTENSION}"] == main_thread
+        assert threads[f"{base_url}/first{TOML_EXTENSION}"] != main_thread
+
+
 @responses.activate
 def test_local_style_should_override_settings(tmp_path):
     """Don't build relative URLs from local file names (starting with "./")."""
@@ -449,6 +534,37 @@ def test_fetch_private_github_urls_no_branch(tmp_path):
     project.flake8(offline=True).assert_no_errors()
 
 
+@responses.activate
+def test_github_default_branch_is_cached_on_disk(tmp_path):
+    """The default branch is stored on disk, so new processes and other projects don't call the GitHub API."""
+    api_url = "https://api.github.com/repos/andreoliwa/nitpick"
+    raw_url = "https://raw.githubusercontent.com/andreoliwa/nitpick/develop/black.toml"
+    responses.add(responses.GET, api_url, '{"default_branch": "develop"}')
+    responses.add(responses.GET, raw_url, '["pyproject.toml".tool.black]\nline-length = 120\n')
+
+    def check_new_process(name: str) -> None:
+        github_default_branch.cache_clear()
+        ProjectMock(tmp_path / name).pyproject_toml(
+            """
+            [tool.nitpick]
+            style = "gh://andreoliwa/nitpick/black.toml"
+
+            [tool.black]
+            line-length = 120
+            """
+        ).api_check().assert_violations()
+
+    with freeze_time("2021-03-15 10:00") as frozen_datetime:
+        check_new_process("first")
+        check_new_process("second")
+        assert responses.assert_call_count(api_url, 1)
+
+        # Expired after one day
+        frozen_datetime.move_to("2021-03-16 10:01")
+        check_new_process("third")
+        assert responses.assert_call_count(api_url, 2)
+
+
 @pytest.mark.parametrize(
     "style_url",
     [
@@ -706,6 +822,7 @@ def test_invalid_tool_nitpick_on_pyproject_toml(offline, tmp_path):
         ),
         ('style = ""', "style: Shorter than minimum length 1."),
         ("style = 1", "style: Not a valid string."),
+        ('style = "some_file"\nfetch_workers = 0', "fetch_workers: Must be greater than or equal to 1."),
         (
             'style = ["some_file","","   "]',
             "style.1: Shorter than minimum length 1.\nstyle.2: Shorter than minimum length 1.",
@@ -937,3 +1054,115 @@ def test_protocol_not_supported(tmp_path):
     with pytest.raises(RuntimeError) as exc_info:
         project.api_check()
     assert str(exc_info.value) == "URL protocol 'abc' is not supported"
+
+
+@pytest.mark.parametrize(
+    ("original_url", "remote", "git_reference", "path"),
+    [
+        (
+            "git+https://github.com/some-org/styles.git@v1.0/python/style.toml",
+            "https://github.com/some-org/styles.git",
+            "v1.0",
+            ("python", "style.toml"),
+        ),
+        ("git+https://example.com/styles.git/style.toml", "https://example.com/styles.git", "", ("style.toml",)),
+        ("git+file:///path/to/styles@main/a/b/style.toml", "file:///path/to/styles", "main", ("a", "b", "style.toml")),
+    ],
+)
+def test_parsing_git_urls(original_url, remote, git_reference, path):
+    """Test the repository, Git reference and path of ``git+`` URLs."""
+    git_url = GitURL.from_furl(furl(original_url))
+    assert git_url.remote == remote
+    assert git_url.git_reference == git_reference
+    assert git_url.path == path
+
+
+@pytest.mark.parametrize(
+    ("base", "relative", "joined"),
+    [
+        ("git+file:///path/to/styles@main/a/style.toml", "../b.toml", "git+file:///path/to/styles@main/b.toml"),
+        ("git+https://example.com/styles.git/a/style.toml", "b.toml", "git+https://example.com/styles.git/a/b.toml"),
+        ("file:///path/to/style.toml", "git+file:///repo@v1/c.toml", "git+file:///repo@v1/c.toml"),
+    ],
+)
+def test_joining_git_urls(base, relative, joined):
+    """Relative URLs are joined on ``git+`` URLs, without registering the schemes in ``urllib.parse``."""
+    assert StyleURL(base).join(relative).url == joined
+    assert "git+file" not in urllib.parse.uses_netloc
+
+
+def test_git_commands_use_the_current_environment(tmp_path, monkeypatch):
+    """The environment is read on each Git command, not once when Nitpick is imported."""
+    bare_repo = tmp_path / "styles.git"
+    work_dir = tmp_path / "work"
+    git(tmp_path, "init", "--quiet", "--bare", "--initial-branch=main", str(bare_repo))
+    git(tmp_path, "clone", "--quiet", str(bare_repo), str(work_dir))
+    git(work_dir, "checkout", "--quiet", "-b", "main")
+    commit_styles(work_dir, 100)
+    # The style points to another repository; Git config from the environment redirects it to the real one
+    moved_repo = tmp_path / "moved.git"
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.{bare_repo.as_uri()}.insteadOf")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", moved_repo.as_uri())
+
+    ProjectMock(tmp_path / "project").pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "git+{moved_repo.as_uri()}@main/python/style.toml"
+
+        [tool.black]
+        line-length = 100
+        """
+    ).api_check().assert_violations()
+
+
+def test_fetch_styles_from_a_git_repository(tmp_path):
+    """Styles and their relative includes are read from a single local copy of the Git repository."""
+    bare_repo = tmp_path / "styles.git"
+    work_dir = tmp_path / "work"
+    git(tmp_path, "init", "--quiet", "--bare", "--initial-branch=main", str(bare_repo))
+    git(tmp_path, "clone", "--quiet", str(bare_repo), str(work_dir))
+    git(work_dir, "checkout", "--quiet", "-b", "main")
+    commit_styles(work_dir, 100)
+    git(work_dir, "tag", "v1")
+    git(work_dir, "push", "--quiet", "origin", "v1")
+    commit_styles(work_dir, 120)
+
+    project = ProjectMock(tmp_path / "project").pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "git+{bare_repo.as_uri()}@v1/python/style.toml"
+
+        [tool.black]
+        line-length = 100
+        """
+    )
+    project.api_check().assert_violations()
+    assert len(list((project.cache_dir / "git").glob("*.git"))) == 1
+
+    def line_length_fuss(line_length: int) -> Fuss:
+        return Fuss(
+            False,
+            PYTHON_PYPROJECT_TOML,
+            319,
+            " has different values. Use this:",
+            f"""
+            [tool.black]
+            line-length = {line_length}
+            """,
+        )
+
+    # The default branch is fetched again on the next run
+    project.pyproject_toml(
+        f"""
+        [tool.nitpick]
+        style = "git+{bare_repo.as_uri()}/python/style.toml"
+
+        [tool.black]
+        line-length = 100
+        """
+    ).api_check().assert_violations(line_length_fuss(120))
+    commit_styles(work_dir, 130)
+    project.api_check().assert_violations(line_length_fuss(130))
+    project.api_check(offline=True).assert_violations(line_length_fuss(130))
+    assert len(list((project.cache_dir / "git").glob("*.git"))) == 1
@@ -1,5 +1,8 @@
 """TOML tests."""
 
+from unittest import mock
+
+from nitpick.blender import flatten_quotes
 from nitpick.constants import PYTHON_PYPROJECT_TOML
 from nitpick.plugins.toml import TomlPlugin
 from nitpick.violations import Fuss, SharedViolations
@@ -157,3 +160,27 @@ def test_missing_different_values_any_toml(tmp_path):
         list = ["a", "b", "c"]
         """,
     )
+
+
+def test_expected_config_is_flattened_once_per_run(tmp_path):
+    """The TOML and text plugins of the same file share its flattened expected config."""
+    project = (
+        ProjectMock(tmp_path)
+        .style("""
+            ["pyproject.toml".tool.black]
+            line-length = 100
+
+            ["pyproject.toml".__list_keys]
+            "tool.*" = "name"
+            """)
+        .pyproject_toml("[tool.black]\nline-length = 100")
+    )
+    expected_config = {"tool": {"black": {"line-length": 100}}}
+    with mock.patch("nitpick.plugins.base.flatten_quotes", wraps=flatten_quotes) as flatten:
+        project.api_check().assert_violations()
+        flattened = [call.args[0] for call in flatten.call_args_list]
+        assert flattened.count(expected_config) == 1
+
+        list(project.nitpick_instance.run())
+        flattened = [call.args[0] for call in flatten.call_args_list]
+        assert flattened.count(expected_config) == len(["first run", "next run"])
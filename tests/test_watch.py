@@ -0,0 +1,148 @@
+"""Watch mode tests."""
+
+import sys
+from unittest import mock
+
+import pytest
+
+from nitpick.constants import NITPICK_STYLE_TOML, PYTHON_PYPROJECT_TOML, PYTHON_SETUP_CFG
+from nitpick.core import Nitpick
+from nitpick.plugins.ini import IniPlugin
+from nitpick.plugins.toml import TomlPlugin
+from nitpick.violations import Fuss, Reporter
+from nitpick.watch import InotifyWatcher, PollingWatcher, WatchSession
+from tests.helpers import ProjectMock
+
+TIMEOUT = 2
+
+
+@pytest.mark.parametrize(
+    "watcher_class",
+    [
+        PollingWatcher,
+        pytest.param(
+            InotifyWatcher, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+        ),
+    ],
+)
+def test_watcher_detects_changed_and_created_files(tmp_path, watcher_class):
+    """Changes of existing files and files created later (even in new directories) are detected."""
+    existing = tmp_path / "existing.toml"
+    existing.write_text("a = 1")
+    missing = tmp_path / "new-dir" / "missing.yaml"
+    watcher = PollingWatcher(interval=0.01) if watcher_class is PollingWatcher else watcher_class()
+    try:
+        watcher.watch([existing, missing])
+        assert watcher.wait(timeout=0.05) == set()
+
+        existing.write_text("a = 22")
+        assert watcher.wait(timeout=TIMEOUT) == {existing}
+
+        watcher.watch([existing, missing])
+        missing.parent.mkdir()
+        missing.write_text("b: 2")
+        assert watcher.wait(timeout=TIMEOUT) == {missing}
+    finally:
+        watcher.close()
+
+
+@pytest.fixture
+def spy_rules():
+    """Spy on the rules enforced by the TOML and INI plugins."""
+    with (
+        mock.patch.object(TomlPlugin, "enforce_rules", autospec=True, side_effect=TomlPlugin.enforce_rules) as toml,
+        mock.patch.object(IniPlugin, "enforce_rules", autospec=True, side_effect=IniPlugin.enforce_rules) as ini,
+    ):
+        yield toml, ini
+
+
+def test_watch_session_enforces_only_affected_files(tmp_path, monkeypatch, spy_rules):
+    """Only the files that changed, or whose expected config changed, are enforced again."""
+    toml_rules, ini_rules = spy_rules
+    project = (
+        ProjectMock(tmp_path)
+        .style("""
+            ["pyproject.toml".tool.black]
+            line-length = 100
+
+            ["setup.cfg".flake8]
+            max-line-length = 100
+            """)
+        .pyproject_toml("[tool.black]\nline-length = 120")
+        .setup_cfg("[flake8]\nmax-line-length = 100")
+    )
+    monkeypatch.chdir(project.root_dir)
+    Nitpick.singleton.cache_clear()
+    session = WatchSession(Nitpick.singleton().init(project.root_dir))
+    black_violation = Fuss(
+        False, PYTHON_PYPROJECT_TOML, 319, " has different values. Use this:", "[tool.black]\nline-length = 100"
+    )
+
+    assert session.run() == [black_violation]
+    assert Reporter.manual == 1
+    pyproject, setup_cfg, style = (
+        project.root_dir / name for name in (PYTHON_PYPROJECT_TOML, PYTHON_SETUP_CFG, NITPICK_STYLE_TOML)
+    )
+    assert {pyproject, setup_cfg, style} <= session.paths
+    assert (toml_rules.call_count, ini_rules.call_count) == (1, 1)
+
+    # A configured file changed: only its plugins run
+    project.setup_cfg("[flake8]\nmax-line-length = 120")
+    assert len(session.run({setup_cfg})) == len([black_violation, "flake8 violation"])
+    assert (toml_rules.call_count, ini_rules.call_count) == (1, 2)
+
+    # The style changed: only the file with a different expected config is enforced
+    project.style("""
+        ["pyproject.toml".tool.black]
+        line-length = 120
+
+        ["setup.cfg".flake8]
+        max-line-length = 100
+        """)
+    assert len(session.run({style})) == len(["flake8 violation"])
+    assert (toml_rules.call_count, ini_rules.call_count) == (2, 2)
+    assert Reporter.manual == 1
+
+
+def test_watch_session_refreshes_the_info_of_changed_files(tmp_path, monkeypatch):
+    """The tags of a configured file are computed again when it's created, even if the styles didn't change."""
+    project = ProjectMock(tmp_path).style('["extra.toml".tool]\nkey = 1').pyproject_toml("")
+    monkeypatch.chdir(project.root_dir)
+    Nitpick.singleton.cache_clear()
+    nit = Nitpick.singleton().init(project.root_dir)
+    session = WatchSession(nit)
+
+    assert len(session.run()) == len(["extra.toml was not found"])
+    assert "file" not in nit.project.file_info("extra.toml").tags
+
+    project.save_file("extra.toml", "[tool]\nkey = 1")
+    assert session.run({project.root_dir / "extra.toml"}) == []
+    assert "file" in nit.project.file_info("extra.toml").tags
+
+
+def test_watch_session_stores_incremental_results(tmp_path, monkeypatch, spy_rules):
+    """An incremental watch session reuses the violations of the previous incremental check, and stores its own."""
+    toml_rules, _ = spy_rules
+    project = (
+        ProjectMock(tmp_path)
+        .style('["pyproject.toml".tool.black]\nline-length = 100')
+        .pyproject_toml("[tool.black]\nline-length = 120")
+    )
+    monkeypatch.chdir(project.root_dir)
+    project.cli_run(
+        "pyproject.toml:1: NIP319  has different values. Use this:\n[tool.black]\nline-length = 100",
+        violations=1,
+        incremental=True,
+    )
+    assert toml_rules.call_count == 1
+
+    Nitpick.singleton.cache_clear()
+    nit = Nitpick.singleton().init(project.root_dir)
+    session = WatchSession(nit, incremental=True)
+    assert [fuss.code for fuss in session.run()] == [319]
+    assert toml_rules.call_count == 1
+
+    project.pyproject_toml("[tool.black]\nline-length = 100")
+    assert session.run({project.root_dir / PYTHON_PYPROJECT_TOML}) == []
+    assert toml_rules.call_count == len(["cli", "watch"])
+    assert nit.project.read_results().files[PYTHON_PYPROJECT_TOML].violations == []
@@ -154,3 +154,38 @@ def test_maximum_two_level_nesting_on_lists_using_jmes_expression_as_list_key_fa
         ),
     ).assert_file_contents(filename, datadir / "jmes-list-key-expected.yaml")
     project.api_check().assert_violations()
+
+
+def test_list_keys_of_the_style_are_used_on_every_run(tmp_path):
+    """Plugins read the list keys of the style without removing them from the merged style, which is not copied."""
+    filename = "config.yaml"
+    project = (
+        ProjectMock(tmp_path)
+        .style(f"""
+            ["{filename}".__list_keys]
+            items = "name"
+
+            [["{filename}".items]]
+            name = "a"
+            value = 1
+            """)
+        .save_file(filename, "items:\n  - name: a\n    value: 2\n")
+    )
+    project.api_check().assert_violations(
+        Fuss(
+            False,
+            filename,
+            368,
+            " has missing values:",
+            """
+            items:
+              - name: a
+                value: 1
+            """,
+        )
+    )
+    assert "__list_keys" in project.nitpick_instance.project.style_dict[filename]
+
+    # The same instance enforces the merged style again (e.g. in watch mode): the item is found by its key
+    assert [fuss.fixed for fuss in project.nitpick_instance.run(autofix=True)] == [True]
+    project.assert_file_contents(filename, "items:\n  - name: a\n    value: 1\n")
@@ -147,3 +147,38 @@ def test_repo_with_different_key_value_pairs(tmp_path, datadir):
     ).assert_file_contents(
         PRE_COMMIT_CONFIG_YAML, datadir / "hook-args-change.yaml"
     ).api_check().assert_violations()
+
+
+def test_hook_args_with_colliding_hashes_are_compared(tmp_path):
+    """Test hook args that are different but have the same Python hash: ``hash(-1) == hash(-2)``."""
+    ProjectMock(tmp_path).save_file(
+        PRE_COMMIT_CONFIG_YAML,
+        """
+        repos:
+          - repo: local
+            hooks:
+              - id: my-hook
+                args: [-2]
+        """,
+    ).style(
+        """
+        [[".pre-commit-config.yaml".repos]]
+        repo = "local"
+        hooks = [{id = "my-hook", args = [-1]}]
+        """
+    ).api_check().assert_violations(
+        Fuss(
+            False,
+            PRE_COMMIT_CONFIG_YAML,
+            368,
+            " has missing values:",
+            """
+            repos:
+              - repo: local
+                hooks:
+                  - id: my-hook
+                    args:
+                      - -1
+            """,
+        )
+    )